@@ -1,24 +1,37 @@
 import os
 
 
+def _getenv_bool(name: str, default: str) -> bool:
+    """读取布尔型环境变量，忽略大小写与首尾空白。"""
+    return os.getenv(name, default).strip().lower() == "true"
+
+
 # --- Security & Config ---
 API_KEY_NAME = "X-API-Key"
 ADMIN_USER_HEADER = "X-Admin-User"
 ADMIN_PASS_HEADER = "X-Admin-Pass"
 ADMIN_USER = os.getenv("ADMIN_USER", "admin")  # Username to access Web UI
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "password")  # Password to access Web UI
-IGNORED_EVENTS = set(
-    os.getenv("IGNORED_EVENTS", "exec_create,exec_start,exec_die").split(",")
+# 去除空白并丢弃空项：空字符串会让所有事件都命中 startswith 而被过滤
+_IGNORED_EVENTS_RAW = os.getenv("IGNORED_EVENTS", "exec_create,exec_start,exec_die")
+IGNORED_EVENTS = frozenset(
+    event.strip() for event in _IGNORED_EVENTS_RAW.split(",") if event.strip()
 )
 
 # --- System Monitoring ---
 HOST_FILESYSTEM_ROOT = os.getenv("HOST_FILESYSTEM_ROOT", "/hostfs")
+# 磁盘与 /proc/net 监控使用的主机根目录；与上面不同，未设置时即本机根目录
+HOST_MONITOR_ROOT = os.path.abspath(os.getenv("HOST_FILESYSTEM_ROOT", "/"))
+HOST_PROC_NET_DIR = os.path.join(HOST_MONITOR_ROOT, "proc/net")
+
+# --- 构建时写入的版本信息 ---
+# 镜像构建时通过 --build-arg 传入，设置后 /git/version 不再读取仓库
+GIT_COMMIT = os.getenv("GIT_COMMIT", "").strip()
+GIT_BRANCH = os.getenv("GIT_BRANCH", "").strip() or "unknown"
 
 # --- Docker Engine API 代理 ---
 DOCKER_SOCKET_PATH = os.getenv("DOCKER_SOCKET_PATH", "/var/run/docker.sock")
-DOCKER_ENGINE_API_ENABLED = (
-    os.getenv("DOCKER_ENGINE_API_ENABLED", "true").lower() == "true"
-)
+DOCKER_ENGINE_API_ENABLED = _getenv_bool("DOCKER_ENGINE_API_ENABLED", "true")
 
 
 # --- 头像上传 ---
@@ -38,8 +51,8 @@ SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
 SMTP_FROM_EMAIL = os.getenv("SMTP_FROM_EMAIL", "")
 SMTP_FROM_NAME = os.getenv("SMTP_FROM_NAME", "Mobile Portainer")
-SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "false").lower() == "true"
-SMTP_USE_STARTTLS = os.getenv("SMTP_USE_STARTTLS", "true").lower() == "true"
+SMTP_USE_SSL = _getenv_bool("SMTP_USE_SSL", "false")
+SMTP_USE_STARTTLS = _getenv_bool("SMTP_USE_STARTTLS", "true")
 SMTP_TIMEOUT = int(os.getenv("SMTP_TIMEOUT", "10"))
 
 # --- 项目（Projects）---
@@ -49,5 +62,5 @@ PROJECTS_DIR = os.getenv(
 )
 
 # --- MCP OAuth 认证 ---
-MCP_AUTH_ENABLED = os.getenv("MCP_AUTH_ENABLED", "true").lower() == "true"
+MCP_AUTH_ENABLED = _getenv_bool("MCP_AUTH_ENABLED", "true")
 PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "http://127.0.0.1:8000")
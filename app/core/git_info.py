@@ -0,0 +1,143 @@
+"""
+读取仓库当前提交信息，供 /git/version 接口与 MCP 工具共用。
+
+分支与 sha 直接读 .git 下的文件，提交信息通过一次 git log 获取，不依赖 GitPython。
+"""
+
+import functools
+import os
+import subprocess
+from datetime import datetime
+from typing import Any, Dict
+
+from app.core import config
+
+# 应用以仓库根目录为工作目录启动，导入时解析为绝对路径，之后不再调用 getcwd
+REPO_DIR = os.path.abspath(os.getcwd())
+
+
+def placeholder_git_version(
+    message: str, branch: str = "unknown", sha: str = "unknown", author: str = "unknown"
+) -> Dict[str, Any]:
+    """无法取得完整提交信息时返回的结构，字段与正常结果一致。"""
+    return {
+        "branch": branch,
+        "commit_hash": sha,
+        "short_hash": sha[:7],
+        "commit_message": message,
+        "author": author,
+        "date": datetime.now().isoformat(),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def build_git_version() -> Dict[str, Any] | None:
+    """镜像构建时通过 GIT_COMMIT/GIT_BRANCH 写入了版本时直接返回，否则返回 None。"""
+    if not config.GIT_COMMIT:
+        return None
+    return placeholder_git_version(
+        "Build-time version", branch=config.GIT_BRANCH, sha=config.GIT_COMMIT
+    )
+
+
+def resolve_git_dir(repo_dir: str) -> str | None:
+    """返回仓库的 git 目录；.git 为文件（worktree/子模块）时按 gitdir: 解析。"""
+    dot_git = os.path.join(repo_dir, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    if os.path.isfile(dot_git):
+        with open(dot_git, encoding="utf-8") as f:
+            content = f.read().strip()
+        if content.startswith("gitdir:"):
+            return os.path.join(repo_dir, content[len("gitdir:") :].strip())
+    return None
+
+
+def read_git_head(git_dir: str) -> tuple[str, str | None]:
+    """
+    直接读取 HEAD 解析出 (分支名, 提交 sha)。
+
+    分离 HEAD 时分支名为 "detached"；分支尚无提交时 sha 为 None。
+    """
+    with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+        head = f.read().strip()
+    if not head.startswith("ref:"):
+        return "detached", head
+
+    ref = head[len("ref:") :].strip()
+    branch = ref[len("refs/heads/") :] if ref.startswith("refs/heads/") else ref
+    try:
+        with open(os.path.join(git_dir, ref), encoding="utf-8") as f:
+            return branch, f.read().strip()
+    except FileNotFoundError:
+        pass
+
+    # 引用可能已被打包到 packed-refs
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), encoding="utf-8") as f:
+            for line in f:
+                sha, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return branch, sha
+    except FileNotFoundError:
+        pass
+    return branch, None
+
+
+def read_git_version() -> Dict[str, Any]:
+    """
+    读取应用所在仓库的 HEAD 信息，读取失败时返回占位结构。
+    """
+    build_info = build_git_version()
+    if build_info is not None:
+        return build_info
+
+    repo_dir = REPO_DIR
+    try:
+        # 只看当前目录，不向上查找可能属于宿主机的仓库
+        git_dir = resolve_git_dir(repo_dir)
+        if git_dir is None:
+            # Not a git repo, return empty structure instead of 404/500 to keep UI happy
+            return placeholder_git_version("Not a git repository")
+
+        branch_name, sha = read_git_head(git_dir)
+        if not sha:
+            return placeholder_git_version("No commits or invalid repo")
+
+        try:
+            output = subprocess.run(
+                [
+                    "git",
+                    "--git-dir",
+                    git_dir,
+                    "log",
+                    "-1",
+                    "--format=%an%x1f%ct%x1f%B",
+                    sha,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                check=True,
+            ).stdout
+            author, committed_date, message = output.split("\x1f", 2)
+        except (OSError, ValueError, subprocess.SubprocessError):
+            # git 不可用或提交对象缺失（浅克隆等）时只返回 sha
+            return placeholder_git_version(
+                "Commit message unavailable", branch=branch_name, sha=sha
+            )
+
+        return {
+            "branch": branch_name,
+            "commit_hash": sha,
+            "short_hash": sha[:7],
+            "commit_message": message.strip(),
+            "author": author,
+            "date": datetime.fromtimestamp(int(committed_date)).isoformat(),
+        }
+    except Exception as e:
+        # Log the error but return a graceful response instead of 500 if possible,
+        # or just raise 500 if it's a critical failure.
+        return placeholder_git_version(
+            str(e), branch="error", sha="error", author="error"
+        )
@@ -1,13 +1,16 @@
+import asyncio
 import base64
 import hashlib
 import hmac
 import os
+import time
 
-from fastapi import Security, HTTPException, status, Depends, Request
+from fastapi import Security, HTTPException, status, Depends, Request, WebSocket
 from fastapi.security import APIKeyHeader
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 from app.core.config import API_KEY_NAME, ADMIN_USER, ADMIN_PASSWORD
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.db.models import APIKeyModel, AdminCredentialModel
 
 api_key_header = APIKeyHeader(
@@ -19,6 +22,19 @@ api_key_header = APIKeyHeader(
 
 _PASSWORD_HASH_ITERATIONS = 600_000
 
+# 已校验通过的 API Key 缓存：key -> 过期时间（time.monotonic）
+_API_KEY_CACHE_TTL = 60
+_API_KEY_CACHE_MAXSIZE = 1024
+_api_key_cache: dict[str, float] = {}
+
+_ADMIN_USER_B = ADMIN_USER.encode("utf-8")
+_ADMIN_PASSWORD_B = ADMIN_PASSWORD.encode("utf-8")
+
+# 仅查询主键的存在性检查语句，模块加载时构建一次，避免 ORM 实体装配
+_API_KEY_EXISTS_STMT = select(APIKeyModel.id).where(
+    APIKeyModel.key == bindparam("key")
+)
+
 
 def hash_password(password: str) -> str:
     """使用 PBKDF2-SHA256 生成可持久化的密码哈希。"""
@@ -53,14 +69,21 @@ def verify_password(password: str, stored_password_hash: str) -> bool:
 
 
 def verify_admin_credentials(db: Session, admin_user: str, admin_pass: str) -> bool:
-    """检查管理员凭据，优先使用已修改并持久化的密码。"""
-    if not hmac.compare_digest(admin_user or "", ADMIN_USER):
-        return False
+    """检查管理员凭据，优先使用已修改并持久化的密码。
+
+    用户名与密码总是都参与比较，避免通过耗时差异判断用户名是否正确；
+    以字节比较，非 ASCII 的请求头不会让 compare_digest 抛出 TypeError。
+    """
+    user_ok = hmac.compare_digest((admin_user or "").encode("utf-8"), _ADMIN_USER_B)
 
     credential = db.get(AdminCredentialModel, 1)
     if credential:
-        return verify_password(admin_pass or "", credential.password_hash)
-    return hmac.compare_digest(admin_pass or "", ADMIN_PASSWORD)
+        pass_ok = verify_password(admin_pass or "", credential.password_hash)
+    else:
+        pass_ok = hmac.compare_digest(
+            (admin_pass or "").encode("utf-8"), _ADMIN_PASSWORD_B
+        )
+    return user_ok & pass_ok
 
 
 def _verify_admin_credentials(request: Request, db: Session) -> bool:
@@ -89,6 +112,72 @@ def _extract_api_key_from_request(request: Request) -> str | None:
     return None
 
 
+def api_key_exists(db: Session, api_key: str) -> bool:
+    """检查 API Key 是否存在于数据库中。"""
+    return db.execute(_API_KEY_EXISTS_STMT, {"key": api_key}).scalar() is not None
+
+
+def _is_cached_api_key(api_key: str) -> bool:
+    """检查 API Key 是否在有效期内的缓存中。"""
+    expires_at = _api_key_cache.get(api_key)
+    if expires_at is None:
+        return False
+    if expires_at > time.monotonic():
+        return True
+    _api_key_cache.pop(api_key, None)
+    return False
+
+
+def _cache_api_key(api_key: str) -> None:
+    """缓存校验通过的 API Key；超出容量时淘汰最早写入的条目。"""
+    if len(_api_key_cache) >= _API_KEY_CACHE_MAXSIZE:
+        _api_key_cache.pop(next(iter(_api_key_cache)), None)
+    _api_key_cache[api_key] = time.monotonic() + _API_KEY_CACHE_TTL
+
+
+def invalidate_api_key(api_key: str) -> None:
+    """API Key 被删除后立即使其缓存失效。"""
+    _api_key_cache.pop(api_key, None)
+
+
+def validate_api_key(db: Session, api_key: str | None) -> bool:
+    """校验 API Key：命中缓存直接通过，否则查询数据库，存在时写入缓存。"""
+    if not api_key:
+        return False
+    if _is_cached_api_key(api_key):
+        return True
+    if api_key_exists(db, api_key):
+        _cache_api_key(api_key)
+        return True
+    return False
+
+
+def _validate_api_key_in_new_session(api_key: str) -> bool:
+    """在独立会话中校验 API Key，供线程中调用。"""
+    db = SessionLocal()
+    try:
+        return validate_api_key(db, api_key)
+    finally:
+        db.close()
+
+
+async def authorize_websocket(
+    websocket: WebSocket, api_key: str | None, reason: str | None = None
+) -> bool:
+    """校验 WebSocket 查询参数中的 API Key，失败时以 1008 关闭连接。
+
+    各 WebSocket 路由共用这一入口，与 HTTP 接口共用校验缓存，命中时不访问数据库；
+    未命中时在线程中新建会话查询，同步数据库调用不阻塞事件循环。
+    """
+    valid = bool(api_key) and (
+        _is_cached_api_key(api_key)
+        or await asyncio.to_thread(_validate_api_key_in_new_session, api_key)
+    )
+    if not valid:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=reason)
+    return valid
+
+
 async def get_api_key(
     request: Request,
     api_key_header: str = Security(api_key_header),
@@ -96,10 +185,8 @@ async def get_api_key(
 ):
     # 先尝试 API Key 认证（支持 X-API-Key 和 Authorization: Bearer）
     api_key = _extract_api_key_from_request(request)
-    if api_key:
-        key_record = db.query(APIKeyModel).filter(APIKeyModel.key == api_key).first()
-        if key_record:
-            return api_key
+    if validate_api_key(db, api_key):
+        return api_key
 
     # 回退到 Admin 凭据认证（Web UI 登录用户）
     if _verify_admin_credentials(request, db):
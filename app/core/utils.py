@@ -1,20 +1,201 @@
+import asyncio
 import docker
 from fastapi import HTTPException
+from fastapi import Request
+from fastapi.responses import Response
+import functools
+import hashlib
+import json
 import socket
 import shlex
-import argparse
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, List
+
+# orjson 为可选依赖，缺失时回退到标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 进程内共享的 Docker 客户端连接池大小
+_DOCKER_MAX_POOL_SIZE = 32
+
+_COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+_SHA256_PREFIX = "sha256:"
+
+_docker_client: docker.DockerClient | None = None
+_docker_client_lock = threading.Lock()
+
+# 全部容器摘要的短期快照，卷、端口、统计等接口在一次仪表盘刷新中共用
+_CONTAINERS_SNAPSHOT_TTL = 2
+_containers_snapshot: tuple[float, List[Dict[str, Any]]] | None = None
+_containers_snapshot_lock = threading.Lock()
+# 卷名 -> 使用该卷的容器名，由同一份快照派生：(快照列表, 索引)
+_volume_index: tuple[List[Dict[str, Any]], Dict[str, List[str]]] | None = None
+
+# 本容器的 inspect 结果很少变化，短期缓存
+_SELF_ATTRS_TTL = 10
+_self_attrs_cache: tuple[float, Dict[str, Any] | None] | None = None
+
+
+def dump_json(data: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON；Docker 返回的数据较大，优先使用 orjson。"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_response(data: Any) -> Response:
+    """
+    直接把 Docker 原始 JSON 数据作为响应返回。
+
+    绕过 response_model 校验与 jsonable_encoder 的逐层遍历，适合 inspect 结果这类
+    没有固定结构的大字典；路由上的 response_model 仍保留用于文档。
+    """
+    return Response(content=dump_json(data), media_type="application/json")
+
+
+def make_etag(body: bytes) -> str:
+    """根据响应体计算强 ETag。"""
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """判断 If-None-Match 请求头是否命中给定 ETag，支持 "*"、多个值与弱校验前缀。"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def conditional_json_response(
+    request: Request, body: bytes, etag: str | None = None
+) -> Response:
+    """
+    返回带 ETag 的 JSON 响应；If-None-Match 与当前 ETag 一致时返回 304。
+
+    供客户端定时轮询的列表接口使用，数据未变化时不再传输响应体。
+    """
+    if etag is None:
+        etag = make_etag(body)
+    headers = {"ETag": etag}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class SingleFlight:
+    """
+    合并相同 key 的并发调用：执行期间到达的调用方等待同一个结果，不重复执行。
+
+    只合并正在进行的调用，完成后立即移除，不缓存结果。
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Any, asyncio.Future] = {}
+
+    async def do(self, key: Any, factory):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 某个调用方被取消时不影响其它仍在等待的调用方
+        return await asyncio.shield(future)
+
+
+def get_shared_docker_client() -> docker.DockerClient:
+    """获取进程内共享的 Docker 客户端，懒初始化；连接失败时原样抛出，不缓存失败结果。"""
+    global _docker_client
+    if _docker_client is not None:
+        return _docker_client
+    with _docker_client_lock:
+        if _docker_client is None:
+            _docker_client = docker.from_env(max_pool_size=_DOCKER_MAX_POOL_SIZE)
+    return _docker_client
 
 
 def get_docker_client():
+    """获取共享的 Docker 客户端；调用方无需也不应关闭它。"""
     try:
-        return docker.from_env()
+        return get_shared_docker_client()
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to connect to Docker daemon: {str(e)}"
         )
 
 
+def close_docker_client():
+    """关闭共享的 Docker 客户端连接池。"""
+    global _docker_client
+    with _docker_client_lock:
+        if _docker_client is not None:
+            _docker_client.close()
+            _docker_client = None
+
+
+def get_containers_snapshot(client) -> List[Dict[str, Any]]:
+    """
+    返回 /containers/json?all=1 的原始摘要列表，缓存 _CONTAINERS_SNAPSHOT_TTL 秒。
+
+    摘要中已包含 Labels、Mounts、Ports、State 与 HostConfig.NetworkMode，调用方
+    无需再逐个 inspect；未命中时只有一个线程请求 Docker。返回的列表为共享对象，
+    调用方不应修改。
+    """
+    global _containers_snapshot
+    cached = _containers_snapshot
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    with _containers_snapshot_lock:
+        cached = _containers_snapshot
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        containers = client.api.containers(all=True)
+        _containers_snapshot = (
+            time.monotonic() + _CONTAINERS_SNAPSHOT_TTL,
+            containers,
+        )
+        return containers
+
+
+def get_volume_usage_index(client) -> Dict[str, List[str]]:
+    """
+    返回卷名到使用该卷的容器名列表的映射，由当前容器快照派生。
+
+    快照更新前重复调用直接复用同一个索引；返回的字典为共享对象，调用方不应修改。
+    """
+    global _volume_index
+    containers = get_containers_snapshot(client)
+    cached = _volume_index
+    if cached is not None and cached[0] is containers:
+        return cached[1]
+    index: Dict[str, List[str]] = {}
+    for c in containers:
+        names = c.get("Names") or ()
+        name = names[0].lstrip("/") if names else ""
+        # 同一容器多次挂载同一个卷时只记一次
+        for volume_name in {
+            m.get("Name")
+            for m in c.get("Mounts") or ()
+            if m.get("Type") == "volume" and m.get("Name")
+        }:
+            index.setdefault(volume_name, []).append(name)
+    _volume_index = (containers, index)
+    return index
+
+
+def invalidate_containers_snapshot():
+    """容器状态发生变化后丢弃快照。"""
+    global _containers_snapshot
+    _containers_snapshot = None
+
+
 def get_self_container(client):
     """
     Get the container object for the current running process.
@@ -30,7 +211,7 @@ def get_self_container(client):
         # Try finding by prefix if self_id is short ID
         if len(self_id) < 64:
             # List all and check prefix
-            containers = client.containers.list(all=True)
+            containers = client.containers.list(all=True, ignore_removed=True)
             for c in containers:
                 if c.id.startswith(self_id):
                     return c
@@ -40,10 +221,48 @@ def get_self_container(client):
     return None
 
 
+def get_self_container_attrs(client) -> Dict[str, Any] | None:
+    """
+    返回本容器的 inspect 结果，缓存 _SELF_ATTRS_TTL 秒；不在容器中或找不到时返回 None。
+
+    Docker Engine 本身支持按 ID 前缀查找，短 ID 无需列举全部容器再比对。
+    """
+    global _self_attrs_cache
+    cached = _self_attrs_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    self_id = get_current_container_id()
+    attrs = None
+    if self_id:
+        try:
+            attrs = client.api.inspect_container(self_id)
+        except docker.errors.NotFound:
+            pass
+    _self_attrs_cache = (time.monotonic() + _SELF_ATTRS_TTL, attrs)
+    return attrs
+
+
+@functools.lru_cache(maxsize=1)
+def load_gputil():
+    """
+    按需导入可选依赖 GPUtil，未安装时返回 None。
+
+    GPUtil 导入时会加载 distutils，耗时上百毫秒，推迟到首次采样 GPU 时再导入，
+    不拖慢应用启动。
+    """
+    try:
+        import GPUtil
+    except ImportError:
+        return None
+    return GPUtil
+
+
+@functools.lru_cache(maxsize=1)
 def get_current_container_id():
     """
     Try to resolve the current container's ID.
     Returns hostname (usually short ID) or full ID from cgroup.
+    进程生命周期内容器 ID 不会变化，结果只解析一次并缓存。
     """
     try:
         # Try to read cgroup to find full container ID
@@ -60,47 +279,52 @@ def get_current_container_id():
     return socket.gethostname()
 
 
+def _summarize_ports(raw_ports) -> tuple[str, List[Dict[str, Any]]]:
+    """将 Docker 的 Ports 列表转换为展示字符串与结构化列表。"""
+    ports = ", ".join(
+        f"{p['PublicPort']}->{p['PrivatePort']}/{p['Type']}"
+        for p in raw_ports
+        if "PublicPort" in p
+    )
+    ports_list = [
+        {
+            "public_port": p.get("PublicPort"),
+            "private_port": p.get("PrivatePort"),
+            "type": p.get("Type"),
+        }
+        for p in raw_ports
+    ]
+    return ports, ports_list
+
+
+def _is_self(container_id: str, self_id: str = None) -> bool:
+    # 完整 ID 与短 ID 互为前缀即视为同一容器，按较短一方的长度比较一次即可
+    if not self_id:
+        return False
+    n = min(len(container_id), len(self_id))
+    return container_id[:n] == self_id[:n]
+
+
 def process_container_summary(container, self_id: str = None) -> Dict[str, Any]:
+    attrs = container.attrs
+
     # Stack
     labels = container.labels or {}
-    stack = labels.get("com.docker.compose.project", "")
+    stack = labels.get(_COMPOSE_PROJECT_LABEL, "")
 
     # Image
-    image = container.attrs.get("Image", "")
-    if image.startswith("sha256:"):
+    image = attrs.get("Image", "")
+    if image.startswith(_SHA256_PREFIX):
         try:
-            if container.image and container.image.tags:
-                image = container.image.tags[0]
+            # container.image 每次访问都会请求 Docker API，只取一次
+            image_obj = container.image
+            if image_obj and image_obj.tags:
+                image = image_obj.tags[0]
         except Exception:
             pass
 
     # Ports
-    ports_str_list = []
-    ports_list = []
-    raw_ports = container.attrs.get("Ports", [])
-    for p in raw_ports:
-        if "PublicPort" in p:
-            ports_str_list.append(f"{p['PublicPort']}->{p['PrivatePort']}/{p['Type']}")
-        ports_list.append(
-            {
-                "public_port": p.get("PublicPort"),
-                "private_port": p.get("PrivatePort"),
-                "type": p.get("Type"),
-            }
-        )
-    ports = ", ".join(ports_str_list)
-
-    is_self = False
-    if self_id:
-        # Check against full ID or short ID
-        if container.id == self_id:
-            is_self = True
-        elif container.id.startswith(self_id):  # self_id is short
-            is_self = True
-        elif self_id.startswith(
-            container.id
-        ):  # self_id is somehow longer (unlikely if container.id is full)
-            is_self = True
+    ports, ports_list = _summarize_ports(attrs.get("Ports") or ())
 
     return {
         "id": container.id,
@@ -110,15 +334,144 @@ def process_container_summary(container, self_id: str = None) -> Dict[str, Any]:
         "image": image,
         "ports": ports,
         "ports_list": ports_list,
-        "is_self": is_self,
+        "is_self": _is_self(container.id, self_id),
+    }
+
+
+def process_raw_container_summary(
+    raw: Dict[str, Any], self_id: str = None
+) -> Dict[str, Any]:
+    """
+    与 process_container_summary 输出相同，但输入为 client.api.containers()
+    返回的原始字典：列表接口已包含镜像名与端口，无需逐个 inspect 或查询镜像。
+    """
+    container_id = raw.get("Id", "")
+    names = raw.get("Names") or ()
+    labels = raw.get("Labels") or {}
+    ports, ports_list = _summarize_ports(raw.get("Ports") or ())
+
+    return {
+        "id": container_id,
+        "name": names[0].lstrip("/") if names else "",
+        "status": str(raw.get("State", "")).lower(),
+        "stack": labels.get(_COMPOSE_PROJECT_LABEL, ""),
+        "image": raw.get("Image", ""),
+        "ports": ports,
+        "ports_list": ports_list,
+        "is_self": _is_self(container_id, self_id),
     }
 
 
-class NoExitArgumentParser(argparse.ArgumentParser):
-    """ArgumentParser 子类，解析失败时抛出 ValueError 而非调用 sys.exit。"""
+# docker run 支持的选项。布尔开关：选项名 -> 目标字段
+_RUN_BOOL_FLAGS = {
+    "-d": "detach",
+    "--detach": "detach",
+    "-i": "interactive",
+    "--interactive": "interactive",
+    "-t": "tty",
+    "--tty": "tty",
+    "--rm": "rm",
+    "--privileged": "privileged",
+}
+# 取值选项：选项名 -> (目标字段, 是否可重复)
+_RUN_VALUE_FLAGS = {
+    "--name": ("name", False),
+    "-p": ("publish", True),
+    "--publish": ("publish", True),
+    "-v": ("volume", True),
+    "--volume": ("volume", True),
+    "-e": ("env", True),
+    "--env": ("env", True),
+    "--restart": ("restart", False),
+    "--network": ("network", False),
+}
+
+
+def _parse_run_args(tokens: List[str]) -> Dict[str, Any]:
+    """
+    按 argparse 的语义解析 docker run 参数：支持 --opt=value、--opt value、
+    -p80、组合短选项（-dit、-dp 80:80），首个位置参数为镜像，其后全部为容器命令。
+    选项集合固定，直接查表，避免每次请求构建 ArgumentParser。
+    """
+    args: Dict[str, Any] = {
+        "image": None,
+        "command": [],
+        "detach": False,
+        "interactive": False,
+        "tty": False,
+        "rm": False,
+        "privileged": False,
+        "name": None,
+        "publish": [],
+        "volume": [],
+        "env": [],
+        "restart": None,
+        "network": None,
+    }
 
-    def error(self, message):
-        raise ValueError(message)
+    def set_value(flag: str, value: str):
+        dest, repeatable = _RUN_VALUE_FLAGS[flag]
+        if repeatable:
+            args[dest].append(value)
+        else:
+            args[dest] = value
+
+    i = 0
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        i += 1
+
+        if token == "--":
+            if i < n:
+                args["image"] = tokens[i]
+                args["command"] = tokens[i + 1 :]
+            break
+
+        if token.startswith("--"):
+            flag, eq, value = token.partition("=")
+            if flag in _RUN_BOOL_FLAGS:
+                if eq:
+                    raise ValueError(
+                        f"argument {flag}: ignored explicit argument '{value}'"
+                    )
+                args[_RUN_BOOL_FLAGS[flag]] = True
+            elif flag in _RUN_VALUE_FLAGS:
+                if not eq:
+                    if i >= n or tokens[i].startswith("-"):
+                        raise ValueError(f"argument {flag}: expected one argument")
+                    value = tokens[i]
+                    i += 1
+                set_value(flag, value)
+            else:
+                raise ValueError(f"unrecognized arguments: {token}")
+            continue
+
+        if token.startswith("-") and len(token) > 1:
+            # 短选项，可能为组合形式：-dit、-dp 80:80、-p8080:80
+            for pos in range(1, len(token)):
+                flag = "-" + token[pos]
+                if flag in _RUN_BOOL_FLAGS:
+                    args[_RUN_BOOL_FLAGS[flag]] = True
+                elif flag in _RUN_VALUE_FLAGS:
+                    value = token[pos + 1 :]
+                    if not value:
+                        if i >= n or tokens[i].startswith("-"):
+                            raise ValueError(f"argument {flag}: expected one argument")
+                        value = tokens[i]
+                        i += 1
+                    set_value(flag, value)
+                    break
+                else:
+                    raise ValueError(f"unrecognized arguments: {token}")
+            continue
+
+        # 首个位置参数为镜像，其后的所有内容原样作为容器命令
+        args["image"] = token
+        args["command"] = tokens[i:]
+        break
+
+    return args
 
 
 def parse_docker_run_command(cmd: str) -> Dict[str, Any]:
@@ -127,26 +480,23 @@ def parse_docker_run_command(cmd: str) -> Dict[str, Any]:
 
     示例:
         "docker run -d -p 8080:80 --name my-nginx nginx"
-    """
-    parser = NoExitArgumentParser(add_help=False)
-
-    # 位置参数
-    parser.add_argument("image", nargs="?")
-    parser.add_argument("command", nargs=argparse.REMAINDER)
-
-    # 常用参数
-    parser.add_argument("-d", "--detach", action="store_true")
-    parser.add_argument("--name")
-    parser.add_argument("-p", "--publish", action="append", default=[])
-    parser.add_argument("-v", "--volume", action="append", default=[])
-    parser.add_argument("-e", "--env", action="append", default=[])
-    parser.add_argument("--restart")
-    parser.add_argument("--network")
-    parser.add_argument("-i", "--interactive", action="store_true")
-    parser.add_argument("-t", "--tty", action="store_true")
-    parser.add_argument("--rm", action="store_true")
-    parser.add_argument("--privileged", action="store_true")
 
+    解析结果只取决于命令字符串，按原始字符串缓存；每次返回新的容器对象，
+    调用方修改返回值不会影响缓存。
+    """
+    params = _parse_docker_run_command_cached(cmd)
+    copied = dict(params)
+    for key in ("command", "volumes"):
+        copied[key] = list(params[key])
+    for key in ("ports", "environment", "restart_policy"):
+        if key in params:
+            copied[key] = dict(params[key])
+    return copied
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_docker_run_command_cached(cmd: str) -> Dict[str, Any]:
+    """parse_docker_run_command 的实际解析逻辑；返回值被缓存共享，不得修改。"""
     # 预处理：移除 'docker run' 前缀
     parts = shlex.split(cmd)
     if not parts:
@@ -164,34 +514,34 @@ def parse_docker_run_command(cmd: str) -> Dict[str, Any]:
         raise ValueError("未提供参数")
 
     try:
-        args = parser.parse_args(args_parts)
+        args = _parse_run_args(args_parts)
     except ValueError as e:
         raise ValueError(f"解析命令失败: {str(e)}")
 
-    if not args.image:
+    if not args["image"]:
         raise ValueError("镜像名称为必填项")
 
     # 构造 docker-py 参数
     params = {
-        "image": args.image,
-        "command": args.command,
-        "detach": args.detach,
-        "name": args.name,
+        "image": args["image"],
+        "command": args["command"],
+        "detach": args["detach"],
+        "name": args["name"],
         "ports": {},
         "volumes": [],
         "environment": {},
-        "network": args.network,
-        "stdin_open": args.interactive,
-        "tty": args.tty,
-        "auto_remove": args.rm,
-        "privileged": args.privileged,
+        "network": args["network"],
+        "stdin_open": args["interactive"],
+        "tty": args["tty"],
+        "auto_remove": args["rm"],
+        "privileged": args["privileged"],
     }
 
-    if args.restart:
-        params["restart_policy"] = {"Name": args.restart}
+    if args["restart"]:
+        params["restart_policy"] = {"Name": args["restart"]}
 
     # 处理端口: -p 8080:80 或 -p 80
-    for p in args.publish:
+    for p in args["publish"]:
         if ":" in p:
             parts = p.split(":")
             if len(parts) == 2:
@@ -206,10 +556,10 @@ def parse_docker_run_command(cmd: str) -> Dict[str, Any]:
             params["ports"][f"{p}/tcp"] = None
 
     # 处理卷: -v /host:/container
-    params["volumes"] = args.volume
+    params["volumes"] = args["volume"]
 
     # 处理环境变量: -e KEY=VAL
-    for e in args.env:
+    for e in args["env"]:
         if "=" in e:
             k, v = e.split("=", 1)
             params["environment"][k] = v
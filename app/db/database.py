@@ -1,16 +1,56 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import zlib
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data/keys.db"
 # Ensure data directory exists
 os.makedirs("./data", exist_ok=True)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """每个新连接启用 WAL：读请求（如 API Key 校验）不再被写事务阻塞。"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=134217728")
+    cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+def _schema_fingerprint() -> int:
+    """由表名与列名生成的结构指纹，取 31 位以放入 SQLite 的 user_version。"""
+    layout = sorted(
+        (name, sorted(table.columns.keys()))
+        for name, table in Base.metadata.tables.items()
+    )
+    return zlib.crc32(repr(layout).encode("utf-8")) & 0x7FFFFFFF
+
+
+def init_db(bind=engine):
+    """
+    建表；库中记录的 user_version 与当前模型指纹一致时跳过 create_all。
+
+    指纹保存在数据库文件自身，删除或替换数据库后会自动重新建表。
+    """
+    fingerprint = _schema_fingerprint()
+    with bind.begin() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() == fingerprint:
+            return
+        Base.metadata.create_all(bind=conn)
+        conn.exec_driver_sql(f"PRAGMA user_version = {fingerprint}")
+
+
 def get_db():
     db = SessionLocal()
     try:
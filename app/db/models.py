@@ -4,9 +4,14 @@ import uuid
 from .database import Base
 
 
+def _new_id() -> str:
+    """生成 32 位十六进制主键；比带连字符的 36 位字符串更短，索引更紧凑。"""
+    return uuid.uuid4().hex
+
+
 class APIKeyModel(Base):
     __tablename__ = "api_keys"
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, index=True, default=_new_id)
     key = Column(String, unique=True, index=True)
     note = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -14,7 +19,7 @@ class APIKeyModel(Base):
 
 class ClusterNode(Base):
     __tablename__ = "cluster_nodes"
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, index=True, default=_new_id)
     name = Column(String, unique=True, index=True)
     base_url = Column(String)
     admin_user = Column(String)
@@ -24,8 +24,9 @@ from contextlib import contextmanager
 import docker
 from sqlalchemy.orm import Session
 
+from app.core.security import validate_api_key
+from app.core.utils import get_shared_docker_client
 from app.db.database import SessionLocal
-from app.db.models import APIKeyModel
 
 # ---- 模块级常量 ----
 # 从环境变量读取 API Key，用于 MCP 客户端认证
@@ -44,6 +45,7 @@ def get_docker_client_safe() -> docker.DockerClient:
     - 使用 docker.from_env() 自动检测 Docker 连接配置
     - 支持 DOCKER_HOST 环境变量、Unix socket、TLS 配置等
     - 如果 Docker socket 不可达（权限不足、未安装 Docker 等），抛出异常
+    - 与 FastAPI 路由共享同一个进程内客户端及其连接池，调用方不应关闭它
 
     返回:
         docker.DockerClient: 已连接的 Docker 客户端实例
@@ -53,7 +55,7 @@ def get_docker_client_safe() -> docker.DockerClient:
                       包含具体错误原因
     """
     try:
-        return docker.from_env()
+        return get_shared_docker_client()
     except Exception as e:
         raise RuntimeError(f"无法连接到 Docker 守护进程：{e}")
 
@@ -132,11 +134,9 @@ def check_api_key(api_key: str | None = None) -> bool:
     # 第 2 级：数据库验证模式 — 查找 api_keys 表
     if api_key:
         try:
+            # 与 HTTP/WebSocket 接口共用校验缓存，未命中时只查询主键
             with get_db_session() as db:
-                exists = (
-                    db.query(APIKeyModel).filter(APIKeyModel.key == api_key).first()
-                )
-                return exists is not None
+                return validate_api_key(db, api_key)
         except Exception:
             # 数据库不可用时返回 False（而非抛出异常，避免暴露内部状态）
             return False
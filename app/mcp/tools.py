@@ -61,7 +61,7 @@ MCP 工具定义 — Docker 资源管理工具集。
 2. 客户端获取：调用 get_docker_client_safe() 获取 Docker 连接
 3. 核心逻辑：执行 Docker 操作
 4. 错误处理：捕获 docker.errors 异常，转为 RuntimeError（含中文描述）
-5. 资源释放：finally 块中调用 client.close()
+5. 资源释放：Docker 客户端为进程内共享实例，工具函数中不关闭
 
 === 与其他模块的关系 ===
 
@@ -78,13 +78,14 @@ import uuid
 from datetime import datetime
 
 import docker
-import git
 import psutil
 from mcp.server import MCPServer
 
-from app.core.config import PROJECTS_DIR
+from app.core.config import HOST_MONITOR_ROOT, PROJECTS_DIR
+from app.core.git_info import read_git_version
 from app.core.utils import (
     get_current_container_id,
+    load_gputil,
     parse_docker_run_command,
     process_container_summary,
 )
@@ -93,12 +94,8 @@ from app.db.models import ProjectModel
 from .helpers import get_docker_client_safe, get_db_session
 
 # ---- 可选依赖 ----
-# GPUtil 用于 GPU 监控，不是所有环境都需要
+# GPUtil 用于 GPU 监控，不是所有环境都需要，由 load_gputil 在首次使用时导入
 # 如果未安装，GPU 相关功能静默跳过
-try:
-    import GPUtil
-except ImportError:
-    GPUtil = None
 
 
 def register_all_tools(server: MCPServer) -> None:
@@ -143,24 +140,21 @@ def register_all_tools(server: MCPServer) -> None:
             self_id 用于标记当前运行的容器（避免 AI 误操作自身）。
         """
         client = get_docker_client_safe()
-        try:
-            containers = client.containers.list(all=all)
-            if summary:
-                self_id = get_current_container_id()
-                return [process_container_summary(c, self_id) for c in containers]
-            return [
-                {
-                    "id": c.id,
-                    "short_id": c.short_id,
-                    "name": c.name,
-                    "status": str(c.status).lower(),  # 统一小写，如 "running", "exited"
-                    "image": str(c.image),
-                    "attrs": c.attrs,  # 完整的 Docker inspect 输出
-                }
-                for c in containers
-            ]
-        finally:
-            client.close()
+        containers = client.containers.list(all=all, ignore_removed=True)
+        if summary:
+            self_id = get_current_container_id()
+            return [process_container_summary(c, self_id) for c in containers]
+        return [
+            {
+                "id": c.id,
+                "short_id": c.short_id,
+                "name": c.name,
+                "status": str(c.status).lower(),  # 统一小写，如 "running", "exited"
+                "image": str(c.image),
+                "attrs": c.attrs,  # 完整的 Docker inspect 输出
+            }
+            for c in containers
+        ]
 
     @server.tool(description="通过 ID 或名称获取指定容器的详细信息。")
     def get_container(container_id: str) -> dict:
@@ -182,8 +176,6 @@ def register_all_tools(server: MCPServer) -> None:
             return client.containers.get(container_id).attrs
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(description="获取指定容器的日志。")
     def get_container_logs(
@@ -213,8 +205,6 @@ def register_all_tools(server: MCPServer) -> None:
             return {"logs": logs}
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(description="启动一个已停止的容器。")
     def start_container(container_id: str) -> dict:
@@ -238,8 +228,6 @@ def register_all_tools(server: MCPServer) -> None:
             }
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(description="正常停止一个正在运行的容器。")
     def stop_container(container_id: str) -> dict:
@@ -266,8 +254,6 @@ def register_all_tools(server: MCPServer) -> None:
             }
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(description="重启一个容器。")
     def restart_container(container_id: str) -> dict:
@@ -293,8 +279,6 @@ def register_all_tools(server: MCPServer) -> None:
             }
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(description="强制终止（kill）一个容器。")
     def kill_container(container_id: str) -> dict:
@@ -323,8 +307,6 @@ def register_all_tools(server: MCPServer) -> None:
             }
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(description="暂停容器中的所有进程。")
     def pause_container(container_id: str) -> dict:
@@ -350,8 +332,6 @@ def register_all_tools(server: MCPServer) -> None:
             }
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(description="恢复（取消暂停）一个容器。")
     def unpause_container(container_id: str) -> dict:
@@ -376,8 +356,6 @@ def register_all_tools(server: MCPServer) -> None:
             }
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(description="删除一个容器。可选择强制删除和同时删除关联的卷。")
     def remove_container(
@@ -409,8 +387,6 @@ def register_all_tools(server: MCPServer) -> None:
             }
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到容器：{container_id}")
-        finally:
-            client.close()
 
     @server.tool(
         description=(
@@ -468,8 +444,6 @@ def register_all_tools(server: MCPServer) -> None:
             raise RuntimeError(f"未找到镜像：{e}")
         except docker.errors.APIError as e:
             raise RuntimeError(f"Docker API 错误：{e}")
-        finally:
-            client.close()
 
     # ================================================================
     # 镜像工具（Image Tools）
@@ -498,25 +472,22 @@ def register_all_tools(server: MCPServer) -> None:
             对大型环境（>100 容器）可能较慢。
         """
         client = get_docker_client_safe()
-        try:
-            images = client.images.list()
-            # 收集所有容器使用的镜像 ID，用于计算 in_use 字段
-            containers = client.containers.list(all=True)
-            used_image_ids = {c.attrs["Image"] for c in containers}
-            return [
-                {
-                    "id": img.id,
-                    "tags": img.tags,
-                    "created": img.attrs.get("Created"),
-                    "size": img.attrs.get("Size"),
-                    "labels": img.labels,
-                    "short_id": img.short_id,
-                    "in_use": img.id in used_image_ids,
-                }
-                for img in images
-            ]
-        finally:
-            client.close()
+        images = client.images.list()
+        # 收集所有容器使用的镜像 ID，用于计算 in_use 字段
+        containers = client.containers.list(all=True, ignore_removed=True)
+        used_image_ids = {c.attrs["Image"] for c in containers}
+        return [
+            {
+                "id": img.id,
+                "tags": img.tags,
+                "created": img.attrs.get("Created"),
+                "size": img.attrs.get("Size"),
+                "labels": img.labels,
+                "short_id": img.short_id,
+                "in_use": img.id in used_image_ids,
+            }
+            for img in images
+        ]
 
     @server.tool(description="通过 ID 或名称（标签）获取指定镜像的详细信息。")
     def get_image(image_id: str) -> dict:
@@ -536,7 +507,7 @@ def register_all_tools(server: MCPServer) -> None:
         client = get_docker_client_safe()
         try:
             image = client.images.get(image_id)
-            containers = client.containers.list(all=True)
+            containers = client.containers.list(all=True, ignore_removed=True)
             used_image_ids = {c.attrs["Image"] for c in containers}
             data = dict(image.attrs or {})
             data["id"] = image.id
@@ -546,8 +517,6 @@ def register_all_tools(server: MCPServer) -> None:
             return data
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到镜像：{image_id}")
-        finally:
-            client.close()
 
     @server.tool(description="从注册表拉取一个 Docker 镜像。")
     def pull_image(image: str, tag: str = "latest") -> dict:
@@ -580,8 +549,6 @@ def register_all_tools(server: MCPServer) -> None:
             }
         except docker.errors.APIError as e:
             raise RuntimeError(f"Docker API 错误：{e}")
-        finally:
-            client.close()
 
     @server.tool(
         description=("删除一个 Docker 镜像。image_id 可以是短 ID、完整 ID 或名称。")
@@ -617,8 +584,6 @@ def register_all_tools(server: MCPServer) -> None:
             raise RuntimeError(f"未找到镜像：{image_id}")
         except docker.errors.APIError as e:
             raise RuntimeError(f"删除镜像失败：{e}")
-        finally:
-            client.close()
 
     # ================================================================
     # 网络工具（Network Tools）
@@ -643,23 +608,20 @@ def register_all_tools(server: MCPServer) -> None:
             - created: 创建时间
         """
         client = get_docker_client_safe()
-        try:
-            networks = client.networks.list()
-            return [
-                {
-                    "id": net.id,
-                    "name": net.name,
-                    "driver": net.attrs.get("Driver"),
-                    "scope": net.attrs.get("Scope"),
-                    "ipam": net.attrs.get("IPAM"),
-                    "containers": net.attrs.get("Containers"),
-                    "short_id": net.short_id,
-                    "created": net.attrs.get("Created"),
-                }
-                for net in networks
-            ]
-        finally:
-            client.close()
+        networks = client.networks.list()
+        return [
+            {
+                "id": net.id,
+                "name": net.name,
+                "driver": net.attrs.get("Driver"),
+                "scope": net.attrs.get("Scope"),
+                "ipam": net.attrs.get("IPAM"),
+                "containers": net.attrs.get("Containers"),
+                "short_id": net.short_id,
+                "created": net.attrs.get("Created"),
+            }
+            for net in networks
+        ]
 
     @server.tool(description="通过 ID 或名称获取指定网络的详细信息。")
     def get_network(network_id: str) -> dict:
@@ -681,8 +643,6 @@ def register_all_tools(server: MCPServer) -> None:
             return client.networks.get(network_id).attrs
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到网络：{network_id}")
-        finally:
-            client.close()
 
     # ================================================================
     # 卷工具（Volume Tools）
@@ -710,31 +670,28 @@ def register_all_tools(server: MCPServer) -> None:
             - in_use: 是否至少有一个容器挂载此卷
         """
         client = get_docker_client_safe()
-        try:
-            volumes = client.volumes.list()
-            # 收集所有容器使用的卷名，用于计算 in_use 字段
-            containers = client.containers.list(all=True)
-            used_volume_names: set[str] = set()
-            for c in containers:
-                for m in c.attrs.get("Mounts", []):
-                    if m.get("Type") == "volume":
-                        name = m.get("Name")
-                        if name:
-                            used_volume_names.add(name)
-            return [
-                {
-                    "id": vol.id,
-                    "name": vol.name,
-                    "driver": vol.attrs.get("Driver"),
-                    "created": vol.attrs.get("CreatedAt"),
-                    "mountpoint": vol.attrs.get("Mountpoint"),
-                    "labels": vol.attrs.get("Labels"),
-                    "in_use": vol.name in used_volume_names,
-                }
-                for vol in volumes
-            ]
-        finally:
-            client.close()
+        volumes = client.volumes.list()
+        # 收集所有容器使用的卷名，用于计算 in_use 字段
+        containers = client.containers.list(all=True, ignore_removed=True)
+        used_volume_names: set[str] = set()
+        for c in containers:
+            for m in c.attrs.get("Mounts", []):
+                if m.get("Type") == "volume":
+                    name = m.get("Name")
+                    if name:
+                        used_volume_names.add(name)
+        return [
+            {
+                "id": vol.id,
+                "name": vol.name,
+                "driver": vol.attrs.get("Driver"),
+                "created": vol.attrs.get("CreatedAt"),
+                "mountpoint": vol.attrs.get("Mountpoint"),
+                "labels": vol.attrs.get("Labels"),
+                "in_use": vol.name in used_volume_names,
+            }
+            for vol in volumes
+        ]
 
     @server.tool(description="通过 ID 或名称获取指定卷的详细信息。")
     def get_volume(volume_id: str) -> dict:
@@ -755,7 +712,7 @@ def register_all_tools(server: MCPServer) -> None:
         try:
             volume = client.volumes.get(volume_id)
             # 查找所有使用此卷的容器
-            containers = client.containers.list(all=True)
+            containers = client.containers.list(all=True, ignore_removed=True)
             used_by: list[str] = []
             for c in containers:
                 for m in c.attrs.get("Mounts", []):
@@ -769,8 +726,6 @@ def register_all_tools(server: MCPServer) -> None:
             return data
         except docker.errors.NotFound:
             raise RuntimeError(f"未找到卷：{volume_id}")
-        finally:
-            client.close()
 
     @server.tool(description="删除一个 Docker 卷。")
     def remove_volume(volume_id: str, force: bool = False) -> dict:
@@ -809,8 +764,6 @@ def register_all_tools(server: MCPServer) -> None:
             if "in use" in str(e).lower():
                 raise RuntimeError(f"卷正在使用中：{e}")
             raise RuntimeError(f"Docker API 错误：{e}")
-        finally:
-            client.close()
 
     # ================================================================
     # 系统工具（System Tools）
@@ -843,7 +796,7 @@ def register_all_tools(server: MCPServer) -> None:
         # 统计容器总数、运行数、停止数、镜像数
         try:
             client = get_docker_client_safe()
-            containers = client.containers.list(all=True)
+            containers = client.containers.list(all=True, ignore_removed=True)
             images = client.images.list()
             running = sum(1 for c in containers if c.status == "running")
             result["docker"] = {
@@ -854,30 +807,18 @@ def register_all_tools(server: MCPServer) -> None:
                 },
                 "images": len(images),
             }
-            client.close()
         except Exception as e:
             result["docker"] = {"error": str(e)}
 
         # ---- Git 版本 ----
         # 获取当前代码的 Git 版本信息
-        # search_parent_directories=False: 只查找当前目录是否为 git 仓库
-        # 避免在挂载的主机文件系统中意外搜索到其他 git 仓库
-        try:
-            repo = git.Repo(os.getcwd(), search_parent_directories=False)
-            head = repo.head.commit
-            branch = "detached"  # 默认值：HEAD 处于 detached 状态
-            if not repo.head.is_detached:
-                branch = repo.active_branch.name
-            result["git"] = {
-                "branch": branch,
-                "commit_hash": head.hexsha,
-                "short_hash": head.hexsha[:7],
-                "commit_message": head.message.strip(),
-                "author": head.author.name,
-                "date": datetime.fromtimestamp(head.committed_date).isoformat(),
-            }
-        except Exception:
+        # 只查找当前目录是否为 git 仓库，避免在挂载的主机文件系统中意外搜索到其他仓库
+        # 直接读取 .git 文件，只有取到提交 sha 时才视为成功
+        info = read_git_version()
+        if info["commit_hash"] in ("unknown", "error"):
             result["git"] = {"error": "无法获取 git 信息"}
+        else:
+            result["git"] = info
 
         # ---- 系统资源 ----
         # CPU 使用率（interval=1 采样 1 秒获得准确值）
@@ -935,7 +876,7 @@ def register_all_tools(server: MCPServer) -> None:
 
         # ---- 磁盘 ----
         disks: list[dict] = []
-        host_fs = os.getenv("HOST_FILESYSTEM_ROOT", "/")
+        host_fs = HOST_MONITOR_ROOT
         try:
             if host_fs != "/" and os.path.exists(host_fs):
                 # 容器化环境：通常 HOST_FILESYSTEM_ROOT=/hostfs
@@ -980,9 +921,10 @@ def register_all_tools(server: MCPServer) -> None:
         # GPUtil 提供 NVIDIA GPU 监控（通过 nvidia-smi）
         # 如果没有 NVIDIA GPU 或未安装驱动，GPUtil.getGPUs() 返回空列表
         gpus: list[dict] = []
-        if GPUtil:
+        gputil = load_gputil()
+        if gputil:
             try:
-                for gpu in GPUtil.getGPUs():
+                for gpu in gputil.getGPUs():
                     gpus.append(
                         {
                             "id": gpu.id,
@@ -1029,19 +971,16 @@ def register_all_tools(server: MCPServer) -> None:
             Docker Swarm 项目使用不同的标签（见 get_stack_containers）。
         """
         client = get_docker_client_safe()
-        try:
-            containers = client.containers.list(all=True)
-            stacks: dict[str, int] = {}
-            for c in containers:
-                labels = c.labels or {}
-                stack_name = labels.get("com.docker.compose.project")
-                if stack_name:
-                    stacks[stack_name] = stacks.get(stack_name, 0) + 1
-            return [
-                {"name": k, "container_count": v} for k, v in sorted(stacks.items())
-            ]
-        finally:
-            client.close()
+        containers = client.containers.list(all=True, ignore_removed=True)
+        stacks: dict[str, int] = {}
+        for c in containers:
+            labels = c.labels or {}
+            stack_name = labels.get("com.docker.compose.project")
+            if stack_name:
+                stacks[stack_name] = stacks.get(stack_name, 0) + 1
+        return [
+            {"name": k, "container_count": v} for k, v in sorted(stacks.items())
+        ]
 
     @server.tool(description="获取属于指定堆栈的所有容器。")
     def get_stack_containers(stack_name: str) -> list[dict]:
@@ -1065,19 +1004,20 @@ def register_all_tools(server: MCPServer) -> None:
         """
         client = get_docker_client_safe()
         self_id = get_current_container_id()
-        try:
-            # 第 1 步：通过 docker compose 标签查找
-            filters = {"label": f"com.docker.compose.project={stack_name}"}
-            containers = client.containers.list(all=True, filters=filters)
+        # 第 1 步：通过 docker compose 标签查找
+        filters = {"label": f"com.docker.compose.project={stack_name}"}
+        containers = client.containers.list(
+            all=True, ignore_removed=True, filters=filters
+        )
 
-            # 第 2 步：如果没找到，尝试 docker stack 标签
-            if not containers:
-                filters_swarm = {"label": f"com.docker.stack.namespace={stack_name}"}
-                containers = client.containers.list(all=True, filters=filters_swarm)
+        # 第 2 步：如果没找到，尝试 docker stack 标签
+        if not containers:
+            filters_swarm = {"label": f"com.docker.stack.namespace={stack_name}"}
+            containers = client.containers.list(
+                all=True, ignore_removed=True, filters=filters_swarm
+            )
 
-            return [process_container_summary(c, self_id) for c in containers]
-        finally:
-            client.close()
+        return [process_container_summary(c, self_id) for c in containers]
 
     # ================================================================
     # 项目工具（Project Tools）
@@ -1444,8 +1384,6 @@ services:
         except Exception as exc:
             logs.append(f"[ERROR] 构建失败: {exc}")
             build_success = False
-        finally:
-            client.close()
 
         # 更新最终状态
         with get_db_session() as db:
@@ -1541,10 +1479,10 @@ services:
             client = get_docker_client_safe()
             containers = client.containers.list(
                 all=True,
+                ignore_removed=True,
                 filters={"label": f"com.docker.compose.project={compose_name}"},
             )
             container_ids = [c.id for c in containers]
-            client.close()
         except Exception:
             pass
 
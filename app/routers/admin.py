@@ -8,13 +8,22 @@ from fastapi import (
     UploadFile,
 )
 from fastapi.responses import HTMLResponse
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from datetime import datetime
 from typing import List, Dict, Any, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+import asyncio
 import os
 import uuid
-import requests
-from app.core.security import get_api_key, hash_password, verify_admin_credentials
+import httpx
+from app.core.security import (
+    get_api_key,
+    hash_password,
+    invalidate_api_key,
+    verify_admin_credentials,
+)
 from app.core.config import (
     ADMIN_USER,
     AVATAR_UPLOAD_DIR,
@@ -38,6 +47,109 @@ from app.services.email_service import (
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# 集群节点同步请求的超时时间（秒）
+_PROPAGATION_TIMEOUT = 10
+# 同时进行的节点同步请求上限，节点很多时避免瞬间打开大量连接
+_PROPAGATION_CONCURRENCY = 32
+_propagation_semaphore = asyncio.Semaphore(_PROPAGATION_CONCURRENCY)
+
+_propagation_client: httpx.AsyncClient | None = None
+
+
+def _get_propagation_client() -> httpx.AsyncClient:
+    """获取复用的集群同步 HTTPX 客户端，懒初始化。"""
+    global _propagation_client
+    if _propagation_client is None:
+        _propagation_client = httpx.AsyncClient(
+            timeout=_PROPAGATION_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=_PROPAGATION_CONCURRENCY * 2,
+                max_keepalive_connections=64,
+                keepalive_expiry=30,
+            ),
+        )
+    return _propagation_client
+
+
+async def close_propagation_client():
+    """关闭集群同步 HTTPX 客户端连接池。"""
+    global _propagation_client
+    if _propagation_client is not None:
+        await _propagation_client.aclose()
+        _propagation_client = None
+
+
+def _resolve_target_nodes(data: Dict[str, Any], db: Session) -> List[ClusterNode]:
+    """根据请求中的 apply_all / targets 解析需要同步的集群节点。"""
+    targets: Optional[List[str]] = data.get("targets")
+    if data.get("apply_all"):
+        return db.query(ClusterNode).all()
+    if targets:
+        return db.query(ClusterNode).filter(ClusterNode.id.in_(targets)).all()
+    return []
+
+
+async def _propagate(
+    nodes: List[ClusterNode], method: str, path: str, payload: Any = None
+) -> List[Dict[str, Any]]:
+    """并发向各节点发送同步请求，单个节点失败不影响其他节点。"""
+    if not nodes:
+        return []
+
+    client = _get_propagation_client()
+
+    async def _send(n: ClusterNode) -> httpx.Response:
+        async with _propagation_semaphore:
+            return await client.request(
+                method,
+                f"{n.base_url.rstrip('/')}{path}",
+                headers={"X-Admin-User": n.admin_user, "X-Admin-Pass": n.admin_pass},
+                json=payload,
+            )
+
+    responses = await asyncio.gather(*(_send(n) for n in nodes), return_exceptions=True)
+
+    results: List[Dict[str, Any]] = []
+    for n, r in zip(nodes, responses):
+        if isinstance(r, Exception):
+            results.append({"node": n.name, "error": str(r)})
+        else:
+            results.append({"node": n.name, "status": r.status_code})
+    return results
+
+
+_LIST_KEYS_STMT = select(
+    APIKeyModel.id, APIKeyModel.key, APIKeyModel.note, APIKeyModel.created_at
+)
+_LIST_NODES_STMT = select(
+    ClusterNode.id,
+    ClusterNode.name,
+    ClusterNode.base_url,
+    ClusterNode.admin_user,
+    ClusterNode.admin_pass,
+    ClusterNode.created_at,
+)
+
+
+class APIKeyOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    key: str
+    note: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ClusterNodeOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: str
+    base_url: Optional[str] = None
+    admin_user: Optional[str] = None
+    admin_pass: Optional[str] = None
+    created_at: Optional[datetime] = None
+
 
 class ChangePasswordRequest(BaseModel):
     current_password: str = Field(min_length=1, max_length=256)
@@ -173,89 +285,134 @@ def send_test_email_to_users(data: SendEmailRequest, db: Session = Depends(get_d
     return {"message": "邮件发送成功", "recipient_count": len(data.recipients)}
 
 
-@router.get("/keys", dependencies=[Depends(get_api_key)])
+@router.get(
+    "/keys", response_model=List[APIKeyOut], dependencies=[Depends(get_api_key)]
+)
 def list_keys(db: Session = Depends(get_db)):
-    result = db.query(APIKeyModel).all()
-    return result
+    # 直接取列映射，跳过 ORM 对象构建与 identity map
+    return db.execute(_LIST_KEYS_STMT).mappings().all()
 
 
-@router.post("/keys", dependencies=[Depends(get_api_key)])
-def add_key(data: Dict[str, Any], db: Session = Depends(get_db)):
+def _insert_key(
+    db: Session, data: Dict[str, Any]
+) -> tuple[Optional[APIKeyModel], List[ClusterNode]]:
+    """同步写入单个 Key 并解析同步目标节点；key 已存在时返回 (None, [])。"""
     new_key_str = data.get("key") or str(uuid.uuid4().hex)
-    existing = db.query(APIKeyModel).filter(APIKeyModel.key == new_key_str).first()
-    if existing:
+    # 单条 INSERT ... ON CONFLICT DO NOTHING RETURNING，冲突时无返回行即视为重复
+    new_key = db.scalars(
+        sqlite_insert(APIKeyModel)
+        .values(key=new_key_str, note=data.get("note"))
+        .on_conflict_do_nothing(index_elements=["key"])
+        .returning(APIKeyModel)
+    ).first()
+    if new_key is None:
+        db.rollback()
+        return None, []
+    # RETURNING 已取回完整行，提交前脱离会话，避免 commit 后属性过期再次查询
+    db.expunge(new_key)
+    db.commit()
+    return new_key, _resolve_target_nodes(data, db)
+
+
+@router.post("/keys", dependencies=[Depends(get_api_key)])
+async def add_key(data: Dict[str, Any], db: Session = Depends(get_db)):
+    # 数据库读写为同步阻塞调用，放到线程中执行，事件循环上只等待各节点同步
+    new_key, nodes = await asyncio.to_thread(_insert_key, db, data)
+    if new_key is None:
         raise HTTPException(status_code=400, detail="Key already exists")
 
-    new_key = APIKeyModel(key=new_key_str, note=data.get("note"))
-    db.add(new_key)
+    results = await _propagate(
+        nodes, "POST", "/admin/keys", {"key": new_key.key, "note": new_key.note}
+    )
+
+    return {"key": new_key, "propagation": results}
+
+
+# 单次批量添加的上限；写入时按批插入，每批的绑定参数数量低于 SQLite 的 999 上限
+_BULK_KEYS_MAX = 1000
+_BULK_INSERT_CHUNK = 400
+
+
+def _insert_keys_bulk(
+    db: Session, rows: List[Dict[str, Any]], data: Dict[str, Any]
+) -> tuple[set[str], List[ClusterNode]]:
+    """同步写入批量 Key 并解析同步目标节点，返回实际插入的 key 与节点列表。"""
+    inserted: set[str] = set()
+    # INSERT ... ON CONFLICT DO NOTHING 分批写入，已存在的由数据库跳过，最后一次提交
+    for start in range(0, len(rows), _BULK_INSERT_CHUNK):
+        inserted.update(
+            db.scalars(
+                sqlite_insert(APIKeyModel)
+                .values(rows[start : start + _BULK_INSERT_CHUNK])
+                .on_conflict_do_nothing(index_elements=["key"])
+                .returning(APIKeyModel.key)
+            ).all()
+        )
     db.commit()
-    db.refresh(new_key)
+    nodes = _resolve_target_nodes(data, db) if inserted else []
+    return inserted, nodes
 
-    targets: Optional[List[str]] = data.get("targets")
-    apply_all: bool = bool(data.get("apply_all"))
-    if apply_all:
-        nodes = db.query(ClusterNode).all()
-    elif targets:
-        nodes = db.query(ClusterNode).filter(ClusterNode.id.in_(targets)).all()
-    else:
-        nodes = []
 
-    results: List[Dict[str, Any]] = []
-    for n in nodes:
-        try:
-            r = requests.post(
-                f"{n.base_url.rstrip('/')}/admin/keys",
-                headers={"X-Admin-User": n.admin_user, "X-Admin-Pass": n.admin_pass},
-                json={"key": new_key.key, "note": new_key.note},
-                timeout=10,
-            )
-            results.append({"node": n.name, "status": r.status_code})
-        except Exception as e:
-            results.append({"node": n.name, "error": str(e)})
+@router.post("/keys/bulk", dependencies=[Depends(get_api_key)])
+async def add_keys_bulk(data: Dict[str, Any], db: Session = Depends(get_db)):
+    """批量添加 API Key，一次提交；同步到每个节点时也只发送一次批量请求。"""
+    items = data.get("keys")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="keys must be a non-empty list")
+    if len(items) > _BULK_KEYS_MAX:
+        raise HTTPException(
+            status_code=400, detail=f"at most {_BULK_KEYS_MAX} keys per request"
+        )
 
-    return {"key": new_key, "propagation": results}
+    rows: List[Dict[str, Any]] = []
+    skipped: List[str] = []
+    seen: set[str] = set()
+    for item in items:
+        if not isinstance(item, dict):
+            raise HTTPException(status_code=400, detail="Invalid key item")
+        key_str = item.get("key") or str(uuid.uuid4().hex)
+        if key_str in seen:
+            skipped.append(key_str)
+            continue
+        seen.add(key_str)
+        rows.append({"key": key_str, "note": item.get("note")})
+
+    # 数据库读写为同步阻塞调用，放到线程中执行，不阻塞事件循环
+    inserted, nodes = await asyncio.to_thread(_insert_keys_bulk, db, rows, data)
+
+    payload_keys = [row for row in rows if row["key"] in inserted]
+    skipped.extend(row["key"] for row in rows if row["key"] not in inserted)
+    results = await _propagate(
+        nodes, "POST", "/admin/keys/bulk", {"keys": payload_keys}
+    )
+
+    return {"keys": payload_keys, "skipped": skipped, "propagation": results}
 
 
 @router.delete("/keys/{key_str}", dependencies=[Depends(get_api_key)])
 def delete_key(key_str: str, db: Session = Depends(get_db)):
-    key = db.query(APIKeyModel).filter(APIKeyModel.key == key_str).first()
-    if not key:
+    result = db.execute(delete(APIKeyModel).where(APIKeyModel.key == key_str))
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Key not found")
-    db.delete(key)
     db.commit()
+    invalidate_api_key(key_str)
     return {"status": "deleted"}
 
 
 @router.delete("/keys/{key_str}/propagate", dependencies=[Depends(get_api_key)])
-def delete_key_propagate(
+async def delete_key_propagate(
     key_str: str, data: Dict[str, Any], db: Session = Depends(get_db)
 ):
-    targets: Optional[List[str]] = data.get("targets")
-    apply_all: bool = bool(data.get("apply_all"))
-    if apply_all:
-        nodes = db.query(ClusterNode).all()
-    elif targets:
-        nodes = db.query(ClusterNode).filter(ClusterNode.id.in_(targets)).all()
-    else:
-        nodes = []
-
-    results: List[Dict[str, Any]] = []
-    for n in nodes:
-        try:
-            r = requests.delete(
-                f"{n.base_url.rstrip('/')}/admin/keys/{key_str}",
-                headers={"X-Admin-User": n.admin_user, "X-Admin-Pass": n.admin_pass},
-                timeout=10,
-            )
-            results.append({"node": n.name, "status": r.status_code})
-        except Exception as e:
-            results.append({"node": n.name, "error": str(e)})
+    nodes = await asyncio.to_thread(_resolve_target_nodes, data, db)
+    results = await _propagate(nodes, "DELETE", f"/admin/keys/{key_str}")
     return {"status": "deleted", "propagation": results}
 
 
-@router.get("/nodes", dependencies=[Depends(get_api_key)])
+@router.get(
+    "/nodes", response_model=List[ClusterNodeOut], dependencies=[Depends(get_api_key)]
+)
 def list_nodes(db: Session = Depends(get_db)):
-    return db.query(ClusterNode).all()
+    return db.execute(_LIST_NODES_STMT).mappings().all()
 
 
 @router.post("/nodes", dependencies=[Depends(get_api_key)])
@@ -266,16 +423,19 @@ def add_node(data: Dict[str, Any], db: Session = Depends(get_db)):
     admin_pass = data.get("admin_pass")
     if not all([name, base_url, admin_user, admin_pass]):
         raise HTTPException(status_code=400, detail="Missing fields")
-    existing = db.query(ClusterNode).filter(ClusterNode.name == name).first()
-    if existing:
+    node = db.scalars(
+        sqlite_insert(ClusterNode)
+        .values(
+            name=name, base_url=base_url, admin_user=admin_user, admin_pass=admin_pass
+        )
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(ClusterNode)
+    ).first()
+    if node is None:
+        db.rollback()
         raise HTTPException(status_code=400, detail="Node name exists")
-
-    node = ClusterNode(
-        name=name, base_url=base_url, admin_user=admin_user, admin_pass=admin_pass
-    )
-    db.add(node)
+    db.expunge(node)
     db.commit()
-    db.refresh(node)
     return node
 
 
@@ -355,17 +515,13 @@ async def upload_avatar(file: UploadFile = File(...), db: Session = Depends(get_
             detail=f"文件大小超过限制（最大 {max_mb:.0f}MB）",
         )
 
-    # 3. 确保上传目录存在
-    os.makedirs(AVATAR_UPLOAD_DIR, exist_ok=True)
-
-    # 4. 生成唯一文件名并保存
+    # 3. 生成唯一文件名并保存；磁盘写入放到线程中，不阻塞事件循环
     ext = _get_avatar_extension(file.content_type)
     filename = f"{uuid.uuid4().hex}{ext}"
     filepath = os.path.join(AVATAR_UPLOAD_DIR, filename)
-    with open(filepath, "wb") as f:
-        f.write(contents)
+    await asyncio.to_thread(_write_avatar_file, filepath, contents)
 
-    # 5. 更新用户 profile 中的 avatar 字段（存储相对路径 URL）
+    # 4. 更新用户 profile 中的 avatar 字段（存储相对路径 URL）
     avatar_url = f"/static/avatars/{filename}"
     profile = db.get(UserProfileModel, 1)
     if profile is None:
@@ -380,6 +536,13 @@ async def upload_avatar(file: UploadFile = File(...), db: Session = Depends(get_
     }
 
 
+def _write_avatar_file(filepath: str, contents: bytes) -> None:
+    """确保上传目录存在并写入头像文件。"""
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, "wb") as f:
+        f.write(contents)
+
+
 def _get_avatar_extension(content_type: str) -> str:
     """根据 MIME 类型返回对应的文件扩展名。"""
     mapping = {
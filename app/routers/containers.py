@@ -1,17 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
-from typing import Dict, Any, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from typing import Callable, Dict, Any, List, Optional, Union
 import docker
 import os
 import tarfile
 import io
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from stat import S_ISDIR, S_ISREG
 from pydantic import BaseModel
 from app.core.security import get_api_key
 from app.core.utils import (
+    conditional_json_response,
+    dump_json,
     get_docker_client,
+    json_response,
+    make_etag,
     get_current_container_id,
-    process_container_summary,
+    invalidate_containers_snapshot,
+    process_raw_container_summary,
     parse_docker_run_command,
 )
 from app.core.config import HOST_FILESYSTEM_ROOT
@@ -21,6 +29,83 @@ router = APIRouter(
 )
 
 
+# 并发 inspect 容器的线程池，大小不超过共享 Docker 客户端的连接池
+_inspect_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="docker-inspect")
+
+# 容器列表短期缓存：UI 连续刷新时直接返回已序列化的 JSON，不再访问 Docker socket
+_LIST_CACHE_TTL = 2
+# 过滤参数来自查询字符串，键的取值不受控：写入时清理过期项并限制条目数
+_LIST_CACHE_MAXSIZE = 64
+_list_cache: Dict[Any, tuple[float, bytes, str]] = {}
+# 同步路由运行在线程池中，缓存的读、写、清理都在锁内进行；构建结果时不持有锁
+_list_cache_lock = threading.Lock()
+
+
+def _cached_json_response(
+    request: Request, key: Any, build: Callable[[], Any]
+) -> Response:
+    """
+    命中未过期缓存时直接返回；否则调用 build 生成结果并缓存序列化后的 JSON。
+
+    ETag 随响应体一起缓存，客户端带 If-None-Match 轮询且数据未变时返回 304。
+    """
+    now = time.monotonic()
+    with _list_cache_lock:
+        cached = _list_cache.get(key)
+    if cached is not None and cached[0] > now:
+        _, body, etag = cached
+    else:
+        body = dump_json(build())
+        etag = make_etag(body)
+        _store_list_cache(key, now, body, etag)
+    return conditional_json_response(request, body, etag)
+
+
+def _store_list_cache(key: Any, now: float, body: bytes, etag: str) -> None:
+    """写入缓存前丢弃已过期的条目；仍超出容量时淘汰最早写入的条目。"""
+    with _list_cache_lock:
+        for stale in [k for k, v in _list_cache.items() if v[0] <= now]:
+            del _list_cache[stale]
+        _list_cache.pop(key, None)
+        while len(_list_cache) >= _LIST_CACHE_MAXSIZE:
+            _list_cache.pop(next(iter(_list_cache)))
+        _list_cache[key] = (now + _LIST_CACHE_TTL, body, etag)
+
+
+def _invalidate_list_cache():
+    """容器状态发生变化后清空列表缓存。"""
+    with _list_cache_lock:
+        _list_cache.clear()
+    invalidate_containers_snapshot()
+
+
+def _find_best_mount(
+    mounts: List[Dict[str, Any]], path_clean: str
+) -> Optional[Dict[str, Any]]:
+    """
+    查找覆盖 path_clean 的最长前缀挂载点。
+
+    以 Destination 建立索引后从目标路径逐级向上查找，复杂度为路径深度而非挂载数量。
+    path_clean 需为去掉末尾 "/" 的绝对路径。
+    """
+    by_dest: Dict[str, Dict[str, Any]] = {}
+    for mount in mounts:
+        dest = mount.get("Destination")
+        if dest:
+            by_dest.setdefault(dest.rstrip("/"), mount)
+
+    candidate = path_clean
+    while True:
+        mount = by_dest.get(candidate)
+        if mount is not None:
+            return mount
+        parent = candidate.rsplit("/", 1)[0]
+        # 查到 "" 或相对路径无法再向上时结束，不依赖调用方预先校验
+        if parent == candidate:
+            return None
+        candidate = parent
+
+
 class DockerRunRequest(BaseModel):
     command: str
 
@@ -30,36 +115,86 @@ class FileUpdateRequest(BaseModel):
     content: str
 
 
+def _build_list_filters(
+    name: Optional[str],
+    label: Optional[str],
+    status: Optional[str],
+    ancestor: Optional[str],
+) -> Dict[str, str]:
+    """组装下推给 Docker daemon 的过滤条件，忽略未传入的参数。"""
+    filters = {"name": name, "label": label, "status": status, "ancestor": ancestor}
+    return {k: v for k, v in filters.items() if v is not None}
+
+
+def _raw_container_info(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """仅用 /containers/json 已返回的字段组装列表项，无需 inspect。"""
+    container_id = raw["Id"]
+    names = raw.get("Names") or ()
+    return {
+        "id": container_id,
+        "short_id": container_id[:12],
+        "name": names[0].lstrip("/") if names else "",
+        "status": str(raw.get("State", "")).lower(),
+        # 创建容器时使用的镜像引用（名称:标签或镜像 ID），不再仿造 Image 对象的 repr
+        "image": raw.get("Image", ""),
+        "labels": raw.get("Labels") or {},
+        "ports": raw.get("Ports") or [],
+    }
+
+
 @router.get("", response_model=List[Dict[str, Any]])
-async def list_containers():
+def list_containers(
+    request: Request,
+    name: Optional[str] = None,
+    label: Optional[str] = None,
+    status: Optional[str] = None,
+    ancestor: Optional[str] = None,
+    full: bool = False,
+):
     """
     Get information about all Docker containers.
+
+    可选过滤参数（name、label、status、ancestor）直接交给 Docker daemon 处理，
+    其中 ancestor 需要 Docker API >= 1.23。
+    默认只返回列表接口自带的字段（id、name、status、image、labels、ports）；
+    full=true 时逐个 inspect 并附带完整 attrs。
     """
     client = get_docker_client()
+    filters = _build_list_filters(name, label, status, ancestor)
+
+    def inspect(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        container_id = raw["Id"]
+        try:
+            attrs = client.api.inspect_container(container_id)
+        except docker.errors.NotFound:
+            # 列表与 inspect 之间被删除的容器直接跳过
+            return None
+        info = _raw_container_info(raw)
+        info["name"] = attrs.get("Name", "").lstrip("/")
+        info["status"] = str(attrs.get("State", {}).get("Status")).lower()
+        info["attrs"] = attrs
+        return info
+
+    def build():
+        # 低层列表接口一次返回全部容器，不会像 containers.list 那样逐个 inspect；
+        # 需要完整 attrs 时 inspect 为 I/O 密集型请求，在线程池中并发执行
+        raws = client.api.containers(all=True, filters=filters)
+        if not full:
+            return [_raw_container_info(raw) for raw in raws]
+        return [info for info in _inspect_executor.map(inspect, raws) if info]
+
     try:
-        containers = client.containers.list(all=True)
-        result = []
-        for container in containers:
-            container_info = {
-                "id": container.id,
-                "short_id": container.short_id,
-                "name": container.name,
-                "status": str(container.status).lower(),
-                "image": str(container.image),
-                "attrs": container.attrs,
-            }
-            result.append(container_info)
-        return result
+        return _cached_json_response(
+            request, ("full" if full else "all", *sorted(filters.items())), build
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving containers: {str(e)}"
         )
-    finally:
-        client.close()
 
 
 @router.get("/{container_id}/download")
-async def download_container_file(container_id: str, path: str):
+def download_container_file(container_id: str, path: str):
     """
     Download a file from the container.
     If the file is mounted, it downloads directly from the host.
@@ -77,20 +212,7 @@ async def download_container_file(container_id: str, path: str):
 
         # Find the best matching mount (longest prefix)
         path_clean = path.rstrip("/")
-        best_match = None
-
-        for mount in mounts:
-            dest = mount.get("Destination")
-            if not dest:
-                continue
-
-            dest_clean = dest.rstrip("/")
-
-            if path_clean == dest_clean or path_clean.startswith(dest_clean + "/"):
-                if best_match is None or len(dest_clean) > len(
-                    best_match.get("Destination").rstrip("/")
-                ):
-                    best_match = mount
+        best_match = _find_best_mount(mounts, path_clean)
 
         if best_match:
             mount_source = best_match.get("Source")
@@ -111,13 +233,23 @@ async def download_container_file(container_id: str, path: str):
             if ".." in relative_path.split("/"):
                 raise HTTPException(status_code=403, detail="Path traversal detected")
 
-            if os.path.exists(final_path):
-                if os.path.isdir(final_path):
+            try:
+                file_stat = os.stat(final_path)
+            except OSError:
+                file_stat = None
+            if file_stat is not None:
+                if S_ISDIR(file_stat.st_mode):
                     raise HTTPException(
                         status_code=400,
                         detail="Cannot download directory directly. Please specify a file.",
                     )
-                return FileResponse(final_path, filename=os.path.basename(path))
+                # 传入已有的 stat 结果，FileResponse 不再重复 stat；
+                # ASGI 服务器支持 pathsend 扩展时由服务器直接发送文件
+                return FileResponse(
+                    final_path,
+                    filename=os.path.basename(path),
+                    stat_result=file_stat,
+                )
 
         # Fallback for non-mounted files: use get_archive
         try:
@@ -127,7 +259,9 @@ async def download_container_file(container_id: str, path: str):
                 stream,
                 media_type="application/x-tar",
                 headers={
-                    "Content-Disposition": f'attachment; filename="{os.path.basename(path)}.tar"'
+                    "Content-Disposition": f'attachment; filename="{os.path.basename(path)}.tar"',
+                    # 让 nginx 等反向代理直接转发，不缓冲整个归档
+                    "X-Accel-Buffering": "no",
                 },
             )
         except docker.errors.NotFound:
@@ -146,31 +280,41 @@ async def download_container_file(container_id: str, path: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
-    finally:
-        client.close()
 
 
 @router.get("/summary", response_model=List[Dict[str, Any]])
-async def list_containers_summary():
+def list_containers_summary(
+    request: Request,
+    name: Optional[str] = None,
+    label: Optional[str] = None,
+    status: Optional[str] = None,
+    ancestor: Optional[str] = None,
+):
     """
     Get summary information (id, name, status, stack, image, ports, is_self) of all Docker containers.
+
+    过滤参数与 GET /containers 相同。
     """
     client = get_docker_client()
     self_id = get_current_container_id()
+    filters = _build_list_filters(name, label, status, ancestor)
     try:
-        containers = client.containers.list(all=True)
-        result = [process_container_summary(c, self_id) for c in containers]
-        return result
+        return _cached_json_response(
+            request,
+            ("summary", *sorted(filters.items())),
+            lambda: [
+                process_raw_container_summary(raw, self_id)
+                for raw in client.api.containers(all=True, filters=filters)
+            ],
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving containers summary: {str(e)}"
         )
-    finally:
-        client.close()
 
 
 @router.post("/run", response_model=Dict[str, Any])
-async def run_container(request: DockerRunRequest):
+def run_container(request: DockerRunRequest):
     """
     Run a container using a docker run command string.
     Example: {"command": "docker run -d -p 8080:80 --name my-nginx nginx"}
@@ -221,6 +365,7 @@ async def run_container(request: DockerRunRequest):
             params["detach"] = True
 
         container = client.containers.run(**params)
+        _invalidate_list_cache()
 
         return {
             "status": "success",
@@ -245,12 +390,10 @@ async def run_container(request: DockerRunRequest):
         raise HTTPException(
             status_code=500, detail=f"Error running container: {str(e)}"
         )
-    finally:
-        client.close()
 
 
 @router.get("/{container_id}/logs")
-async def get_container_logs(container_id: str, tail: int = 2000):
+def get_container_logs(container_id: str, tail: int = 2000):
     """
     Get logs for a specific container.
     Defaults to last 2000 lines.
@@ -267,15 +410,51 @@ async def get_container_logs(container_id: str, tail: int = 2000):
         raise HTTPException(status_code=404, detail="Container not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving logs: {str(e)}")
-    finally:
-        client.close()
 
 
 import re
 from datetime import datetime
 
-
-async def list_files_via_exec(
+# 拆分 ls -la 输出各列
+_WS_RE = re.compile(r"\s+")
+
+
+# 在容器内一次 exec 完成类型判断与列目录/读文件，首行输出结果类型：
+# P=目录（其后为 find -printf 行），D=目录（find 不支持 -printf 时的 stat 行），
+# F=文件（其后为内容），B=文件超过大小限制，L=ls -la 输出
+# 路径作为位置参数 $1 传入，不拼接进脚本
+_EXEC_PROBE_SCRIPT = """
+P="$1"
+if [ -d "$P" ]; then
+  if OUT=$(find "${P%/}/" -mindepth 1 -maxdepth 1 ! -name '.*' -printf '%p|%s|%T@|%y\\n' 2>/dev/null); then
+    echo P
+    printf '%s\\n' "$OUT"
+    exit 0
+  fi
+  # BusyBox 的 find 不支持 -printf，退回逐项 stat
+  if stat -c %n "$P" >/dev/null 2>&1; then
+    echo D
+    for f in "${P%/}"/*; do stat -c '%n|%s|%Y|%F' "$f" 2>/dev/null; done
+    exit 0
+  fi
+  echo L
+  ls -la "$P"
+elif [ -f "$P" ]; then
+  S=$(stat -c %s "$P" 2>/dev/null)
+  if [ -n "$S" ] && [ "$S" -gt {max_size} ]; then
+    echo B
+    exit 0
+  fi
+  echo F
+  cat "$P"
+else
+  echo L
+  ls -la "$P"
+fi
+""".replace("{max_size}", str(1024 * 1024))
+
+
+def list_files_via_exec(
     container, path: str, mounts: List[Dict[str, Any]] = []
 ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
@@ -283,47 +462,23 @@ async def list_files_via_exec(
     If path is a file, returns its content.
     If path is a directory, returns list of files.
     """
-    # Check if path is a directory first
-    check_dir_cmd = f"test -d '{path}'"
-    exit_code, _ = container.exec_run(["/bin/sh", "-c", check_dir_cmd])
-    is_dir = exit_code == 0
-
-    # If it's not a directory, check if it's a file and read content
-    if not is_dir:
-        # Verify it exists as a file
-        check_file_cmd = f"test -f '{path}'"
-        exit_code, _ = container.exec_run(["/bin/sh", "-c", check_file_cmd])
-        if exit_code == 0:
-            # It's a file, read content
-            # Limit size to 1MB to prevent issues
-            size_cmd = f"stat -c %s '{path}'"
-            size_res = container.exec_run(["/bin/sh", "-c", size_cmd])
-            if size_res.exit_code == 0:
-                try:
-                    size = int(size_res.output.decode("utf-8").strip())
-                    if size > 1024 * 1024:
-                        raise HTTPException(
-                            status_code=400, detail="File too large to view (max 1MB)"
-                        )
-                except ValueError:
-                    pass  # Ignore if stat fails, proceed to try reading
-
-            cat_cmd = f"cat '{path}'"
-            exec_result = container.exec_run(["/bin/sh", "-c", cat_cmd])
-
-            if exec_result.exit_code != 0:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Error reading file: {exec_result.output.decode('utf-8')}",
-                )
+    exec_result = container.exec_run(["/bin/sh", "-c", _EXEC_PROBE_SCRIPT, "sh", path])
+    kind, _, body = exec_result.output.partition(b"\n")
+    kind = kind.strip()
 
-            try:
-                content = exec_result.output.decode("utf-8")
-                return {"content": content}
-            except UnicodeDecodeError:
-                raise HTTPException(status_code=400, detail="Binary file not supported")
+    if kind == b"B":
+        raise HTTPException(status_code=400, detail="File too large to view (max 1MB)")
 
-        # If neither dir nor file (or stat failed but ls might work?) - fall through to ls/stat logic below which handles error
+    if kind == b"F":
+        if exec_result.exit_code != 0:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error reading file: {body.decode('utf-8', errors='replace')}",
+            )
+        try:
+            return {"content": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Binary file not supported")
 
     # Prepare mount points for checking if an item is a mount root
     mount_destinations = set()
@@ -332,98 +487,80 @@ async def list_files_via_exec(
         if dest:
             mount_destinations.add(dest.rstrip("/"))
 
-    # 1. Try `stat` command (works on most Linux distros including Alpine)
-    # Format: name|size|mtime|type_desc
-    # %n: name
-    # %s: size
-    # %Y: mtime (seconds)
-    # %F: type (directory, regular file, etc)
-
-    # We target directory contents
-    target_pattern = f"'{path.rstrip('/')}'/*"
+    if kind == b"P":
+        return _parse_find_listing(body.decode("utf-8"), mount_destinations)
+    if kind == b"D":
+        return _parse_stat_listing(body.decode("utf-8"), mount_destinations)
 
-    # Using a shell loop to safely handle globbing and failures
-    # We use a custom delimiter `|` to split fields
-    stat_cmd = (
-        f"for f in {target_pattern}; do stat -c '%n|%s|%Y|%F' \"$f\" 2>/dev/null; done"
-    )
+    # ls -la 输出：stat 不可用，或路径既不是目录也不是普通文件
+    if exec_result.exit_code != 0 or kind != b"L":
+        raise HTTPException(
+            status_code=404,
+            detail=f"Path not found or not accessible inside container: {body.decode('utf-8', errors='replace')}",
+        )
+    return _parse_ls_listing(body.decode("utf-8"), path, mount_destinations)
 
-    exec_result = container.exec_run(["/bin/sh", "-c", stat_cmd])
 
+def _parse_find_listing(output: str, mount_destinations: set) -> List[Dict[str, Any]]:
+    """解析 `find -printf '%p|%s|%T@|%y'` 的输出，按名称排序以与 shell 通配结果一致。"""
     items = []
+    for line in output.strip().split("\n"):
+        parts = line.rsplit("|", 3)
+        if len(parts) < 4:
+            continue
+        full_path, size, mtime, file_type = parts
+        items.append(
+            {
+                "name": os.path.basename(full_path),
+                "type": "directory" if file_type == "d" else "file",
+                "size": int(size),
+                "modified": int(float(mtime)),
+                "is_symlink": file_type == "l",
+                "is_mounted": full_path.rstrip("/") in mount_destinations,
+            }
+        )
+    items.sort(key=lambda item: item["name"])
+    return items
 
-    if exec_result.exit_code == 0 and exec_result.output:
-        output_str = exec_result.output.decode("utf-8").strip()
-        if output_str:
-            lines = output_str.split("\n")
-            for line in lines:
-                parts = line.split("|")
-                if len(parts) >= 4:
-                    full_path = parts[0]
-                    size = int(parts[1])
-                    mtime = int(parts[2])
-                    type_str = parts[3].lower()
-
-                    name = os.path.basename(full_path)
-
-                    # Determine type
-                    item_type = "file"
-                    if "directory" in type_str:
-                        item_type = "directory"
-                    elif "link" in type_str:
-                        # For symlinks, stat usually follows them or describes the link
-                        # We might want to know if it's a link.
-                        # stat -c %F returns "symbolic link"
-                        pass
-
-                    is_symlink = "symbolic link" in type_str
-
-                    # Check if this item is a mount point
-                    # For exec mode, items are mounted only if they are mount points themselves
-                    # OR if we are somehow browsing inside a mount point that wasn't caught by the main logic (unlikely)
-                    item_clean_path = full_path.rstrip("/")
-                    is_mounted = item_clean_path in mount_destinations
-
-                    items.append(
-                        {
-                            "name": name,
-                            "type": "directory"
-                            if is_dir and name == ""
-                            else item_type,  # Handle root case? No, basename works.
-                            "size": size,
-                            "modified": mtime,
-                            "is_symlink": is_symlink,
-                            "is_mounted": is_mounted,
-                        }
-                    )
-            return items
-
-    # 2. Fallback to `ls -la` if stat failed or returned nothing (e.g. command not found)
-    # This is much harder to parse reliably, but we do our best.
-    # BusyBox ls -la:
-    # drwxr-xr-x    1 root     root          4096 Dec 19 12:35 .
-
-    ls_cmd = f"ls -la '{path}'"
-    exec_result = container.exec_run(["/bin/sh", "-c", ls_cmd])
 
-    if exec_result.exit_code != 0:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Path not found or not accessible inside container: {exec_result.output.decode('utf-8')}",
+def _parse_stat_listing(output: str, mount_destinations: set) -> List[Dict[str, Any]]:
+    """解析 `stat -c '%n|%s|%Y|%F'` 的逐行输出。"""
+    items = []
+    for line in output.strip().split("\n"):
+        parts = line.split("|")
+        if len(parts) < 4:
+            continue
+        full_path = parts[0]
+        type_str = parts[3].lower()
+
+        # For exec mode, items are mounted only if they are mount points themselves
+        items.append(
+            {
+                "name": os.path.basename(full_path),
+                "type": "directory" if "directory" in type_str else "file",
+                "size": int(parts[1]),
+                "modified": int(parts[2]),
+                "is_symlink": "symbolic link" in type_str,
+                "is_mounted": full_path.rstrip("/") in mount_destinations,
+            }
         )
+    return items
 
-    output_str = exec_result.output.decode("utf-8").strip()
-    lines = output_str.split("\n")
 
+def _parse_ls_listing(
+    output: str, path: str, mount_destinations: set
+) -> List[Dict[str, Any]]:
+    """解析 `ls -la` 输出；不同发行版格式不一，尽力而为。"""
+    items = []
     path_clean = path.rstrip("/")
 
-    for line in lines:
+    for line in output.strip().split("\n"):
         if line.startswith("total "):
             continue
 
         # Parse ls -l output
         # We assume standard fields: perms links owner group size date... name
-        parts = re.split(r"\s+", line.strip())
+        parts = _WS_RE.split(line.strip())
 
         if len(parts) < 8:  # Minimal check
             continue
@@ -475,20 +612,99 @@ async def list_files_via_exec(
     return items
 
 
-def create_file_tar(filename: str, content: str) -> bytes:
+# Go os.FileMode 中的目录与符号链接位
+_GO_MODE_DIR = 1 << 31
+_GO_MODE_SYMLINK = 1 << 27
+
+
+def _head_container_archive(container, path: str):
+    """
+    对 /containers/{id}/archive 发送 HEAD 请求，路径不存在时抛出 NotFound。
+
+    docker-py（按 7.2 编写）没有公开 HEAD archive 的方法，这里依赖 APIClient 的私有
+    方法 _url 与 _raise_for_status；升级 docker-py 时需确认二者仍然存在且行为不变。
+    """
+    api = container.client.api
+    res = api.head(
+        api._url("/containers/{0}/archive", container.id), params={"path": path}
+    )
+    api._raise_for_status(res)
+    return res
+
+
+def _exec_path_is_dir(container, path: str) -> bool:
+    """在容器内执行 test -d 判断目录，路径作为参数传入，不拼接进命令字符串。"""
+    exit_code, _ = container.exec_run(["/bin/sh", "-c", 'test -d "$1"', "sh", path])
+    return exit_code == 0
+
+
+def _container_path_is_dir(container, path: str) -> bool:
+    """
+    通过 HEAD /containers/{id}/archive 读取路径的 stat 头判断是否为目录。
+
+    只取响应头，不打包内容，也不需要在容器内 exec 启动 shell。
+    符号链接无法在此区分目标类型，按目录处理，交由后续 put_archive 校验。
+    HEAD 请求失败（daemon 报错或 docker-py 私有方法不可用）时回退到 exec 检查。
+    """
+    try:
+        res = _head_container_archive(container, path)
+    except docker.errors.NotFound:
+        return False
+    except (docker.errors.APIError, AttributeError):
+        return _exec_path_is_dir(container, path)
+    encoded_stat = res.headers.get("x-docker-container-path-stat")
+    if not encoded_stat:
+        return False
+    mode = docker.utils.decode_json_header(encoded_stat).get("mode", 0)
+    return bool(mode & (_GO_MODE_DIR | _GO_MODE_SYMLINK))
+
+
+_TAR_BLOCK = 512
+
+
+def _make_tar_single(name: str, data: bytes) -> bytes:
+    """直接拼出只含一个普通文件的 ustar 归档，省去 tarfile 与 BytesIO 的中间拷贝。
+
+    文件名超过 ustar 的 100 字节限制时交给 tarfile 生成扩展头。
+    """
+    name_b = name.encode("utf-8")
+    if len(name_b) > 100:
+        tar_stream = io.BytesIO()
+        with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+            tarinfo = tarfile.TarInfo(name=name)
+            tarinfo.size = len(data)
+            tarinfo.mtime = time.time()
+            tar.addfile(tarinfo, io.BytesIO(data))
+        return tar_stream.getvalue()
+
+    size = len(data)
+    header = bytearray(_TAR_BLOCK)
+    header[0 : len(name_b)] = name_b
+    header[100:108] = b"0000644\0"  # mode
+    header[108:116] = b"0000000\0"  # uid
+    header[116:124] = b"0000000\0"  # gid
+    header[124:136] = b"%011o\0" % size
+    header[136:148] = b"%011o\0" % int(time.time())
+    header[148:156] = b" " * 8  # 计算校验和时按空格处理
+    header[156:157] = b"0"  # 普通文件
+    header[257:263] = b"ustar\0"
+    header[263:265] = b"00"
+    header[148:156] = b"%06o\0 " % sum(header)
+
+    padding = -size % _TAR_BLOCK
+    archive = bytearray(_TAR_BLOCK + size + padding + 2 * _TAR_BLOCK)
+    archive[0:_TAR_BLOCK] = header
+    archive[_TAR_BLOCK : _TAR_BLOCK + size] = data
+    return bytes(archive)
+
+
+def create_file_tar(filename: str, content: bytes) -> bytes:
     """Create a tar archive containing a single file with content."""
-    file_data = content.encode("utf-8")
-    tar_stream = io.BytesIO()
-    with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-        tarinfo = tarfile.TarInfo(name=filename)
-        tarinfo.size = len(file_data)
-        tarinfo.mtime = time.time()
-        tar.addfile(tarinfo, io.BytesIO(file_data))
-    return tar_stream.getvalue()
+    return _make_tar_single(filename, content)
 
 
 @router.put("/{container_id}/files")
-async def update_container_file(container_id: str, request: FileUpdateRequest):
+def update_container_file(container_id: str, request: FileUpdateRequest):
     """
     Update the content of a file inside a container.
     Supports both mounted files (direct host write) and non-mounted files (via docker put_archive).
@@ -506,20 +722,7 @@ async def update_container_file(container_id: str, request: FileUpdateRequest):
 
         # 1. Try to resolve to host path first (Same logic as get_container_files)
         path_clean = path.rstrip("/")
-        best_match = None
-
-        for mount in mounts:
-            dest = mount.get("Destination")
-            if not dest:
-                continue
-
-            dest_clean = dest.rstrip("/")
-
-            if path_clean == dest_clean or path_clean.startswith(dest_clean + "/"):
-                if best_match is None or len(dest_clean) > len(
-                    best_match.get("Destination").rstrip("/")
-                ):
-                    best_match = mount
+        best_match = _find_best_mount(mounts, path_clean)
 
         # If mounted, write to host
         if best_match:
@@ -527,7 +730,6 @@ async def update_container_file(container_id: str, request: FileUpdateRequest):
             mount_dest = best_match.get("Destination")
 
             mount_dest_clean = mount_dest.rstrip("/")
-            path_clean = path.rstrip("/")
 
             if path_clean == mount_dest_clean:
                 relative_path = ""
@@ -566,10 +768,7 @@ async def update_container_file(container_id: str, request: FileUpdateRequest):
         # 2. Not mounted, use docker put_archive
         # Verify parent directory exists inside container
         parent_dir_container = os.path.dirname(path)
-        check_dir_cmd = f"test -d '{parent_dir_container}'"
-        exit_code, _ = container.exec_run(["/bin/sh", "-c", check_dir_cmd])
-
-        if exit_code != 0:
+        if not _container_path_is_dir(container, parent_dir_container):
             raise HTTPException(
                 status_code=404,
                 detail=f"Parent directory does not exist inside container: {parent_dir_container}",
@@ -577,7 +776,8 @@ async def update_container_file(container_id: str, request: FileUpdateRequest):
 
         # Create tarball
         filename = os.path.basename(path)
-        tar_data = create_file_tar(filename, request.content)
+        # 只在此处编码一次，tar 打包直接使用这份字节
+        tar_data = create_file_tar(filename, request.content.encode("utf-8"))
 
         # Upload
         try:
@@ -598,14 +798,12 @@ async def update_container_file(container_id: str, request: FileUpdateRequest):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating file: {str(e)}")
-    finally:
-        client.close()
 
 
 @router.get(
     "/{container_id}/files", response_model=Union[List[Dict[str, Any]], Dict[str, Any]]
 )
-async def get_container_files(container_id: str, path: str = ""):
+def get_container_files(container_id: str, path: str = ""):
     """
     Get list of files and directories in a container's mapped path.
     If path is a directory, returns a list of files.
@@ -625,24 +823,11 @@ async def get_container_files(container_id: str, path: str = ""):
 
         # Find the best matching mount (longest prefix)
         path_clean = path.rstrip("/")
-        best_match = None
-
-        for mount in mounts:
-            dest = mount.get("Destination")
-            if not dest:
-                continue
-
-            dest_clean = dest.rstrip("/")
-
-            if path_clean == dest_clean or path_clean.startswith(dest_clean + "/"):
-                if best_match is None or len(dest_clean) > len(
-                    best_match.get("Destination").rstrip("/")
-                ):
-                    best_match = mount
+        best_match = _find_best_mount(mounts, path_clean)
 
         if not best_match:
             # Fallback to exec_run for non-mounted paths
-            return await list_files_via_exec(container, path, mounts)
+            return list_files_via_exec(container, path, mounts)
 
         # Calculate host path
         # Mount Source: /volume2/docker/gogs
@@ -654,9 +839,8 @@ async def get_container_files(container_id: str, path: str = ""):
         mount_source = best_match.get("Source")
         mount_dest = best_match.get("Destination")
 
-        # Handle trailing slashes normalization
+        # Handle trailing slashes normalization（path_clean 已在查找挂载点前算好）
         mount_dest_clean = mount_dest.rstrip("/")
-        path_clean = path.rstrip("/")
 
         if path_clean == mount_dest_clean:
             relative_path = ""
@@ -681,17 +865,19 @@ async def get_container_files(container_id: str, path: str = ""):
         if ".." in relative_path.split("/"):
             raise HTTPException(status_code=403, detail="Path traversal detected")
 
-        if not os.path.exists(final_path):
+        # 只 stat 一次，代替 exists / isfile / getsize / isdir 各自的系统调用
+        try:
+            path_stat = os.stat(final_path)
+        except OSError:
             raise HTTPException(
                 status_code=404, detail=f"Path not found on host: {host_abs_path}"
             )
 
         # Check if it is a file and read content
-        if os.path.isfile(final_path):
+        if S_ISREG(path_stat.st_mode):
             # Limit size to 1MB
             try:
-                size = os.path.getsize(final_path)
-                if size > 1024 * 1024:
+                if path_stat.st_size > 1024 * 1024:
                     raise HTTPException(
                         status_code=400, detail="File too large to view (max 1MB)"
                     )
@@ -706,20 +892,24 @@ async def get_container_files(container_id: str, path: str = ""):
                     status_code=500, detail=f"Error reading file: {str(e)}"
                 )
 
-        if not os.path.isdir(final_path):
+        if not S_ISDIR(path_stat.st_mode):
             raise HTTPException(status_code=400, detail="Path is not a directory")
 
         items = []
         with os.scandir(final_path) as it:
             for entry in it:
                 try:
-                    stat = entry.stat()
+                    # is_symlink 读取 readdir 的 d_type，无额外系统调用；
+                    # 每个条目只 stat 一次（跟随符号链接），类型直接取自 st_mode
+                    entry_stat = entry.stat()
                     items.append(
                         {
                             "name": entry.name,
-                            "type": "directory" if entry.is_dir() else "file",
-                            "size": stat.st_size,
-                            "modified": stat.st_mtime,
+                            "type": "directory"
+                            if S_ISDIR(entry_stat.st_mode)
+                            else "file",
+                            "size": entry_stat.st_size,
+                            "modified": entry_stat.st_mtime,
                             "is_symlink": entry.is_symlink(),
                             "is_mounted": True,
                         }
@@ -735,181 +925,98 @@ async def get_container_files(container_id: str, path: str = ""):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing files: {str(e)}")
-    finally:
-        client.close()
 
 
 @router.get("/{container_id}", response_model=Dict[str, Any])
-async def get_container_details(container_id: str):
+def get_container_details(container_id: str):
     """
     Get detailed information about a specific container.
     """
     client = get_docker_client()
     try:
-        container = client.containers.get(container_id)
-        return container.attrs
+        # 原样输出 inspect 结果，跳过 FastAPI 对任意字典的逐层编码
+        return json_response(client.api.inspect_container(container_id))
     except docker.errors.NotFound:
         raise HTTPException(status_code=404, detail="Container not found")
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving container details: {str(e)}"
         )
-    finally:
-        client.close()
-
-
-@router.post("/{container_id}/restart")
-async def restart_container(container_id: str):
-    """
-    Restart a specific Docker container by its ID or Name.
-    """
-    client = get_docker_client()
-    try:
-        container = client.containers.get(container_id)
-        container.restart()
-        return {
-            "status": "success",
-            "message": f"Container {container.name} ({container.id[:12]}) restarted successfully",
-        }
-    except docker.errors.NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error restarting container: {str(e)}"
-        )
-    finally:
-        client.close()
-
-
-@router.post("/{container_id}/start")
-async def start_container(container_id: str):
-    """
-    Start a specific Docker container by its ID or Name.
-    """
-    client = get_docker_client()
-    try:
-        container = client.containers.get(container_id)
-        container.start()
-        return {
-            "status": "success",
-            "message": f"Container {container.name} ({container.id[:12]}) started successfully",
-        }
-    except docker.errors.NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error starting container: {str(e)}"
-        )
-    finally:
-        client.close()
-
-
-@router.post("/{container_id}/stop")
-async def stop_container(container_id: str):
-    """
-    Stop a specific Docker container by its ID or Name.
-    """
-    client = get_docker_client()
-    try:
-        container = client.containers.get(container_id)
-        container.stop()
-        return {
-            "status": "success",
-            "message": f"Container {container.name} ({container.id[:12]}) stopped successfully",
-        }
-    except docker.errors.NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error stopping container: {str(e)}"
-        )
-    finally:
-        client.close()
-
 
-@router.post("/{container_id}/kill")
-async def kill_container(container_id: str):
-    """
-    Force stop (kill) a specific Docker container by its ID or Name.
-    """
-    client = get_docker_client()
-    try:
-        container = client.containers.get(container_id)
-        container.kill()
-        return {
-            "status": "success",
-            "message": f"Container {container.name} ({container.id[:12]}) killed successfully",
-        }
-    except docker.errors.NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error killing container: {str(e)}"
-        )
-    finally:
-        client.close()
 
+# 容器生命周期操作：路径 / 方法名 -> (文档说明, 成功消息中的过去式, 错误消息中的进行时)
+_CONTAINER_ACTIONS = {
+    "restart": (
+        "Restart a specific Docker container by its ID or Name.",
+        "restarted",
+        "restarting",
+    ),
+    "start": (
+        "Start a specific Docker container by its ID or Name.",
+        "started",
+        "starting",
+    ),
+    "stop": (
+        "Stop a specific Docker container by its ID or Name.",
+        "stopped",
+        "stopping",
+    ),
+    "kill": (
+        "Force stop (kill) a specific Docker container by its ID or Name.",
+        "killed",
+        "killing",
+    ),
+    "pause": (
+        "Pause a specific Docker container by its ID or Name.",
+        "paused",
+        "pausing",
+    ),
+    "unpause": (
+        "Unpause (resume) a specific Docker container by its ID or Name.",
+        "unpaused",
+        "unpausing",
+    ),
+}
+
+
+def _make_action_handler(action: str, doc: str, done: str, doing: str):
+    """生成调用 container.<action>() 的路由函数，异常映射与缓存失效集中在此处。"""
+
+    def handler(container_id: str):
+        client = get_docker_client()
+        try:
+            container = client.containers.get(container_id)
+            getattr(container, action)()
+            _invalidate_list_cache()
+            return {
+                "status": "success",
+                "message": f"Container {container.name} ({container.id[:12]}) {done} successfully",
+            }
+        except docker.errors.NotFound:
+            raise HTTPException(
+                status_code=404, detail=f"Container {container_id} not found"
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Error {doing} container: {str(e)}"
+            )
 
-@router.post("/{container_id}/pause")
-async def pause_container(container_id: str):
-    """
-    Pause a specific Docker container by its ID or Name.
-    """
-    client = get_docker_client()
-    try:
-        container = client.containers.get(container_id)
-        container.pause()
-        return {
-            "status": "success",
-            "message": f"Container {container.name} ({container.id[:12]}) paused successfully",
-        }
-    except docker.errors.NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error pausing container: {str(e)}"
-        )
-    finally:
-        client.close()
+    # 保持原有的函数名与文档，OpenAPI 的 operationId 与说明不变
+    handler.__name__ = handler.__qualname__ = f"{action}_container"
+    handler.__doc__ = doc
+    return handler
 
 
-@router.post("/{container_id}/unpause")
-async def unpause_container(container_id: str):
-    """
-    Unpause (resume) a specific Docker container by its ID or Name.
-    """
-    client = get_docker_client()
-    try:
-        container = client.containers.get(container_id)
-        container.unpause()
-        return {
-            "status": "success",
-            "message": f"Container {container.name} ({container.id[:12]}) unpaused successfully",
-        }
-    except docker.errors.NotFound:
-        raise HTTPException(
-            status_code=404, detail=f"Container {container_id} not found"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error unpausing container: {str(e)}"
-        )
-    finally:
-        client.close()
+for _action, (_doc, _done, _doing) in _CONTAINER_ACTIONS.items():
+    router.add_api_route(
+        f"/{{container_id}}/{_action}",
+        _make_action_handler(_action, _doc, _done, _doing),
+        methods=["POST"],
+    )
 
 
 @router.delete("/{container_id}")
-async def delete_container(container_id: str, force: bool = True, v: bool = False):
+def delete_container(container_id: str, force: bool = True, v: bool = False):
     """
     Remove a specific Docker container by its ID or Name.
     Query parameters:
@@ -920,6 +1027,7 @@ async def delete_container(container_id: str, force: bool = True, v: bool = Fals
     try:
         container = client.containers.get(container_id)
         container.remove(force=force, v=v)
+        _invalidate_list_cache()
         return {
             "status": "success",
             "message": f"Container {container.name} ({container.id[:12]}) removed successfully",
@@ -932,5 +1040,3 @@ async def delete_container(container_id: str, force: bool = True, v: bool = Fals
         raise HTTPException(
             status_code=500, detail=f"Error removing container: {str(e)}"
         )
-    finally:
-        client.close()
@@ -1,8 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any
 import docker
+import threading
+import time
+from datetime import datetime, timezone
 from app.core.security import get_api_key
-from app.core.utils import get_docker_client
+from app.core.utils import (
+    conditional_json_response,
+    dump_json,
+    get_docker_client,
+    json_response,
+)
 
 router = APIRouter(
     prefix="/images",
@@ -10,62 +19,130 @@ router = APIRouter(
     dependencies=[Depends(get_api_key)]
 )
 
+# 正在被容器使用的镜像 ID 短期缓存，仪表盘连续刷新时合并为一次容器列表请求
+_USED_IDS_TTL = 2
+_used_ids_cache: tuple[float, frozenset] | None = None
+_used_ids_lock = threading.Lock()
+
+
+def _get_used_image_ids(client) -> frozenset:
+    """返回所有容器引用的镜像 ID，缓存 _USED_IDS_TTL 秒；未命中时只有一个线程查询。"""
+    global _used_ids_cache
+    cached = _used_ids_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    with _used_ids_lock:
+        cached = _used_ids_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        # /containers/json 的摘要中已包含 ImageID，无需逐个 inspect
+        used = frozenset(c.get("ImageID") for c in client.api.containers(all=True))
+        _used_ids_cache = (time.monotonic() + _USED_IDS_TTL, used)
+        return used
+
+
+def _short_image_id(image_id: str) -> str:
+    """与 docker-py Image.short_id 相同：保留 sha256: 前缀及其后 12 位。"""
+    if image_id.startswith("sha256:"):
+        return image_id[:19]
+    return image_id[:12]
+
+
+def _clean_tags(repo_tags) -> List[str]:
+    """与 docker-py Image.tags 相同：去掉 <none>:<none> 占位标签。"""
+    return [t for t in repo_tags or () if t != "<none>:<none>"]
+
+
+def _format_created(created: Any) -> Any:
+    """
+    镜像摘要中的 Created 为精确到秒的 Unix 时间戳，转换为 UTC 的 RFC 3339 字符串。
+
+    inspect 返回的 Created 带有纳秒小数部分，摘要中已经没有这部分信息，
+    因此这里的格式为 "YYYY-MM-DDTHH:MM:SSZ"，不含小数秒。
+    """
+    if isinstance(created, (int, float)):
+        return datetime.fromtimestamp(created, timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+    return created
+
+
 @router.get("", response_model=List[Dict[str, Any]])
-async def list_images():
+def list_images(request: Request):
     """
     Get a list of all Docker images.
     """
     client = get_docker_client()
     try:
-        images = client.images.list()
-        containers = client.containers.list(all=True)
-        used_image_ids = {c.attrs['Image'] for c in containers}
-
-        result = []
-        for img in images:
-            result.append({
-                "id": img.id,
-                "tags": img.tags,
-                "created": img.attrs.get("Created"),
-                "size": img.attrs.get("Size"),
-                "labels": img.labels,
-                "short_id": img.short_id,
-                "in_use": img.id in used_image_ids
-            })
-        return result
+        # 低层接口一次返回全部镜像摘要；images.list() 会对每个镜像再 inspect 一次
+        images = client.api.images()
+        used_image_ids = _get_used_image_ids(client)
+
+        result = [
+            {
+                "id": img["Id"],
+                "tags": _clean_tags(img.get("RepoTags")),
+                "created": _format_created(img.get("Created")),
+                "size": img.get("Size"),
+                "labels": img.get("Labels") or {},
+                "short_id": _short_image_id(img["Id"]),
+                "in_use": img["Id"] in used_image_ids,
+            }
+            for img in images
+        ]
+        # 仪表盘定时轮询，数据未变化时返回 304
+        return conditional_json_response(request, dump_json(result))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving images: {str(e)}")
-    finally:
-        client.close()
 
 @router.get("/{image_id}", response_model=Dict[str, Any])
-async def get_image_details(image_id: str):
+def get_image_details(image_id: str):
     client = get_docker_client()
     try:
-        image = client.images.get(image_id)
-        
+        # 低层 inspect 每次返回新字典，直接原地补充字段，不经 Image 模型也不复制
+        data = client.api.inspect_image(image_id)
+
         # Check if image is in use
-        containers = client.containers.list(all=True)
-        used_image_ids = {c.attrs['Image'] for c in containers}
-        
-        data = dict(image.attrs or {})
-        data["id"] = image.id
-        data["short_id"] = image.short_id
-        data["tags"] = image.tags
-        data["in_use"] = image.id in used_image_ids
-        return data
+        used_image_ids = _get_used_image_ids(client)
+
+        data["id"] = data["Id"]
+        data["short_id"] = _short_image_id(data["Id"])
+        data["tags"] = _clean_tags(data.get("RepoTags"))
+        data["in_use"] = data["Id"] in used_image_ids
+        return json_response(data)
     except docker.errors.NotFound:
         raise HTTPException(status_code=404, detail="Image not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving image details: {str(e)}")
-    finally:
-        client.close()
+
+def _pull_progress(client, image_name: str, tag: str | None):
+    """逐行产出拉取进度（NDJSON），结束时追加一行 complete 或 error。"""
+    try:
+        for chunk in client.api.pull(image_name, tag=tag, stream=True, decode=True):
+            if "error" in chunk:
+                yield dump_json({"status": "error", "error": chunk["error"]}) + b"\n"
+                return
+            yield dump_json(chunk) + b"\n"
+        # 与 images.pull 相同：未指定标签时默认 latest，摘要引用使用 @ 连接
+        repository, parsed_tag = docker.utils.parse_repository_tag(image_name)
+        tag = tag or parsed_tag or "latest"
+        sep = "@" if tag.startswith("sha256:") else ":"
+        image = client.images.get(f"{repository}{sep}{tag}")
+        yield dump_json(
+            {"status": "complete", "id": image.id, "tags": image.tags}
+        ) + b"\n"
+    except Exception as e:
+        yield dump_json({"status": "error", "error": str(e)}) + b"\n"
+
 
 @router.post("/pull")
-async def pull_image(data: Dict[str, str]):
+def pull_image(data: Dict[str, str], stream: bool = False):
     """
     Pull a Docker image.
     Body: {"image": "image_name", "tag": "latest"}
+
+    stream=true 时以 NDJSON 流式返回 Docker 的拉取进度，最后一行为
+    {"status": "complete", ...} 或 {"status": "error", ...}。
     """
     image_name = data.get("image")
     tag = data.get("tag")
@@ -73,6 +150,13 @@ async def pull_image(data: Dict[str, str]):
         raise HTTPException(status_code=400, detail="Image name is required")
     
     client = get_docker_client()
+    if stream:
+        # 同步生成器由 Starlette 在线程池中迭代，拉取期间不占用事件循环
+        return StreamingResponse(
+            _pull_progress(client, image_name, tag),
+            media_type="application/x-ndjson",
+            headers={"X-Accel-Buffering": "no"},
+        )
     try:
         # Pull image
         image = client.images.pull(image_name, tag=tag)
@@ -86,11 +170,9 @@ async def pull_image(data: Dict[str, str]):
         raise HTTPException(status_code=500, detail=f"Docker API Error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error pulling image: {str(e)}")
-    finally:
-        client.close()
 
 @router.delete("/{image_id:path}")
-async def remove_image(image_id: str, force: bool = False):
+def remove_image(image_id: str, force: bool = False):
     """
     Remove a Docker image.
     path param 'image_id' can be a short ID, long ID, or image name (tag).
@@ -111,5 +193,3 @@ async def remove_image(image_id: str, force: bool = False):
         raise HTTPException(status_code=500, detail=f"Failed to remove image: {error_msg}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error removing image: {str(e)}")
-    finally:
-        client.close()
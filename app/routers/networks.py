@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List, Dict, Any
 import docker
 from app.core.security import get_api_key
-from app.core.utils import get_docker_client
+from app.core.utils import (
+    conditional_json_response,
+    dump_json,
+    get_docker_client,
+    json_response,
+)
 
 router = APIRouter(
     prefix="/networks", tags=["networks"], dependencies=[Depends(get_api_key)]
@@ -10,50 +15,46 @@ router = APIRouter(
 
 
 @router.get("", response_model=List[Dict[str, Any]])
-async def list_networks():
+def list_networks(request: Request):
     """
     Get a list of all Docker networks.
     """
     client = get_docker_client()
     try:
-        networks = client.networks.list()
-        result = []
-        for net in networks:
-            result.append(
-                {
-                    "id": net.id,
-                    "name": net.name,
-                    "driver": net.attrs.get("Driver"),
-                    "scope": net.attrs.get("Scope"),
-                    "ipam": net.attrs.get("IPAM"),
-                    "containers": net.attrs.get("Containers"),
-                    "short_id": net.short_id,
-                    "created": net.attrs.get("Created"),
-                }
-            )
-        return result
+        # 直接使用 /networks 返回的字典，不构造 Network 模型
+        networks = client.api.networks()
+        result = [
+            {
+                "id": net.get("Id", ""),
+                "name": net.get("Name"),
+                "driver": net.get("Driver"),
+                "scope": net.get("Scope"),
+                "ipam": net.get("IPAM"),
+                "containers": net.get("Containers"),
+                "short_id": net.get("Id", "")[:12],
+                "created": net.get("Created"),
+            }
+            for net in networks
+        ]
+        # 仪表盘定时轮询，数据未变化时返回 304
+        return conditional_json_response(request, dump_json(result))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving networks: {str(e)}"
         )
-    finally:
-        client.close()
 
 
 @router.get("/{network_id}", response_model=Dict[str, Any])
-async def get_network_details(network_id: str):
+def get_network_details(network_id: str):
     """
     Get detailed information about a specific Docker network.
     """
     client = get_docker_client()
     try:
-        network = client.networks.get(network_id)
-        return network.attrs
+        return json_response(client.api.inspect_network(network_id))
     except docker.errors.NotFound:
         raise HTTPException(status_code=404, detail="Network not found")
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving network details: {str(e)}"
         )
-    finally:
-        client.close()
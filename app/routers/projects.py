@@ -40,10 +40,10 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.core.config import PROJECTS_DIR
-from app.core.security import get_api_key
+from app.core.security import authorize_websocket, get_api_key
 from app.core.utils import get_docker_client
 from app.db.database import SessionLocal, get_db
-from app.db.models import APIKeyModel, ProjectModel
+from app.db.models import ProjectModel
 
 # ---------------------------------------------------------------------------
 # Pydantic schemas
@@ -335,7 +335,6 @@ def _run_build_sync(project_id: str, event_loop: asyncio.AbstractEventLoop):
             project.updated_at = datetime.now(timezone.utc)
             db.commit()
     finally:
-        client.close()
         db.close()
         _build_tasks.pop(project_id, None)
 
@@ -368,21 +367,13 @@ async def websocket_build_logs(
     await websocket.accept()
 
     # ---- 校验 API Key ----
-    db = SessionLocal()
-    try:
-        if not api_key:
-            await websocket.close(
-                code=status.WS_1008_POLICY_VIOLATION, reason="missing api_key"
-            )
-            return
-        key_record = db.query(APIKeyModel).filter(APIKeyModel.key == api_key).first()
-        if not key_record:
-            await websocket.close(
-                code=status.WS_1008_POLICY_VIOLATION, reason="invalid api_key"
-            )
-            return
-    finally:
-        db.close()
+    if not api_key:
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION, reason="missing api_key"
+        )
+        return
+    if not await authorize_websocket(websocket, api_key, reason="invalid api_key"):
+        return
 
     # ---- 检查项目是否存在 ----
     db = SessionLocal()
@@ -711,10 +702,10 @@ def project_up(project_id: str, db: Session = Depends(get_db)):
         client = get_docker_client()
         containers = client.containers.list(
             all=True,
+            ignore_removed=True,
             filters={"label": f"com.docker.compose.project={compose_name}"},
         )
         container_ids = [c.id for c in containers]
-        client.close()
     except Exception:
         pass
 
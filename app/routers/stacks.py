@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List, Dict, Any
+import asyncio
 from app.core.security import get_api_key
-from app.core.utils import get_docker_client, process_container_summary, get_current_container_id
+from app.core.utils import get_docker_client, process_raw_container_summary, get_current_container_id
 
 router = APIRouter(
     prefix="/stacks",
@@ -9,33 +10,39 @@ router = APIRouter(
     dependencies=[Depends(get_api_key)]
 )
 
+_COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+_STACK_NAMESPACE_LABEL = "com.docker.stack.namespace"
+
+
 @router.get("/{stack_name}/containers", response_model=List[Dict[str, Any]])
 async def get_stack_containers(stack_name: str):
     """
     Get all containers belonging to a specific stack (Docker Compose project).
+
+    同时匹配 compose 项目标签与 Swarm 堆栈标签（com.docker.stack.namespace）。
     """
     client = get_docker_client()
     self_id = get_current_container_id()
     try:
-        # Filter by label: com.docker.compose.project
-        # Also support Swarm stacks: com.docker.stack.namespace
-        
-        # Since client.containers.list filters logic is AND, we can't do OR easily in one query if we want to support both.
-        # But standard docker-compose uses com.docker.compose.project.
-        # Let's stick to com.docker.compose.project for now as per utils.py logic.
-        
-        filters = {"label": f"com.docker.compose.project={stack_name}"}
-        containers = client.containers.list(all=True, filters=filters)
-        
-        # If no containers found, maybe check for swarm stack label?
-        if not containers:
-             filters_swarm = {"label": f"com.docker.stack.namespace={stack_name}"}
-             containers_swarm = client.containers.list(all=True, filters=filters_swarm)
-             containers.extend(containers_swarm)
+        # Docker 的标签过滤在不同键之间是 AND 语义，两个标签分别查询；
+        # 两次请求并发执行后按 Id 合并去重
+        def list_by_label(label: str) -> List[Dict[str, Any]]:
+            return client.api.containers(
+                all=True, filters={"label": f"{label}={stack_name}"}
+            )
+
+        compose, swarm = await asyncio.gather(
+            asyncio.to_thread(list_by_label, _COMPOSE_PROJECT_LABEL),
+            asyncio.to_thread(list_by_label, _STACK_NAMESPACE_LABEL),
+        )
 
-        result = [process_container_summary(c, self_id) for c in containers]
+        seen = set()
+        result = []
+        for raw in compose + swarm:
+            if raw["Id"] in seen:
+                continue
+            seen.add(raw["Id"])
+            result.append(process_raw_container_summary(raw, self_id))
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving stack containers: {str(e)}")
-    finally:
-        client.close()
@@ -1,20 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List, Dict, Any
 import os
-import git
-import docker
-from datetime import datetime
+import re
+from app.core.config import HOST_MONITOR_ROOT, HOST_PROC_NET_DIR
+from app.core.git_info import (
+    REPO_DIR,
+    build_git_version,
+    read_git_version,
+    resolve_git_dir,
+)
 from app.core.security import get_api_key
-from app.core.utils import get_docker_client, get_current_container_id
+from app.core.utils import (
+    SingleFlight,
+    conditional_json_response,
+    dump_json,
+    get_containers_snapshot,
+    get_current_container_id,
+    get_docker_client,
+    get_self_container_attrs,
+    load_gputil,
+    json_response,
+)
 import psutil
 import asyncio
 import socket
+import time
+from collections import Counter
 
-# Try importing GPUtil
-try:
-    import GPUtil
-except ImportError:
-    GPUtil = None
+_COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
 
 router = APIRouter(tags=["system"], dependencies=[Depends(get_api_key)])
 
@@ -109,59 +122,61 @@ BROWSER_BLOCKED_PORTS = frozenset(
 )
 
 
+def _get_docker_stats() -> Dict[str, Any]:
+    """统计容器与镜像数量；只需计数，直接使用列表摘要，无需逐个 inspect。"""
+    client = get_docker_client()
+    containers = get_containers_snapshot(client)
+    images = client.api.images()
+
+    total_containers = len(containers)
+    running_containers = sum(1 for c in containers if c.get("State") == "running")
+    return {
+        "containers": {
+            "total": total_containers,
+            "running": running_containers,
+            "stopped": total_containers - running_containers,
+        },
+        "images": len(images),
+    }
+
+
+def _section_result(result: Any) -> Any:
+    """把并发子任务中的异常转换为 {"error": ...}，其余部分照常返回。"""
+    if isinstance(result, HTTPException):
+        return {"error": result.detail}
+    if isinstance(result, Exception):
+        return {"error": str(result)}
+    return result
+
+
+# 同时到达的 /info 请求共用一次采集
+_info_flight = SingleFlight()
+
+
 @router.get("/info")
 async def get_system_info():
     """
     Get aggregated system information including Docker stats, Git version, and System resources.
-    """
-    try:
-        # 1. Docker Stats
-        docker_stats = {}
-        try:
-            client = get_docker_client()
-            try:
-                containers = client.containers.list(all=True)
-                images = client.images.list()
-
-                total_containers = len(containers)
-                running_containers = sum(1 for c in containers if c.status == "running")
-                stopped_containers = total_containers - running_containers
-                image_count = len(images)
-
-                docker_stats = {
-                    "containers": {
-                        "total": total_containers,
-                        "running": running_containers,
-                        "stopped": stopped_containers,
-                    },
-                    "images": image_count,
-                }
-            finally:
-                client.close()
-        except Exception as e:
-            docker_stats = {"error": str(e)}
 
-        # 2. Git Version (Reuse existing logic by calling the function directly)
-        # Note: Since get_git_version is an async endpoint function, we can await it.
-        # However, it might return HTTPException which we should catch if we want partial results.
-        git_info = {}
-        try:
-            git_info = await get_git_version()
-        except HTTPException as e:
-            git_info = {"error": e.detail}
-        except Exception as e:
-            git_info = {"error": str(e)}
+    三部分互不依赖，并发获取，总耗时取最慢的一项；并发请求合并为一次采集。
+    """
+    return await _info_flight.do("info", _collect_system_info)
 
-        # 3. System Usage (Reuse existing logic)
-        usage_info = {}
-        try:
-            usage_info = await get_system_usage()
-        except HTTPException as e:
-            usage_info = {"error": e.detail}
-        except Exception as e:
-            usage_info = {"error": str(e)}
 
-        return {"docker": docker_stats, "git": git_info, "system": usage_info}
+async def _collect_system_info() -> Dict[str, Any]:
+    try:
+        # Docker SDK 为同步阻塞调用，放到线程中执行，避免阻塞事件循环
+        docker_stats, git_info, usage_info = await asyncio.gather(
+            asyncio.to_thread(_get_docker_stats),
+            get_git_version(),
+            collect_system_usage(),
+            return_exceptions=True,
+        )
+        return {
+            "docker": _section_result(docker_stats),
+            "git": _section_result(git_info),
+            "system": _section_result(usage_info),
+        }
 
     except Exception as e:
         raise HTTPException(
@@ -170,7 +185,7 @@ async def get_system_info():
 
 
 @router.get("/self", response_model=Dict[str, Any])
-async def get_self_container_info():
+def get_self_container_info():
     """
     Get information about the container running this API server.
     """
@@ -182,143 +197,254 @@ async def get_self_container_info():
                 status_code=404, detail="Could not determine self container ID"
             )
 
-        try:
-            container = client.containers.get(self_id)
-            return container.attrs
-        except docker.errors.NotFound:
-            # Try finding by prefix if self_id is short ID
-            if len(self_id) < 64:
-                # List all and check prefix
-                containers = client.containers.list(all=True)
-                for c in containers:
-                    if c.id.startswith(self_id):
-                        return c.attrs
-
+        attrs = get_self_container_attrs(client)
+        if attrs is None:
             raise HTTPException(
                 status_code=404, detail=f"Self container not found (ID: {self_id})"
             )
+        return json_response(attrs)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving self container info: {str(e)}"
         )
-    finally:
-        client.close()
 
 
 @router.get("/stacks", response_model=List[Dict[str, Any]])
-async def list_stacks():
+def list_stacks(request: Request):
     """
     Get a list of all Docker Stacks (Compose projects) with container counts.
     """
     client = get_docker_client()
     try:
-        containers = client.containers.list(all=True)
-        stacks = {}
-        for container in containers:
-            labels = container.labels or {}
-            stack_name = labels.get("com.docker.compose.project")
-            if stack_name:
-                stacks[stack_name] = stacks.get(stack_name, 0) + 1
-        return [{"name": k, "container_count": v} for k, v in sorted(stacks.items())]
+        # 只让 Docker 返回带 compose 项目标签的容器摘要，无需逐个 inspect
+        summaries = client.api.containers(
+            all=True, filters={"label": _COMPOSE_PROJECT_LABEL}
+        )
+        stacks = Counter(
+            name
+            for summary in summaries
+            if (name := (summary.get("Labels") or {}).get(_COMPOSE_PROJECT_LABEL))
+        )
+        result = [{"name": k, "container_count": v} for k, v in sorted(stacks.items())]
+        # 仪表盘定时轮询，数据未变化时返回 304
+        return conditional_json_response(request, dump_json(result))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving stacks: {str(e)}"
         )
-    finally:
-        client.close()
+
+
+# 进程内缓存的 git 版本信息：(缓存键, 结果)，缓存键由 HEAD 与引用文件的 mtime 组成
+_git_version_cache: tuple[tuple, Dict[str, Any]] | None = None
+_git_version_lock = asyncio.Lock()
+
+
+def _mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _git_cache_key() -> tuple:
+    """
+    只用几次 stat 与读取 HEAD 生成缓存键；提交、切换分支或 gc 打包引用后键随之变化。
+    """
+    repo_dir = REPO_DIR
+    try:
+        git_dir = resolve_git_dir(repo_dir)
+        if git_dir is None:
+            return (repo_dir, None)
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError:
+        return (repo_dir, None)
+    ref_mtime = None
+    if head.startswith("ref:"):
+        ref_mtime = _mtime_ns(os.path.join(git_dir, head[len("ref:") :].strip()))
+    return (
+        git_dir,
+        head,
+        _mtime_ns(os.path.join(git_dir, "HEAD")),
+        ref_mtime,
+        _mtime_ns(os.path.join(git_dir, "packed-refs")),
+    )
 
 
 @router.get("/git/version")
 async def get_git_version():
     """
     Get the current git version (commit hash, branch, message).
-    """
-    repo_dir = os.getcwd()
-    try:
-        # Prevent git from looking up parent directories which might be the host repo
-        # We want to know about the code inside the container/app
-        repo = git.Repo(repo_dir, search_parent_directories=False)
 
+    镜像构建时传入了 GIT_COMMIT 则直接返回该版本；否则结果按 HEAD 与引用文件的
+    mtime 缓存，仓库变化后自动重新读取，也可通过 POST /git/version/refresh 强制清除。
+    """
+    global _git_version_cache
+    # 镜像构建时已写入版本，无需访问文件系统
+    build_info = build_git_version()
+    if build_info is not None:
+        return build_info
+
+    key = _git_cache_key()
+    cached = _git_version_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    async with _git_version_lock:
+        cached = _git_version_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        info = await asyncio.to_thread(read_git_version)
+        # 读取出错时不缓存，下次请求重试
+        if info["branch"] != "error":
+            _git_version_cache = (key, info)
+        return info
+
+
+@router.post("/git/version/refresh")
+async def refresh_git_version():
+    """清除 git 版本缓存并重新读取。"""
+    global _git_version_cache
+    _git_version_cache = None
+    return await get_git_version()
+
+
+# 逻辑 CPU 数在进程生命周期内不变
+_CPU_COUNT = psutil.cpu_count()
+
+# 后台采样的 CPU 使用率：请求中直接读取，不再每次阻塞采样 1 秒
+_CPU_SAMPLE_INTERVAL = 2
+_last_cpu_percent: float | None = None
+
+
+async def cpu_sampler():
+    """周期性以非阻塞方式采样 CPU 使用率（两次调用之间的平均值），在 lifespan 中启动。"""
+    global _last_cpu_percent
+    psutil.cpu_percent(interval=None)  # 建立采样基准
+    while True:
+        await asyncio.sleep(_CPU_SAMPLE_INTERVAL)
+        _last_cpu_percent = psutil.cpu_percent(interval=None)
+
+
+def get_cpu_percent() -> float:
+    """返回最近一次后台采样值；采样任务尚未产出时退回非阻塞的即时采样。"""
+    if _last_cpu_percent is not None:
+        return _last_cpu_percent
+    return psutil.cpu_percent(interval=None)
+
+
+# GPUtil.getGPUs() 每次都会启动 nvidia-smi 子进程：由后台任务定期采样，
+# 采样任务未运行时按需采样并短期缓存，并发请求共用一次采样
+_GPU_CACHE_TTL = 1.5
+_GPU_SAMPLE_INTERVAL = 5
+_gpu_cache: tuple[float, List[Dict[str, Any]]] | None = None
+_gpu_lock = asyncio.Lock()
+
+
+def _get_gpus() -> List[Dict[str, Any]]:
+    gpus = []
+    gputil = load_gputil()
+    if gputil:
         try:
-            head_commit = repo.head.commit
-        except (ValueError, Exception):
-            # Try fallback to just getting the sha if commit object fails
-            # (Sometimes happens in shallow clones or weird states)
-            try:
-                sha = repo.head.object.hexsha
-                return {
-                    "branch": "unknown",
-                    "commit_hash": sha,
-                    "short_hash": sha[:7],
-                    "commit_message": "Commit message unavailable",
-                    "author": "unknown",
-                    "date": datetime.now().isoformat(),
-                }
-            except:
-                return {
-                    "branch": "unknown",
-                    "commit_hash": "unknown",
-                    "short_hash": "unknown",
-                    "commit_message": "No commits or invalid repo",
-                    "author": "unknown",
-                    "date": datetime.now().isoformat(),
-                }
-
-        branch_name = "detached"
-        try:
-            if not repo.head.is_detached:
-                branch_name = repo.active_branch.name
-        except (TypeError, ValueError, Exception):
-            # Fallback checks
-            pass
-
-        return {
-            "branch": branch_name,
-            "commit_hash": head_commit.hexsha,
-            "short_hash": head_commit.hexsha[:7],
-            "commit_message": head_commit.message.strip(),
-            "author": head_commit.author.name,
-            "date": datetime.fromtimestamp(head_commit.committed_date).isoformat(),
-        }
-    except git.exc.InvalidGitRepositoryError:
-        # Not a git repo, return empty structure instead of 404/500 to keep UI happy
-        return {
-            "branch": "unknown",
-            "commit_hash": "unknown",
-            "short_hash": "unknown",
-            "commit_message": "Not a git repository",
-            "author": "unknown",
-            "date": datetime.now().isoformat(),
-        }
-    except Exception as e:
-        # Log the error but return a graceful response instead of 500 if possible,
-        # or just raise 500 if it's a critical failure.
-        # Given the user's issue, catching the specific error inside is better.
-        return {
-            "branch": "error",
-            "commit_hash": "error",
-            "short_hash": "error",
-            "commit_message": str(e),
-            "author": "error",
-            "date": datetime.now().isoformat(),
-        }
+            # GPUtil.getGPUs() might fail if no NVIDIA driver or no GPUs
+            for gpu in gputil.getGPUs():
+                gpus.append(
+                    {
+                        "id": gpu.id,
+                        "name": gpu.name,
+                        "load": gpu.load * 100,  # Convert to percent
+                        "memory_total": gpu.memoryTotal,
+                        "memory_used": gpu.memoryUsed,
+                        "memory_free": gpu.memoryFree,
+                        "temperature": gpu.temperature,
+                    }
+                )
+        except Exception:
+            pass  # Gracefully handle GPU errors (no driver, etc)
+    return gpus
+
+
+async def gpu_sampler():
+    """周期性在线程中采样 GPU，在 lifespan 中启动；未安装 GPUtil 时直接返回。"""
+    global _gpu_cache
+    # 首次导入较慢，放到线程中执行
+    if await asyncio.to_thread(load_gputil) is None:
+        return
+    while True:
+        gpus = await asyncio.to_thread(_get_gpus)
+        # 有效期覆盖到下一次采样之后，采样任务运行期间请求不会再启动 nvidia-smi
+        _gpu_cache = (time.monotonic() + _GPU_SAMPLE_INTERVAL + _GPU_CACHE_TTL, gpus)
+        await asyncio.sleep(_GPU_SAMPLE_INTERVAL)
+
+
+async def _get_gpus_cached() -> List[Dict[str, Any]]:
+    """返回 _GPU_CACHE_TTL 秒内的 GPU 采样结果，未命中时只有一个协程启动采样。"""
+    global _gpu_cache
+    cached = _gpu_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    async with _gpu_lock:
+        cached = _gpu_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        gpus = await asyncio.to_thread(_get_gpus)
+        _gpu_cache = (time.monotonic() + _GPU_CACHE_TTL, gpus)
+        return gpus
+
+
+# 分区表几乎不变，缓存较久；statvfs 结果按挂载点短期缓存，避免每次请求都访问慢速文件系统
+_PARTITIONS_TTL = 60
+_DISK_USAGE_TTL = 5
+_partitions_cache: tuple[float, list] | None = None
+_disk_usage_cache: Dict[str, tuple[float, Any]] = {}
+
+
+def _is_ignored_partition(partition) -> bool:
+    # Filter out snap and loops to reduce noise, unless you really want them
+    return "loop" in partition.device or "snap" in partition.mountpoint
+
+
+def _get_partitions() -> list:
+    """返回过滤后的分区列表，_PARTITIONS_TTL 秒内复用上次结果。"""
+    global _partitions_cache
+    cached = _partitions_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    partitions = [p for p in psutil.disk_partitions() if not _is_ignored_partition(p)]
+    _partitions_cache = (time.monotonic() + _PARTITIONS_TTL, partitions)
+    return partitions
+
+
+async def _disk_usage_cached(mountpoint: str):
+    """返回 _DISK_USAGE_TTL 秒内的 disk_usage 结果，未命中时在线程中执行 statvfs。"""
+    cached = _disk_usage_cache.get(mountpoint)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    usage = await asyncio.to_thread(psutil.disk_usage, mountpoint)
+    _disk_usage_cache[mountpoint] = (time.monotonic() + _DISK_USAGE_TTL, usage)
+    return usage
 
 
 @router.get("/usage")
-async def get_system_usage():
+async def get_system_usage(request: Request):
     """
     Get system usage statistics (CPU, Memory, Disk, GPU).
+
+    响应带 ETag，数据与客户端缓存一致时返回 304。
     """
+    return conditional_json_response(request, dump_json(await collect_system_usage()))
+
+
+async def collect_system_usage() -> Dict[str, Any]:
+    """采集 CPU、内存、磁盘与 GPU 使用情况，供 /usage 与 /info 共用。"""
     try:
-        # CPU - Run in executor to avoid blocking main loop (interval=1 blocks for 1 sec)
-        loop = asyncio.get_event_loop()
-        cpu_percent = await loop.run_in_executor(None, psutil.cpu_percent, 1)
-        cpu_count = psutil.cpu_count()
+        # CPU - 读取后台采样结果，不在请求中阻塞采样
+        cpu_percent = get_cpu_percent()
+        cpu_count = _CPU_COUNT
 
-        # Memory
-        mem = psutil.virtual_memory()
+        # Memory - 读取 /proc/meminfo 属于文件 I/O，不在事件循环中执行
+        mem = await asyncio.to_thread(psutil.virtual_memory)
         memory = {
             "total": mem.total,
             "available": mem.available,
@@ -328,12 +454,12 @@ async def get_system_usage():
 
         # Disk
         disks = []
-        host_fs = os.getenv("HOST_FILESYSTEM_ROOT", "/")
+        host_fs = HOST_MONITOR_ROOT
 
         try:
             # If HOST_FILESYSTEM_ROOT is set and not '/', prioritize it
             if host_fs != "/" and os.path.exists(host_fs):
-                usage = psutil.disk_usage(host_fs)
+                usage = await _disk_usage_cached(host_fs)
                 disks.append(
                     {
                         "device": "host_root",
@@ -347,49 +473,31 @@ async def get_system_usage():
                 )
             else:
                 # Fallback to standard partition discovery
-                for partition in psutil.disk_partitions():
-                    try:
-                        # Filter out snap and loops to reduce noise, unless you really want them
-                        if "loop" in partition.device or "snap" in partition.mountpoint:
-                            continue
-
-                        usage = psutil.disk_usage(partition.mountpoint)
-                        disks.append(
-                            {
-                                "device": partition.device,
-                                "mountpoint": partition.mountpoint,
-                                "fstype": partition.fstype,
-                                "total": usage.total,
-                                "used": usage.used,
-                                "free": usage.free,
-                                "percent": usage.percent,
-                            }
-                        )
-                    except (PermissionError, OSError):
+                partitions = await asyncio.to_thread(_get_partitions)
+                # 每个 statvfs 在网络文件系统上都可能很慢，并发执行，总耗时取最慢的一个
+                usages = await asyncio.gather(
+                    *(_disk_usage_cached(p.mountpoint) for p in partitions),
+                    return_exceptions=True,
+                )
+                for partition, usage in zip(partitions, usages):
+                    if isinstance(usage, Exception):
                         continue
+                    disks.append(
+                        {
+                            "device": partition.device,
+                            "mountpoint": partition.mountpoint,
+                            "fstype": partition.fstype,
+                            "total": usage.total,
+                            "used": usage.used,
+                            "free": usage.free,
+                            "percent": usage.percent,
+                        }
+                    )
         except Exception as e:
             pass  # Keep going if disk info fails
 
         # GPU
-        gpus = []
-        if GPUtil:
-            try:
-                # GPUtil.getGPUs() might fail if no NVIDIA driver or no GPUs
-                gpu_list = await loop.run_in_executor(None, GPUtil.getGPUs)
-                for gpu in gpu_list:
-                    gpus.append(
-                        {
-                            "id": gpu.id,
-                            "name": gpu.name,
-                            "load": gpu.load * 100,  # Convert to percent
-                            "memory_total": gpu.memoryTotal,
-                            "memory_used": gpu.memoryUsed,
-                            "memory_free": gpu.memoryFree,
-                            "temperature": gpu.temperature,
-                        }
-                    )
-            except Exception:
-                pass  # Gracefully handle GPU errors (no driver, etc)
+        gpus = await _get_gpus_cached()
 
         return {
             "cpu": {"percent": cpu_percent, "count": cpu_count},
@@ -403,49 +511,53 @@ async def get_system_usage():
         )
 
 
+# /proc/net/{tcp,udp}[6] 的数据行：序号、本地地址:端口、远端地址:端口、状态，均为十六进制
+_PROC_NET_RE = re.compile(
+    rb"^\s*\d+:\s*[0-9A-Fa-f]+:([0-9A-Fa-f]{4})\s+[0-9A-Fa-f]+:[0-9A-Fa-f]+"
+    rb"\s+([0-9A-Fa-f]{2})",
+    re.M,
+)
+_TCP_LISTEN = b"0A"
+# (文件名, 是否为 TCP)，以及主机挂载下对应的完整路径，进程内不变
+_PROC_NET_FILES = (("tcp", True), ("tcp6", True), ("udp", False), ("udp6", False))
+_HOST_PROC_NET_FILES = tuple(
+    (os.path.join(HOST_PROC_NET_DIR, fname), is_tcp)
+    for fname, is_tcp in _PROC_NET_FILES
+)
+
+
+def _parse_proc_net(data: bytes, is_tcp: bool) -> set:
+    """从 /proc/net 文件内容中提取 TCP 监听端口或全部 UDP 端口；表头不会被匹配。"""
+    if is_tcp:
+        return {
+            int(m.group(1), 16)
+            for m in _PROC_NET_RE.finditer(data)
+            if m.group(2) == _TCP_LISTEN
+        }
+    return {int(m.group(1), 16) for m in _PROC_NET_RE.finditer(data)}
+
+
 def _get_host_used_ports():
     used_ports = set()
 
-    def _parse_proc_net_lines(lines, is_tcp):
-        for line in lines:
-            try:
-                parts = line.split()
-                if len(parts) < 4:
-                    continue
-
-                local_addr = parts[1]
-                status = parts[3]
-
-                if ":" in local_addr:
-                    _, port_hex = local_addr.split(":")
-                    port = int(port_hex, 16)
-                    if is_tcp:
-                        if status == "0A":  # LISTEN
-                            used_ports.add(port)
-                    else:
-                        used_ports.add(port)  # UDP
-            except Exception:
-                pass
-
     host_network_container = None
     is_self_host = False
 
     # Method 0: Check Docker mapped ports (Most reliable for containerized environment)
     try:
         client = get_docker_client()
-        containers = client.containers.list(all=True)
+        # 容器摘要中已包含 State、HostConfig.NetworkMode、Networks 与端口映射
+        containers = get_containers_snapshot(client)
 
         # Check self container network mode
         try:
-            from app.core.utils import get_self_container
-
-            self_container = get_self_container(client)
-            if self_container:
-                mode = self_container.attrs.get("HostConfig", {}).get("NetworkMode")
+            self_attrs = get_self_container_attrs(client)
+            if self_attrs:
+                mode = self_attrs.get("HostConfig", {}).get("NetworkMode")
                 if mode == "host":
                     is_self_host = True
                 else:
-                    networks = self_container.attrs.get("NetworkSettings", {}).get(
+                    networks = self_attrs.get("NetworkSettings", {}).get(
                         "Networks", {}
                     )
                     if "host" in networks:
@@ -455,67 +567,48 @@ def _get_host_used_ports():
 
         for c in containers:
             # Check for host network container (running) to use as proxy for host /proc/net
-            if not host_network_container and c.status == "running":
+            if not host_network_container and c.get("State") == "running":
                 # Check HostConfig.NetworkMode or NetworkSettings.Networks
-                is_host = c.attrs.get("HostConfig", {}).get("NetworkMode") == "host"
+                is_host = (c.get("HostConfig") or {}).get("NetworkMode") == "host"
                 if not is_host:
-                    networks = c.attrs.get("NetworkSettings", {}).get("Networks", {})
+                    networks = (c.get("NetworkSettings") or {}).get("Networks") or {}
                     if "host" in networks:
                         is_host = True
 
                 if is_host:
-                    host_network_container = c
-
-            # ports format: {'80/tcp': [{'HostIp': '0.0.0.0', 'HostPort': '8000'}], ...}
-            ports = c.attrs.get("NetworkSettings", {}).get("Ports", {})
-            if ports:
-                for container_port, host_bindings in ports.items():
-                    if host_bindings:
-                        for binding in host_bindings:
-                            host_port = binding.get("HostPort")
-                            if host_port:
-                                try:
-                                    used_ports.add(int(host_port))
-                                except ValueError:
-                                    pass
+                    # 只需要执行 exec，用摘要构造容器对象，不再 inspect
+                    host_network_container = client.containers.prepare_model(c)
+
+            # ports format: [{'PrivatePort': 80, 'PublicPort': 8000, 'Type': 'tcp'}]
+            for port in c.get("Ports") or ():
+                host_port = port.get("PublicPort")
+                if host_port:
+                    used_ports.add(int(host_port))
 
         # Method 0.5: Inspect /proc/net via host-networked container
         if host_network_container:
-            files = [("tcp", True), ("tcp6", True), ("udp", False), ("udp6", False)]
-            for fname, is_tcp in files:
+            for fname, is_tcp in _PROC_NET_FILES:
                 try:
                     # cat /proc/net/tcp
                     exit_code, output = host_network_container.exec_run(
                         f"cat /proc/net/{fname}"
                     )
                     if exit_code == 0:
-                        lines = output.decode("utf-8").splitlines()
-                        if lines:
-                            # Skip header
-                            _parse_proc_net_lines(lines[1:], is_tcp)
+                        used_ports |= _parse_proc_net(output, is_tcp)
                 except Exception:
                     pass
 
-        client.close()
     except Exception:
         pass
 
-    host_fs = os.getenv("HOST_FILESYSTEM_ROOT", "/")
-    proc_net = os.path.join(host_fs, "proc/net")
-
     # Method 1: Try reading /proc/net (Linux with host mount)
-    if os.path.exists(os.path.join(proc_net, "tcp")):
-        files = [("tcp", True), ("tcp6", True), ("udp", False), ("udp6", False)]
-
-        for fname, is_tcp in files:
-            path = os.path.join(proc_net, fname)
-            if not os.path.exists(path):
-                continue
-
+    if os.path.exists(_HOST_PROC_NET_FILES[0][0]):
+        for path, is_tcp in _HOST_PROC_NET_FILES:
+            # 文件不存在（如未启用 IPv6）时 open 抛出异常，直接跳过
             try:
-                with open(path, "r") as f:
-                    lines = f.readlines()[1:]  # Skip header
-                    _parse_proc_net_lines(lines, is_tcp)
+                # 一次读入字节后用正则整体扫描，避免逐行 split 产生大量小对象
+                with open(path, "rb") as f:
+                    used_ports |= _parse_proc_net(f.read(), is_tcp)
             except Exception:
                 pass
 
@@ -561,33 +654,62 @@ def _get_host_used_ports():
     return used_ports
 
 
+# 占用端口的探测要读取 /proc/net、查询 Docker，甚至逐个尝试 bind，结果短期缓存
+_USED_PORTS_TTL = 3
+_used_ports_cache: tuple[float, frozenset] | None = None
+_used_ports_lock = asyncio.Lock()
+
+
+async def _get_host_used_ports_cached() -> frozenset:
+    """返回 _USED_PORTS_TTL 秒内的占用端口探测结果，未命中时只有一个协程执行探测。"""
+    global _used_ports_cache
+    cached = _used_ports_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    async with _used_ports_lock:
+        cached = _used_ports_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        used_ports = frozenset(await asyncio.to_thread(_get_host_used_ports))
+        _used_ports_cache = (time.monotonic() + _USED_PORTS_TTL, used_ports)
+        return used_ports
+
+
+def _available_port_ranges(used_ports) -> tuple[int, List[str]]:
+    """
+    计算 1-65535 中可用端口的数量与连续区间。
+
+    用 bytearray 位图标记占用端口，再用 find 在 C 层直接跳过整段连续区间，
+    无需排序；超出范围的端口（如 0）不计入占用数量。
+    """
+    bitmap = bytearray(65536)
+    bitmap[0] = 1
+    for port in used_ports:
+        if 0 < port < 65536:
+            bitmap[port] = 1
+
+    ranges = []
+    start = bitmap.find(0)
+    while start != -1:
+        end = bitmap.find(1, start)
+        if end == -1:
+            end = 65536
+        ranges.append(f"{start}-{end - 1}")
+        start = bitmap.find(0, end)
+    return bitmap.count(0), ranges
+
+
 @router.get("/ports/available")
 async def get_available_ports():
     """
     Get a list of available port ranges on the host.
     """
     try:
-        used_ports = await asyncio.get_event_loop().run_in_executor(
-            None, _get_host_used_ports
-        )
-
         # 将浏览器黑名单端口也视为不可用
-        used_ports |= set(BROWSER_BLOCKED_PORTS)
-
-        # Calculate available ranges
-        sorted_used = sorted(list(used_ports))
-        ranges = []
-        start = 1
-
-        for port in sorted_used:
-            if port > start:
-                ranges.append(f"{start}-{port - 1}")
-            start = port + 1
-
-        if start <= 65535:
-            ranges.append(f"{start}-65535")
+        used_ports = await _get_host_used_ports_cached() | set(BROWSER_BLOCKED_PORTS)
 
-        return {"total_available": 65535 - len(used_ports), "ranges": ranges}
+        total_available, ranges = _available_port_ranges(used_ports)
+        return {"total_available": total_available, "ranges": ranges}
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving available ports: {str(e)}"
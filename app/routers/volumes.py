@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Dict, Any, Optional
 import docker
 import os
+from stat import S_ISDIR, S_ISLNK
 from app.core.security import get_api_key
-from app.core.utils import get_docker_client
+from app.core.utils import get_docker_client, get_volume_usage_index
 from app.core.config import HOST_FILESYSTEM_ROOT
 
 router = APIRouter(
@@ -13,44 +14,37 @@ router = APIRouter(
 )
 
 @router.get("", response_model=List[Dict[str, Any]])
-async def list_volumes():
+def list_volumes():
     """
     Get a list of all Docker volumes.
     """
     client = get_docker_client()
     try:
-        volumes = client.volumes.list()
+        # 低层接口直接返回字典列表，不为每个卷构造模型对象
+        volumes = client.api.volumes().get("Volumes") or []
         
-        # Check usage
-        containers = client.containers.list(all=True)
-        used_volume_names = set()
-        for c in containers:
-            mounts = c.attrs.get("Mounts", [])
-            for m in mounts:
-                if m.get("Type") == "volume":
-                    name = m.get("Name")
-                    if name:
-                        used_volume_names.add(name)
+        # Check usage - 由容器摘要快照派生的卷索引，无需逐个 inspect
+        used_volume_names = get_volume_usage_index(client)
 
         result = []
         for vol in volumes:
+            # docker-py 的 Volume.id 与 name 都取自 Name
+            name = vol.get("Name")
             result.append({
-                "id": vol.id,
-                "name": vol.name,
-                "driver": vol.attrs.get("Driver"),
-                "created": vol.attrs.get("CreatedAt"),
-                "mountpoint": vol.attrs.get("Mountpoint"),
-                "labels": vol.attrs.get("Labels"),
-                "in_use": vol.name in used_volume_names
+                "id": name,
+                "name": name,
+                "driver": vol.get("Driver"),
+                "created": vol.get("CreatedAt"),
+                "mountpoint": vol.get("Mountpoint"),
+                "labels": vol.get("Labels"),
+                "in_use": name in used_volume_names
             })
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving volumes: {str(e)}")
-    finally:
-        client.close()
 
 @router.delete("/{volume_id}", response_model=Dict[str, Any])
-async def delete_volume(volume_id: str, force: bool = False):
+def delete_volume(volume_id: str, force: bool = False):
     """
     Delete a specific Docker volume.
     """
@@ -67,12 +61,10 @@ async def delete_volume(volume_id: str, force: bool = False):
         raise HTTPException(status_code=500, detail=f"Docker API Error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting volume: {str(e)}")
-    finally:
-        client.close()
 
 
 @router.get("/{volume_id}", response_model=Dict[str, Any])
-async def get_volume_details(volume_id: str):
+def get_volume_details(volume_id: str):
     """
     Get detailed information about a specific Docker volume.
     """
@@ -81,14 +73,7 @@ async def get_volume_details(volume_id: str):
         volume = client.volumes.get(volume_id)
         
         # Check if volume is in use
-        containers = client.containers.list(all=True)
-        used_by = []
-        for c in containers:
-            mounts = c.attrs.get("Mounts", [])
-            for m in mounts:
-                if m.get("Type") == "volume" and m.get("Name") == volume.name:
-                    used_by.append(c.name)
-                    break
+        used_by = list(get_volume_usage_index(client).get(volume.name, ()))
         
         data = dict(volume.attrs)
         data["in_use"] = len(used_by) > 0
@@ -98,14 +83,20 @@ async def get_volume_details(volume_id: str):
         raise HTTPException(status_code=404, detail="Volume not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving volume details: {str(e)}")
-    finally:
-        client.close()
 
 @router.get("/{volume_id}/files", response_model=List[Dict[str, Any]])
-async def get_volume_files(volume_id: str, path: str = ""):
+def get_volume_files(
+    volume_id: str,
+    response: Response,
+    path: str = "",
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+):
     """
     Get list of files and directories in a volume.
     path: Relative path inside the volume (e.g., 'subdir/').
+    limit / offset: 可选分页参数，条目按名称排序后切片；不传 limit 时返回全部条目，
+    传入 limit 且后面还有条目时响应头 X-Truncated 为 true。
     """
     client = get_docker_client()
     try:
@@ -134,27 +125,44 @@ async def get_volume_files(volume_id: str, path: str = ""):
         if not abs_target.startswith(abs_base):
             raise HTTPException(status_code=403, detail="Access denied: Path traversal detected")
             
-        if not os.path.exists(abs_target):
+        # 只 stat 一次，代替 exists / isdir 各自的系统调用
+        try:
+            target_stat = os.stat(abs_target)
+        except OSError:
             raise HTTPException(status_code=404, detail="Path not found")
             
-        if not os.path.isdir(abs_target):
+        if not S_ISDIR(target_stat.st_mode):
             raise HTTPException(status_code=400, detail="Path is not a directory")
             
         items = []
         with os.scandir(abs_target) as it:
-            for entry in it:
-                try:
-                    stat = entry.stat()
-                    items.append({
-                        "name": entry.name,
-                        "type": "directory" if entry.is_dir() else "file",
-                        "size": stat.st_size,
-                        "modified": stat.st_mtime,
-                        "is_symlink": entry.is_symlink()
-                    })
-                except OSError:
-                    continue # Skip entries we cannot access
-        
+            # scandir 的顺序不固定，按名称排序后再分页，翻页时条目不会重复或遗漏；
+            # 只对当前页的条目做 stat
+            entries = sorted(it, key=lambda e: e.name)
+        end = None if limit is None else offset + limit
+        truncated = end is not None and end < len(entries)
+        for entry in entries[offset:end]:
+            try:
+                # 只做一次 lstat，类型与是否为符号链接都取自 st_mode；
+                # 不依赖 d_type，在不提供 d_type 的文件系统上也不会多一次系统调用
+                entry_stat = entry.stat(follow_symlinks=False)
+                is_symlink = S_ISLNK(entry_stat.st_mode)
+                # 仅符号链接需要再跟随一次，判断其是否指向目录
+                if is_symlink:
+                    is_dir = entry.is_dir()
+                else:
+                    is_dir = S_ISDIR(entry_stat.st_mode)
+            except OSError:
+                continue # Skip entries we cannot access
+            items.append({
+                "name": entry.name,
+                "type": "directory" if is_dir else "file",
+                "size": entry_stat.st_size,
+                "modified": entry_stat.st_mtime,
+                "is_symlink": is_symlink
+            })
+
+        response.headers["X-Truncated"] = "true" if truncated else "false"
         return items
 
     except docker.errors.NotFound:
@@ -163,5 +171,3 @@ async def get_volume_files(volume_id: str, path: str = ""):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing files: {str(e)}")
-    finally:
-        client.close()
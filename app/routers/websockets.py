@@ -1,16 +1,78 @@
 from fastapi import APIRouter, WebSocket, status, WebSocketDisconnect
 import json
 import asyncio
+import threading
 from app.services.docker_monitor import manager
-from app.core.utils import get_docker_client, get_current_container_id, process_container_summary
-from app.db.database import SessionLocal
-from app.db.models import APIKeyModel
+from app.core.security import authorize_websocket
+from app.core.utils import (
+    dump_json,
+    get_current_container_id,
+    get_docker_client,
+    process_raw_container_summary,
+)
 
 router = APIRouter(
     prefix="/ws",
     tags=["websockets"]
 )
 
+
+def _split_lines(chunks):
+    """
+    把原始字节块切分为完整的行，跨块的半行留到下一块拼接。
+
+    响应不是分块传输时 docker-py 会整体返回 response.text（str），先编码为字节再切分。
+    """
+    pending = b""
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line.strip()
+    if pending.strip():
+        yield pending.strip()
+
+
+async def _relay_lines(websocket: WebSocket, chunks):
+    """
+    在单个工作线程中读取流式响应，经队列交给事件循环逐行以文本帧发送。
+
+    整个流只占用一个线程，不再为每一行进度各调度一次 to_thread。
+    发送失败（如客户端断开）时通知读取线程停止，并关闭底层流。
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for line in _split_lines(chunks):
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, line)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            if not stop.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while (line := await queue.get()) is not None:
+            if isinstance(line, Exception):
+                raise line
+            # 客户端按文本帧解析进度，保持 send_text
+            await websocket.send_text(line.decode("utf-8"))
+        await producer
+    finally:
+        stop.set()
+
+
 @router.websocket("/containers/summary")
 async def websocket_containers_summary(websocket: WebSocket, api_key: str = None):
     """
@@ -18,28 +80,25 @@ async def websocket_containers_summary(websocket: WebSocket, api_key: str = None
     Usage: ws://host:port/ws/containers/summary?api_key=YOUR_KEY
     """
     await websocket.accept()
-    
+
     # Validate API Key
-    db = SessionLocal()
-    try:
-        if not api_key:
-             await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="invalid api key")
-             return
-             
-        key_record = db.query(APIKeyModel).filter(APIKeyModel.key == api_key).first()
-        if not key_record:
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="invalid api key")
-            return
-    finally:
-        db.close()
+    if not await authorize_websocket(websocket, api_key, reason="invalid api key"):
+        return
 
     client = get_docker_client()
     self_id = get_current_container_id()
     try:
-        containers = client.containers.list(all=True)
-        for container in containers:
-            summary = process_container_summary(container, self_id)
-            await websocket.send_json(summary)
+        # docker-py 为同步阻塞调用，放到线程中执行，避免阻塞事件循环；
+        # 列表摘要已包含镜像名与端口，无需逐个 inspect，并在线程中一并序列化
+        frames = await asyncio.to_thread(
+            lambda: [
+                dump_json(process_raw_container_summary(c, self_id)).decode("utf-8")
+                for c in client.api.containers(all=True)
+            ]
+        )
+        # 客户端按条解析文本帧，保持每个容器一条消息
+        for frame in frames:
+            await websocket.send_text(frame)
         # Close connection normally after sending all data
         await websocket.close()
     except Exception as e:
@@ -48,8 +107,6 @@ async def websocket_containers_summary(websocket: WebSocket, api_key: str = None
             await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
         except:
             pass
-    finally:
-        client.close()
 
 @router.websocket("/events")
 async def websocket_events(websocket: WebSocket, api_key: str = None):
@@ -60,27 +117,18 @@ async def websocket_events(websocket: WebSocket, api_key: str = None):
     await websocket.accept()
     
     # Validate API Key
-    db = SessionLocal()
-    try:
-        if not api_key:
-             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-             return
-             
-        key_record = db.query(APIKeyModel).filter(APIKeyModel.key == api_key).first()
-        if not key_record:
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-            return
-    finally:
-        db.close()
+    if not await authorize_websocket(websocket, api_key):
+        return
 
-    manager.active_connections.append(websocket)
+    manager.subscribe(websocket)
     try:
-        while True:
-            # Keep connection alive
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        # 连接存活由 uvicorn 在协议层的 ping/pong 检测（默认间隔 20 秒），
+        # 这里只等待断开消息，客户端发来的内容直接丢弃，不做解码
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
     except Exception:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 @router.websocket("/images/pull")
@@ -93,18 +141,8 @@ async def websocket_pull_image(websocket: WebSocket, api_key: str = None):
     await websocket.accept()
     
     # Validate API Key
-    db = SessionLocal()
-    try:
-        if not api_key:
-             await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="invalid api key")
-             return
-             
-        key_record = db.query(APIKeyModel).filter(APIKeyModel.key == api_key).first()
-        if not key_record:
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="invalid api key")
-            return
-    finally:
-        db.close()
+    if not await authorize_websocket(websocket, api_key, reason="invalid api key"):
+        return
 
     try:
         # Wait for image details
@@ -127,17 +165,17 @@ async def websocket_pull_image(websocket: WebSocket, api_key: str = None):
         client = get_docker_client()
         try:
             # Use low-level API to get stream
-            # stream=True, decode=True returns a generator of dicts
-            for line in client.api.pull(image_name, tag=tag, stream=True, decode=True):
-                await websocket.send_json(line)
-                # yield to event loop to keep connection responsive
-                await asyncio.sleep(0) 
-            
+            # decode=False 直接拿到 Docker 返回的 JSON 字节，原样转发，
+            # 省去每行进度的解析与重新序列化；发起请求会阻塞，放到线程中执行
+            progress = await asyncio.to_thread(
+                client.api.pull, image_name, tag=tag, stream=True, decode=False
+            )
+            await _relay_lines(websocket, progress)
+
             await websocket.send_json({"status": "success", "message": "Image pulled successfully"})
         except Exception as e:
             await websocket.send_json({"error": str(e)})
         finally:
-            client.close()
             await websocket.close()
             
     except WebSocketDisconnect:
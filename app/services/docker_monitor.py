@@ -1,47 +1,132 @@
 import asyncio
+import logging
+import random
+import time
 import docker
-from typing import List
+from typing import Dict
 from fastapi import WebSocket
 from app.core.config import IGNORED_EVENTS
+from app.core.utils import dump_json
+
+logger = logging.getLogger(__name__)
+
+# 每个事件连接的待发送队列容量；客户端读取过慢时丢弃最旧的事件，内存占用有上限
+SUBSCRIBER_QUEUE_MAXSIZE = 256
+
+
+class _Subscriber:
+    """一个事件连接及其待发送队列和写协程。"""
+
+    __slots__ = ("websocket", "queue", "task")
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_MAXSIZE)
+        self.task: asyncio.Task | None = None
+
 
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # 按 WebSocket 索引，断开连接时 O(1) 移除
+        self.active_connections: Dict[WebSocket, _Subscriber] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.subscribe(websocket)
+
+    def subscribe(self, websocket: WebSocket):
+        """登记一个已接受的连接，并启动它专属的写协程。"""
+        subscriber = _Subscriber(websocket)
+        subscriber.task = asyncio.create_task(self._writer(subscriber))
+        self.active_connections[websocket] = subscriber
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        subscriber = self.active_connections.pop(websocket, None)
+        if subscriber is not None and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
 
-    async def broadcast(self, message: dict):
-        # Create a copy to iterate safely
-        for connection in list(self.active_connections):
+    async def _writer(self, subscriber: _Subscriber):
+        # 每个连接独立发送，慢客户端只会拖慢自己
+        while True:
+            payload = await subscriber.queue.get()
             try:
-                await connection.send_json(message)
+                await subscriber.websocket.send_text(payload)
             except Exception:
-                self.disconnect(connection)
+                self.disconnect(subscriber.websocket)
+                return
+
+    async def broadcast(self, message: dict):
+        if not self.active_connections:
+            return
+        # 每个事件只序列化一次；仍以文本帧发送，客户端按文本消息解析
+        payload = dump_json(message).decode("utf-8")
+        # 只放入各连接的队列，不等待发送完成
+        for subscriber in self.active_connections.values():
+            _enqueue_event(subscriber.queue, payload)
 
 manager = ConnectionManager()
 
-def docker_event_listener(loop):
+# str.startswith 接受元组，一次调用在 C 层完成全部前缀比较
+_IGNORED_EVENT_PREFIXES = tuple(IGNORED_EVENTS)
+
+# 事件监听线程与广播协程之间的队列容量；消费跟不上时丢弃最旧的事件
+EVENT_QUEUE_MAXSIZE = 1024
+
+
+def _enqueue_event(queue: asyncio.Queue, event):
+    """在事件循环线程中执行：队列已满时丢弃最旧的事件，保证最新状态能送达。"""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+async def broadcast_events(queue: asyncio.Queue):
+    """按到达顺序逐个广播事件，在 lifespan 中与监听线程一同启动。"""
+    while True:
+        event = await queue.get()
+        await manager.broadcast(event)
+
+
+# 监听中断后的重连间隔（秒）：指数增长并带少量随机抖动，上限 60 秒
+_RECONNECT_BACKOFF_BASE = 1
+_RECONNECT_BACKOFF_MAX = 60
+
+
+def docker_event_listener(loop, queue: asyncio.Queue):
     """
     Background thread to listen for Docker events and broadcast them.
+
+    Docker 守护进程重启或连接中断后按指数退避自动重连，事件循环关闭后退出；
+    连续失败只在第一次记录错误，恢复连接时再提示一次。
     """
-    try:
-        client = docker.from_env()
-        # decode=True returns a generator of dicts
-        events = client.events(decode=True)
-        for event in events:
-            # Filter out ignored events
-            action = event.get("Action", "")
-            if any(action.startswith(ignored) for ignored in IGNORED_EVENTS):
-                continue
-                
-            # Broadcast event to all connected websockets
-            # Since this runs in a thread, we need to schedule the coroutine in the main loop
-            asyncio.run_coroutine_threadsafe(manager.broadcast(event), loop)
-    except Exception as e:
-        print(f"Error in docker event listener: {e}")
+    backoff = _RECONNECT_BACKOFF_BASE
+    failing = False
+    while not loop.is_closed():
+        client = None
+        try:
+            client = docker.from_env()
+            # decode=True returns a generator of dicts
+            events = client.events(decode=True)
+            if failing:
+                logger.info("Docker event listener reconnected")
+                failing = False
+            backoff = _RECONNECT_BACKOFF_BASE
+            for event in events:
+                # Filter out ignored events
+                action = event.get("Action", "")
+                if action.startswith(_IGNORED_EVENT_PREFIXES):
+                    continue
+
+                # 只把事件放入队列，由事件循环中的 broadcast_events 负责发送，
+                # 不再为每个事件跨线程调度一个协程并创建 Future
+                loop.call_soon_threadsafe(_enqueue_event, queue, event)
+        except Exception as e:
+            if not failing:
+                logger.warning("Error in docker event listener: %s", e)
+                failing = True
+        finally:
+            # 每次重连都会新建客户端，关闭旧的连接池，避免守护进程反复重启时泄漏 socket
+            if client is not None:
+                client.close()
+        time.sleep(backoff + random.uniform(0, backoff * 0.1))
+        backoff = min(backoff * 2, _RECONNECT_BACKOFF_MAX)
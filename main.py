@@ -4,8 +4,12 @@ from fastapi.staticfiles import StaticFiles
 import asyncio
 import threading
 from contextlib import asynccontextmanager
-from app.db.database import engine, Base
-from app.services.docker_monitor import docker_event_listener
+from app.db.database import init_db
+from app.services.docker_monitor import (
+    EVENT_QUEUE_MAXSIZE,
+    broadcast_events,
+    docker_event_listener,
+)
 
 # Import Routers
 from app.routers import (
@@ -30,7 +34,7 @@ from app.mcp.http_server import (
 )
 
 # Initialize Database
-Base.metadata.create_all(bind=engine)
+init_db()
 
 DESCRIPTION = """
 Mobile Portainer 是一款轻量级的 Docker 管理 API，支持容器、镜像、网络、卷、堆栈的管理。
@@ -91,17 +95,29 @@ TAGS_METADATA = [
 async def lifespan(app: FastAPI):
     """应用生命周期管理：启动 Docker 事件监听和 MCP 会话管理器。"""
     # Startup
-    loop = asyncio.get_event_loop()
-    threading.Thread(target=docker_event_listener, args=(loop,), daemon=True).start()
+    loop = asyncio.get_running_loop()
+    event_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+    threading.Thread(
+        target=docker_event_listener, args=(loop, event_queue), daemon=True
+    ).start()
+    broadcast_task = asyncio.create_task(broadcast_events(event_queue))
+    cpu_sampler_task = asyncio.create_task(system.cpu_sampler())
+    gpu_sampler_task = asyncio.create_task(system.gpu_sampler())
 
     # 启动 MCP session manager
     async with mcp_session_manager.run():
         yield
 
     # Shutdown
+    broadcast_task.cancel()
+    cpu_sampler_task.cancel()
+    gpu_sampler_task.cancel()
     from app.core.docker_socket import close_docker_http_client
+    from app.core.utils import close_docker_client
 
     await close_docker_http_client()
+    close_docker_client()
+    await admin.close_propagation_client()
 
 
 app = FastAPI(
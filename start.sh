@@ -39,4 +39,5 @@ echo "📍 地址: http://0.0.0.0:8000"
 echo "📖 API 文档: http://0.0.0.0:8000/docs"
 echo ""
 
-$PYTHON -m uvicorn main:app --host 0.0.0.0 --port 8000
+# 管理页与移动端会连续发出多个请求，延长 keep-alive 以复用 TCP 连接
+$PYTHON -m uvicorn main:app --host 0.0.0.0 --port 8000 --timeout-keep-alive 75
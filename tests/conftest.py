@@ -10,6 +10,7 @@ test_engine = create_engine(
 )
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
+from app.core import utils
 from app.db.database import Base, get_db
 from main import app
 
@@ -33,6 +34,16 @@ def setup_db():
     Base.metadata.drop_all(bind=test_engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_docker_caches():
+    """容器摘要快照与本容器信息为进程级缓存，测试之间清空以免互相影响。"""
+    utils.invalidate_containers_snapshot()
+    utils._self_attrs_cache = None
+    yield
+    utils.invalidate_containers_snapshot()
+    utils._self_attrs_cache = None
+
+
 @pytest.fixture
 def client():
     return TestClient(app)
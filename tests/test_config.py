@@ -35,3 +35,15 @@ class TestConfig:
         from app.core.config import DOCKER_ENGINE_API_ENABLED
 
         assert DOCKER_ENGINE_API_ENABLED is True
+
+    def test_ignored_events_strips_whitespace_and_empty_items(self, monkeypatch):
+        import importlib
+        from app.core import config
+
+        monkeypatch.setenv("IGNORED_EVENTS", " exec_create , exec_die,,")
+        try:
+            reloaded = importlib.reload(config)
+            assert reloaded.IGNORED_EVENTS == frozenset({"exec_create", "exec_die"})
+        finally:
+            monkeypatch.undo()
+            importlib.reload(config)
@@ -0,0 +1,351 @@
+"""容器路由器测试。"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.routers import containers
+
+
+@pytest.fixture(autouse=True)
+def clear_list_cache():
+    containers._invalidate_list_cache()
+    yield
+    containers._invalidate_list_cache()
+
+
+_RAW_CONTAINER = {
+    "Id": "abc123def456",
+    "Names": ["/web"],
+    "Image": "nginx:latest",
+    "State": "running",
+    "Labels": {},
+    "Ports": [],
+}
+
+
+class TestFindBestMount:
+    def test_longest_prefix_wins(self):
+        mounts = [
+            {"Destination": "/data", "Source": "/a"},
+            {"Destination": "/data/sub/", "Source": "/b"},
+            {"Destination": "/other", "Source": "/c"},
+        ]
+        assert containers._find_best_mount(mounts, "/data/sub/x")["Source"] == "/b"
+        assert containers._find_best_mount(mounts, "/data/subx")["Source"] == "/a"
+        assert containers._find_best_mount(mounts, "/data")["Source"] == "/a"
+        assert containers._find_best_mount(mounts, "/var") is None
+
+    def test_root_mount_matches_everything(self):
+        mounts = [{"Destination": "/", "Source": "/host"}]
+        assert containers._find_best_mount(mounts, "/etc/hosts")["Source"] == "/host"
+
+    def test_relative_path_returns_none(self):
+        mounts = [
+            {"Destination": "/", "Source": "/host"},
+            {"Destination": "/data", "Source": "/a"},
+        ]
+        assert containers._find_best_mount(mounts, "foo") is None
+        assert containers._find_best_mount(mounts, "data/x") is None
+
+
+class TestContainerDetails:
+    def test_returns_inspect_json(self, client, admin_headers):
+        mock_client = MagicMock()
+        mock_client.api.inspect_container.return_value = {"Id": "abc", "Name": "/网站"}
+        with patch(
+            "app.routers.containers.get_docker_client", return_value=mock_client
+        ):
+            response = client.get("/containers/abc", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"Id": "abc", "Name": "/网站"}
+
+
+class TestContainerListCache:
+    def test_summary_served_from_cache(self, client, admin_headers):
+        """短时间内重复请求只访问一次 Docker。"""
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [_RAW_CONTAINER]
+        with patch(
+            "app.routers.containers.get_docker_client", return_value=mock_client
+        ):
+            first = client.get("/containers/summary", headers=admin_headers)
+            second = client.get("/containers/summary", headers=admin_headers)
+
+        assert first.status_code == 200
+        assert first.json() == second.json()
+        assert first.json()[0]["name"] == "web"
+        assert mock_client.api.containers.call_count == 1
+
+    def test_action_invalidates_cache(self, client, admin_headers):
+        """容器操作成功后列表缓存失效。"""
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [_RAW_CONTAINER]
+        with patch(
+            "app.routers.containers.get_docker_client", return_value=mock_client
+        ):
+            client.get("/containers/summary", headers=admin_headers)
+            client.post("/containers/abc123def456/restart", headers=admin_headers)
+            client.get("/containers/summary", headers=admin_headers)
+
+        assert mock_client.api.containers.call_count == 2
+
+
+    def test_filtered_keys_bounded(self, client, admin_headers, monkeypatch):
+        """不同过滤参数产生的缓存条目数量有上限。"""
+        monkeypatch.setattr(containers, "_LIST_CACHE_MAXSIZE", 3)
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [_RAW_CONTAINER]
+        with patch(
+            "app.routers.containers.get_docker_client", return_value=mock_client
+        ):
+            for i in range(10):
+                client.get(f"/containers/summary?name=c{i}", headers=admin_headers)
+
+        assert len(containers._list_cache) == 3
+
+    def test_expired_entries_dropped_on_write(self):
+        containers._list_cache["old"] = (0.0, b"[]", '"etag"')
+        containers._store_list_cache("new", 1.0, b"[]", '"etag"')
+
+        assert list(containers._list_cache) == ["new"]
+
+
+    def test_concurrent_store_and_invalidate(self, monkeypatch):
+        """多线程同时写入、淘汰与清空缓存时不抛出异常。"""
+        import threading
+
+        monkeypatch.setattr(containers, "_LIST_CACHE_MAXSIZE", 4)
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(2000):
+                    containers._store_list_cache((n, i), 0.0, b"[]", '"e"')
+                    if i % 50 == 0:
+                        containers._invalidate_list_cache()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert len(containers._list_cache) <= 4
+
+
+class TestListContainers:
+    def test_skips_container_removed_during_listing(self, client, admin_headers):
+        """列表后被删除的容器 inspect 返回 404 时跳过。"""
+        import docker
+
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [
+            _RAW_CONTAINER,
+            {**_RAW_CONTAINER, "Id": "gone"},
+        ]
+
+        def inspect(container_id):
+            if container_id == "gone":
+                raise docker.errors.NotFound("gone")
+            return {"Name": "/web", "State": {"Status": "running"}}
+
+        mock_client.api.inspect_container.side_effect = inspect
+        with patch(
+            "app.routers.containers.get_docker_client", return_value=mock_client
+        ):
+            response = client.get("/containers?full=true", headers=admin_headers)
+
+        assert response.status_code == 200
+        (item,) = response.json()
+        assert item["id"] == "abc123def456"
+        assert item["name"] == "web"
+        assert item["status"] == "running"
+        assert item["image"] == "nginx:latest"
+        assert item["attrs"]["Name"] == "/web"
+
+    def test_default_listing_skips_inspect(self, client, admin_headers):
+        """默认不 inspect，只返回列表接口的字段。"""
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [_RAW_CONTAINER]
+        with patch(
+            "app.routers.containers.get_docker_client", return_value=mock_client
+        ):
+            response = client.get("/containers", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": "abc123def456",
+                "short_id": "abc123def456",
+                "name": "web",
+                "status": "running",
+                "image": "nginx:latest",
+                "labels": {},
+                "ports": [],
+            }
+        ]
+        mock_client.api.inspect_container.assert_not_called()
+
+    def test_filters_pushed_down_to_docker(self, client, admin_headers):
+        """过滤参数原样传给 Docker，未传入的参数被忽略。"""
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = []
+        with patch(
+            "app.routers.containers.get_docker_client", return_value=mock_client
+        ):
+            response = client.get(
+                "/containers/summary?label=app=web&status=running",
+                headers=admin_headers,
+            )
+
+        assert response.status_code == 200
+        mock_client.api.containers.assert_called_once_with(
+            all=True, filters={"label": "app=web", "status": "running"}
+        )
+
+
+class TestMakeTarSingle:
+    @pytest.mark.parametrize("name", ["config.json", "配置.yaml", "n" * 150])
+    def test_readable_by_tarfile(self, name):
+        import io
+        import tarfile
+
+        data = "内容\n".encode("utf-8") * 200
+        archive = containers._make_tar_single(name, data)
+
+        assert len(archive) % 512 == 0
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            (member,) = tar.getmembers()
+            assert member.name == name
+            assert member.isfile()
+            assert member.mode == 0o644
+            assert tar.extractfile(member).read() == data
+
+
+class TestContainerPathIsDir:
+    @staticmethod
+    def _container(status_code=200, stat=None):
+        import base64
+        import json
+
+        import docker
+
+        container = MagicMock()
+        container.id = "abc"
+        response = MagicMock(headers={})
+        if stat is not None:
+            response.headers["x-docker-container-path-stat"] = base64.b64encode(
+                json.dumps(stat).encode()
+            ).decode()
+        api = container.client.api
+        api.head.return_value = response
+        if status_code == 404:
+            api._raise_for_status.side_effect = docker.errors.NotFound("missing")
+        return container
+
+    def test_directory(self):
+        container = self._container(stat={"name": "data", "mode": (1 << 31) | 0o755})
+        assert containers._container_path_is_dir(container, "/data") is True
+        container.exec_run.assert_not_called()
+
+    def test_regular_file(self):
+        container = self._container(stat={"name": "x", "mode": 0o644})
+        assert containers._container_path_is_dir(container, "/x") is False
+
+    def test_missing(self):
+        container = self._container(status_code=404)
+        assert containers._container_path_is_dir(container, "/nope") is False
+
+    def test_api_error_falls_back_to_exec(self):
+        import docker
+
+        container = self._container()
+        container.client.api._raise_for_status.side_effect = docker.errors.APIError(
+            "server error"
+        )
+        container.exec_run.return_value = (0, b"")
+
+        assert containers._container_path_is_dir(container, "/it's") is True
+        assert container.exec_run.call_args.args[0][-1] == "/it's"
+
+
+class TestListFilesViaExec:
+    @staticmethod
+    def _container(output, exit_code=0):
+        container = MagicMock()
+        container.exec_run.return_value = MagicMock(exit_code=exit_code, output=output)
+        return container
+
+    def test_directory_listing_uses_single_exec(self):
+        container = self._container(
+            b"D\n/data/a.txt|5|100|regular file\n/data/sub|4096|200|directory\n"
+        )
+        items = containers.list_files_via_exec(
+            container, "/data", [{"Destination": "/data/sub"}]
+        )
+
+        assert container.exec_run.call_count == 1
+        assert container.exec_run.call_args.args[0][-1] == "/data"
+        assert [(i["name"], i["type"], i["is_mounted"]) for i in items] == [
+            ("a.txt", "file", False),
+            ("sub", "directory", True),
+        ]
+
+    def test_find_printf_listing(self):
+        container = self._container(
+            b"P\n/data/b|3|200.5|l\n/data/a|4096|100.25|d\n"
+        )
+        items = containers.list_files_via_exec(container, "/data")
+
+        assert items == [
+            {
+                "name": "a",
+                "type": "directory",
+                "size": 4096,
+                "modified": 100,
+                "is_symlink": False,
+                "is_mounted": False,
+            },
+            {
+                "name": "b",
+                "type": "file",
+                "size": 3,
+                "modified": 200,
+                "is_symlink": True,
+                "is_mounted": False,
+            },
+        ]
+
+    def test_file_content(self):
+        container = self._container(b"F\nhello\n")
+        assert containers.list_files_via_exec(container, "/etc/x") == {
+            "content": "hello\n"
+        }
+
+    def test_file_too_large(self):
+        from fastapi import HTTPException
+
+        container = self._container(b"B\n")
+        with pytest.raises(HTTPException) as exc_info:
+            containers.list_files_via_exec(container, "/big")
+        assert exc_info.value.status_code == 400
+
+    def test_ls_listing_fallback(self):
+        container = self._container(
+            b"L\ntotal 8\n"
+            b"drwxr-xr-x  2 root root 4096 Jan  1 00:00 .\n"
+            b"-rw-r--r--  1 root root   12 Jan  1 00:00 my  file.txt\n"
+            b"lrwxrwxrwx  1 root root    4 Jan  1 00:00 ln -> /tmp\n"
+        )
+        items = containers.list_files_via_exec(container, "/data")
+
+        assert [(i["name"], i["size"], i["is_symlink"]) for i in items] == [
+            ("my file.txt", 12, False),
+            ("ln", 4, True),
+        ]
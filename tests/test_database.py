@@ -0,0 +1,30 @@
+"""数据库初始化测试。"""
+
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, inspect
+
+from app.db import database
+
+
+class TestInitDb:
+    def test_create_all_skipped_when_fingerprint_matches(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'keys.db'}")
+
+        database.init_db(engine)
+        with patch.object(database.Base.metadata, "create_all") as create_all:
+            database.init_db(engine)
+
+        create_all.assert_not_called()
+        assert "api_keys" in inspect(engine).get_table_names()
+
+    def test_new_database_gets_tables(self, tmp_path):
+        first = create_engine(f"sqlite:///{tmp_path / 'a.db'}")
+        database.init_db(first)
+
+        second = create_engine(f"sqlite:///{tmp_path / 'b.db'}")
+        database.init_db(second)
+
+        assert set(inspect(second).get_table_names()) == set(
+            inspect(first).get_table_names()
+        )
@@ -0,0 +1,169 @@
+"""Docker 事件广播测试。"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from app.services.docker_monitor import ConnectionManager
+
+
+class TestBroadcast:
+    def test_failed_connections_removed(self):
+        manager = ConnectionManager()
+        alive = AsyncMock()
+        broken = AsyncMock()
+        broken.send_text.side_effect = RuntimeError("closed")
+
+        async def run():
+            manager.subscribe(alive)
+            manager.subscribe(broken)
+            await manager.broadcast({"Action": "start", "名称": "web"})
+            await asyncio.sleep(0.01)
+            remaining = set(manager.active_connections)
+            manager.disconnect(alive)
+            return remaining
+
+        assert asyncio.run(run()) == {alive}
+        alive.send_text.assert_awaited_once_with('{"Action":"start","名称":"web"}')
+
+    def test_payload_encoded_once(self, monkeypatch):
+        from app.services import docker_monitor
+
+        calls = []
+        monkeypatch.setattr(
+            docker_monitor, "dump_json", lambda m: calls.append(m) or b"{}"
+        )
+        manager = ConnectionManager()
+
+        async def run():
+            for _ in range(3):
+                manager.subscribe(AsyncMock())
+            await manager.broadcast({"Action": "die"})
+            for websocket in list(manager.active_connections):
+                manager.disconnect(websocket)
+
+        asyncio.run(run())
+        assert calls == [{"Action": "die"}]
+
+    def test_slow_client_does_not_block_others(self, monkeypatch):
+        from app.services import docker_monitor
+
+        monkeypatch.setattr(docker_monitor, "SUBSCRIBER_QUEUE_MAXSIZE", 2)
+        manager = ConnectionManager()
+        fast = AsyncMock()
+        slow = AsyncMock()
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def blocked_send(payload):
+                await gate.wait()
+
+            slow.send_text.side_effect = blocked_send
+            manager.subscribe(fast)
+            manager.subscribe(slow)
+            for i in range(5):
+                await manager.broadcast({"id": i})
+                await asyncio.sleep(0)
+            backlog = manager.active_connections[slow].queue.qsize()
+            gate.set()
+            for websocket in list(manager.active_connections):
+                manager.disconnect(websocket)
+            return backlog
+
+        assert asyncio.run(run()) <= 2
+        assert fast.send_text.await_count == 5
+
+    def test_disconnect_unknown_connection_is_noop(self):
+        manager = ConnectionManager()
+        manager.disconnect(AsyncMock())
+        assert manager.active_connections == {}
+
+
+class TestEventQueue:
+    def test_full_queue_drops_oldest(self):
+        from app.services.docker_monitor import _enqueue_event
+
+        queue = asyncio.Queue(maxsize=2)
+        for i in range(3):
+            _enqueue_event(queue, {"id": i})
+
+        assert [queue.get_nowait()["id"] for _ in range(2)] == [1, 2]
+
+    def test_events_broadcast_in_order(self, monkeypatch):
+        from app.services import docker_monitor
+
+        received = []
+
+        async def fake_broadcast(event):
+            received.append(event["id"])
+
+        monkeypatch.setattr(docker_monitor.manager, "broadcast", fake_broadcast)
+
+        async def run():
+            queue = asyncio.Queue()
+            task = asyncio.create_task(docker_monitor.broadcast_events(queue))
+            for i in range(3):
+                queue.put_nowait({"id": i})
+            await asyncio.sleep(0.01)
+            task.cancel()
+
+        asyncio.run(run())
+        assert received == [0, 1, 2]
+
+
+class TestEventListener:
+    def test_ignored_prefixes_filtered(self, monkeypatch):
+        from unittest.mock import MagicMock
+
+        from app.services import docker_monitor
+
+        events = [
+            {"Action": "exec_start: sh -c true"},
+            {"Action": "start"},
+            {"Action": "exec_die"},
+            {"Action": "die"},
+        ]
+        fake_client = MagicMock()
+        fake_client.events.return_value = iter(events)
+        monkeypatch.setattr(docker_monitor.docker, "from_env", lambda: fake_client)
+        monkeypatch.setattr(
+            docker_monitor, "_IGNORED_EVENT_PREFIXES", ("exec_start", "exec_die")
+        )
+        monkeypatch.setattr(docker_monitor.time, "sleep", lambda seconds: None)
+        loop = MagicMock()
+        loop.is_closed.side_effect = [False, True]
+
+        docker_monitor.docker_event_listener(loop, "queue")
+
+        forwarded = [c.args[2]["Action"] for c in loop.call_soon_threadsafe.mock_calls]
+        assert forwarded == ["start", "die"]
+        fake_client.close.assert_called_once()
+
+    def test_reconnects_with_backoff(self, monkeypatch, caplog):
+        from unittest.mock import MagicMock
+
+        from app.services import docker_monitor
+
+        fake_client = MagicMock()
+        fake_client.events.side_effect = [
+            ConnectionError("down"),
+            ConnectionError("down"),
+            ConnectionError("down"),
+            iter([{"Action": "start"}]),
+        ]
+        monkeypatch.setattr(docker_monitor.docker, "from_env", lambda: fake_client)
+        monkeypatch.setattr(docker_monitor.random, "uniform", lambda a, b: 0)
+        sleeps = []
+        monkeypatch.setattr(docker_monitor.time, "sleep", sleeps.append)
+        loop = MagicMock()
+        loop.is_closed.side_effect = [False] * 4 + [True]
+
+        with caplog.at_level("INFO", logger=docker_monitor.logger.name):
+            docker_monitor.docker_event_listener(loop, "queue")
+
+        assert sleeps == [1, 2, 4, 1]
+        assert loop.call_soon_threadsafe.call_count == 1
+        output = caplog.text
+        assert output.count("Error in docker event listener") == 1
+        assert "reconnected" in output
+        assert fake_client.close.call_count == 4
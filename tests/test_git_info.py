@@ -0,0 +1,51 @@
+"""git 版本读取测试。"""
+
+from app.core import git_info
+
+
+class TestReadGitHead:
+    def test_branch_ref(self, tmp_path):
+        (tmp_path / "HEAD").write_text("ref: refs/heads/feature/x\n")
+        (tmp_path / "refs" / "heads" / "feature").mkdir(parents=True)
+        (tmp_path / "refs" / "heads" / "feature" / "x").write_text("b" * 40 + "\n")
+
+        assert git_info.read_git_head(str(tmp_path)) == ("feature/x", "b" * 40)
+
+    def test_packed_ref(self, tmp_path):
+        (tmp_path / "HEAD").write_text("ref: refs/heads/main\n")
+        (tmp_path / "packed-refs").write_text(
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            + "c" * 40
+            + " refs/heads/main\n"
+        )
+
+        assert git_info.read_git_head(str(tmp_path)) == ("main", "c" * 40)
+
+    def test_detached_and_unborn(self, tmp_path):
+        (tmp_path / "HEAD").write_text("d" * 40 + "\n")
+        assert git_info.read_git_head(str(tmp_path)) == ("detached", "d" * 40)
+
+        (tmp_path / "HEAD").write_text("ref: refs/heads/main\n")
+        assert git_info.read_git_head(str(tmp_path)) == ("main", None)
+
+    def test_not_a_repository(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(git_info, "REPO_DIR", str(tmp_path))
+        info = git_info.read_git_version()
+        assert info["commit_message"] == "Not a git repository"
+        assert info["short_hash"] == "unknown"
+
+
+class TestBuildGitVersion:
+    def test_build_time_env_skips_repository(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(git_info.config, "GIT_COMMIT", "e" * 40)
+        monkeypatch.setattr(git_info.config, "GIT_BRANCH", "release")
+        monkeypatch.setattr(git_info, "REPO_DIR", str(tmp_path))
+        git_info.build_git_version.cache_clear()
+        try:
+            info = git_info.read_git_version()
+        finally:
+            git_info.build_git_version.cache_clear()
+
+        assert info["branch"] == "release"
+        assert info["commit_hash"] == "e" * 40
+        assert info["short_hash"] == "e" * 7
@@ -0,0 +1,131 @@
+"""镜像路由器测试。"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.routers import images
+
+
+@pytest.fixture(autouse=True)
+def clear_used_ids_cache():
+    images._used_ids_cache = None
+    yield
+    images._used_ids_cache = None
+
+
+def _mock_client():
+    mock_client = MagicMock()
+    mock_client.api.images.return_value = [
+        {
+            "Id": "sha256:" + "a" * 64,
+            "RepoTags": ["nginx:latest", "<none>:<none>"],
+            "Created": 1704067200,
+            "Size": 10,
+            "Labels": None,
+        }
+    ]
+    mock_client.api.containers.return_value = [{"ImageID": "sha256:" + "a" * 64}]
+    return mock_client
+
+
+class TestUsedImageIdsCache:
+    def test_list_images_reuses_used_ids(self, client, admin_headers):
+        """TTL 内重复请求只列举一次容器。"""
+        mock_client = _mock_client()
+        with patch("app.routers.images.get_docker_client", return_value=mock_client):
+            first = client.get("/images", headers=admin_headers)
+            second = client.get("/images", headers=admin_headers)
+
+        assert first.status_code == 200
+        assert first.json()[0]["in_use"] is True
+        assert second.json() == first.json()
+        mock_client.api.containers.assert_called_once_with(all=True)
+
+
+class TestListImages:
+    def test_built_from_summary_without_inspect(self, client, admin_headers):
+        """镜像列表直接由摘要组装，字段格式与 inspect 结果保持一致。"""
+        mock_client = _mock_client()
+        with patch("app.routers.images.get_docker_client", return_value=mock_client):
+            response = client.get("/images", headers=admin_headers)
+
+        assert response.json() == [
+            {
+                "id": "sha256:" + "a" * 64,
+                "tags": ["nginx:latest"],
+                "created": "2024-01-01T00:00:00Z",
+                "size": 10,
+                "labels": {},
+                "short_id": "sha256:aaaaaaaaaaaa",
+                "in_use": True,
+            }
+        ]
+        mock_client.images.list.assert_not_called()
+        mock_client.images.get.assert_not_called()
+
+
+class TestPullImageStream:
+    def test_streams_progress_then_complete(self, client, admin_headers):
+        import json
+
+        mock_client = MagicMock()
+        mock_client.api.pull.return_value = iter(
+            [{"status": "Pulling fs layer", "id": "l1"}, {"status": "Downloaded"}]
+        )
+        mock_client.images.get.return_value = MagicMock(
+            id="sha256:bbb", tags=["alpine:latest"]
+        )
+        with patch("app.routers.images.get_docker_client", return_value=mock_client):
+            response = client.post(
+                "/images/pull?stream=true",
+                json={"image": "alpine"},
+                headers=admin_headers,
+            )
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0] == {"status": "Pulling fs layer", "id": "l1"}
+        assert lines[-1] == {
+            "status": "complete",
+            "id": "sha256:bbb",
+            "tags": ["alpine:latest"],
+        }
+        mock_client.images.get.assert_called_once_with("alpine:latest")
+
+    def test_daemon_error_ends_stream(self, client, admin_headers):
+        import json
+
+        mock_client = MagicMock()
+        mock_client.api.pull.return_value = iter([{"error": "not found"}])
+        with patch("app.routers.images.get_docker_client", return_value=mock_client):
+            response = client.post(
+                "/images/pull?stream=true",
+                json={"image": "nope", "tag": "1"},
+                headers=admin_headers,
+            )
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{"status": "error", "error": "not found"}]
+        mock_client.images.get.assert_not_called()
+
+
+class TestGetImageDetails:
+    def test_inspect_result_extended_in_place(self, client, admin_headers):
+        image_id = "sha256:" + "a" * 64
+        mock_client = _mock_client()
+        mock_client.api.inspect_image.return_value = {
+            "Id": image_id,
+            "RepoTags": ["nginx:latest"],
+            "Size": 10,
+        }
+        with patch("app.routers.images.get_docker_client", return_value=mock_client):
+            response = client.get("/images/nginx:latest", headers=admin_headers)
+
+        data = response.json()
+        assert data["id"] == image_id
+        assert data["short_id"] == "sha256:aaaaaaaaaaaa"
+        assert data["tags"] == ["nginx:latest"]
+        assert data["in_use"] is True
+        assert data["Size"] == 10
+        mock_client.images.get.assert_not_called()
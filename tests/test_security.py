@@ -23,6 +23,15 @@ class TestAPIAuthentication:
         response = client.get("/containers", headers={"X-API-Key": key_str})
         assert response.status_code not in (401, 403)
 
+    def test_deleted_api_key_is_rejected_immediately(self, client, admin_headers):
+        """删除 API Key 后缓存立即失效，不能继续通过认证。"""
+        client.post("/admin/keys", headers=admin_headers, json={"key": "cached-key"})
+        headers = {"X-API-Key": "cached-key"}
+        assert client.get("/admin/keys", headers=headers).status_code == 200
+
+        client.delete("/admin/keys/cached-key", headers=admin_headers)
+        assert client.get("/admin/keys", headers=headers).status_code == 401
+
 
 class TestAdminAuthentication:
     def test_missing_admin_headers_returns_401(self, client):
@@ -38,6 +47,14 @@ class TestAdminAuthentication:
         )
         assert response.status_code == 401
 
+    def test_non_ascii_admin_user_returns_401(self, client):
+        """非 ASCII 的用户名请求头应返回 401 而非 500。"""
+        response = client.get(
+            "/admin/keys",
+            headers={"X-Admin-User": "adm\xe9".encode("latin-1"), "X-Admin-Pass": "x"},
+        )
+        assert response.status_code == 401
+
     def test_valid_admin_credentials(self, client, admin_headers):
         """正确的管理员凭据应通过认证。"""
         response = client.get("/admin/keys", headers=admin_headers)
@@ -80,6 +97,18 @@ class TestAdminAPIKeys:
         assert response.status_code == 200
         assert response.json() == []
 
+    def test_list_keys_returns_columns(self, client, admin_headers):
+        """列表接口返回 id、key、note、created_at 字段。"""
+        client.post(
+            "/admin/keys", headers=admin_headers, json={"key": "listed", "note": "n"}
+        )
+        response = client.get("/admin/keys", headers=admin_headers)
+        assert response.status_code == 200
+        (item,) = response.json()
+        assert set(item) == {"id", "key", "note", "created_at"}
+        assert item["key"] == "listed"
+        assert item["note"] == "n"
+
     def test_add_key_auto_generate(self, client, admin_headers):
         """添加密钥时若未指定 key 则自动生成。"""
         response = client.post("/admin/keys", headers=admin_headers, json={})
@@ -108,6 +137,60 @@ class TestAdminAPIKeys:
         )
         assert response.status_code == 400
 
+    def test_add_keys_bulk_skips_existing(self, client, admin_headers):
+        """批量添加时跳过已存在和重复的 key。"""
+        client.post("/admin/keys", headers=admin_headers, json={"key": "bulk-old"})
+        response = client.post(
+            "/admin/keys/bulk",
+            headers=admin_headers,
+            json={
+                "keys": [
+                    {"key": "bulk-old"},
+                    {"key": "bulk-new", "note": "批量"},
+                    {"key": "bulk-new"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["keys"] == [{"key": "bulk-new", "note": "批量"}]
+        assert sorted(data["skipped"]) == ["bulk-new", "bulk-old"]
+        listed = client.get("/admin/keys", headers=admin_headers).json()
+        assert {k["key"] for k in listed} == {"bulk-old", "bulk-new"}
+
+    def test_add_keys_bulk_requires_list(self, client, admin_headers):
+        """keys 缺失或为空时返回 400。"""
+        response = client.post("/admin/keys/bulk", headers=admin_headers, json={})
+        assert response.status_code == 400
+
+    def test_add_keys_bulk_inserted_in_chunks(self, client, admin_headers, monkeypatch):
+        """超过单批大小时分批写入，全部 key 都能插入。"""
+        from app.routers import admin
+
+        monkeypatch.setattr(admin, "_BULK_INSERT_CHUNK", 2)
+        keys = [{"key": f"chunk-{i}"} for i in range(5)]
+        response = client.post(
+            "/admin/keys/bulk", headers=admin_headers, json={"keys": keys}
+        )
+        assert response.status_code == 200
+        assert response.json()["keys"] == [
+            {"key": k["key"], "note": None} for k in keys
+        ]
+
+    def test_add_keys_bulk_rejects_oversized_batch(
+        self, client, admin_headers, monkeypatch
+    ):
+        """超过单次上限时返回 400。"""
+        from app.routers import admin
+
+        monkeypatch.setattr(admin, "_BULK_KEYS_MAX", 2)
+        response = client.post(
+            "/admin/keys/bulk",
+            headers=admin_headers,
+            json={"keys": [{"key": "a"}, {"key": "b"}, {"key": "c"}]},
+        )
+        assert response.status_code == 400
+
     def test_delete_key(self, client, admin_headers):
         """删除已存在的密钥。"""
         client.post("/admin/keys", headers=admin_headers, json={"key": "to-delete"})
@@ -200,3 +283,48 @@ class TestAdminNodes:
         """删除不存在的节点应返回 404。"""
         response = client.delete("/admin/nodes/fake-id", headers=admin_headers)
         assert response.status_code == 404
+
+
+class TestAdminKeyPropagation:
+    @staticmethod
+    def _add_node(client, admin_headers, name, base_url):
+        return client.post(
+            "/admin/nodes",
+            headers=admin_headers,
+            json={
+                "name": name,
+                "base_url": base_url,
+                "admin_user": "u",
+                "admin_pass": "p",
+            },
+        ).json()
+
+    def test_add_key_propagates_to_all_nodes(
+        self, client, admin_headers, monkeypatch
+    ):
+        """apply_all 时向每个节点并发同步，单个节点失败不影响其他节点。"""
+        import httpx
+        from app.routers import admin
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "down.local":
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json={})
+
+        monkeypatch.setattr(
+            admin,
+            "_propagation_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        self._add_node(client, admin_headers, "up", "http://up.local/")
+        self._add_node(client, admin_headers, "down", "http://down.local")
+
+        response = client.post(
+            "/admin/keys",
+            headers=admin_headers,
+            json={"key": "propagated", "apply_all": True},
+        )
+        assert response.status_code == 200
+        results = {r["node"]: r for r in response.json()["propagation"]}
+        assert results["up"] == {"node": "up", "status": 200}
+        assert "error" in results["down"]
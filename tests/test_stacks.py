@@ -0,0 +1,33 @@
+"""堆栈路由器测试。"""
+
+from unittest.mock import MagicMock, patch
+
+
+def _raw(container_id, name):
+    return {
+        "Id": container_id,
+        "Names": [f"/{name}"],
+        "Image": "nginx",
+        "State": "running",
+        "Labels": {"com.docker.compose.project": "web"},
+        "Ports": [],
+    }
+
+
+class TestGetStackContainers:
+    def test_merges_compose_and_swarm_labels(self, client, admin_headers):
+        """两个标签的查询结果合并，并按 Id 去重。"""
+        by_label = {
+            "com.docker.compose.project=web": [_raw("a", "one"), _raw("b", "two")],
+            "com.docker.stack.namespace=web": [_raw("b", "two"), _raw("c", "three")],
+        }
+        mock_client = MagicMock()
+        mock_client.api.containers.side_effect = lambda all, filters: by_label[
+            filters["label"]
+        ]
+        with patch("app.routers.stacks.get_docker_client", return_value=mock_client):
+            response = client.get("/stacks/web/containers", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert [c["name"] for c in response.json()] == ["one", "two", "three"]
+        assert mock_client.api.containers.call_count == 2
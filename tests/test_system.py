@@ -0,0 +1,365 @@
+"""系统路由器测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.routers import system
+
+
+@pytest.fixture(autouse=True)
+def clear_git_version_cache():
+    system._git_version_cache = None
+    yield
+    system._git_version_cache = None
+
+
+_GIT_INFO = {
+    "branch": "main",
+    "commit_hash": "a" * 40,
+    "short_hash": "a" * 7,
+    "commit_message": "init",
+    "author": "dev",
+    "date": "2024-01-01T00:00:00",
+}
+
+
+class TestGitVersionCache:
+    def test_cached_until_refresh(self, client, admin_headers):
+        with patch.object(
+            system, "read_git_version", return_value=_GIT_INFO
+        ) as read:
+            first = client.get("/git/version", headers=admin_headers)
+            second = client.get("/git/version", headers=admin_headers)
+            assert read.call_count == 1
+
+            refreshed = client.post("/git/version/refresh", headers=admin_headers)
+            assert read.call_count == 2
+
+        assert first.json() == second.json() == refreshed.json() == _GIT_INFO
+
+    def test_reread_when_head_changes(self, client, admin_headers):
+        with (
+            patch.object(system, "read_git_version", return_value=_GIT_INFO) as read,
+            patch.object(system, "_git_cache_key", return_value=("a",)) as key,
+        ):
+            client.get("/git/version", headers=admin_headers)
+            client.get("/git/version", headers=admin_headers)
+            assert read.call_count == 1
+
+            key.return_value = ("b",)
+            client.get("/git/version", headers=admin_headers)
+            assert read.call_count == 2
+
+    def test_cache_key_tracks_ref_file(self, tmp_path, monkeypatch):
+        import os
+
+        git_dir = tmp_path / ".git"
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        ref = git_dir / "refs" / "heads" / "main"
+        ref.write_text("a" * 40 + "\n")
+        monkeypatch.setattr(system, "REPO_DIR", str(tmp_path))
+
+        before = system._git_cache_key()
+        os.utime(ref, ns=(0, 10**18))
+        assert system._git_cache_key() != before
+
+    def test_errors_not_cached(self, client, admin_headers):
+        error = {**_GIT_INFO, "branch": "error"}
+        with patch.object(system, "read_git_version", return_value=error) as read:
+            client.get("/git/version", headers=admin_headers)
+            client.get("/git/version", headers=admin_headers)
+
+        assert read.call_count == 2
+
+
+class TestCpuSampling:
+    def test_usage_reads_sampled_value(self, monkeypatch):
+        import asyncio
+
+        monkeypatch.setattr(system, "_last_cpu_percent", 42.5)
+        with patch.object(system.psutil, "cpu_percent") as cpu_percent:
+            usage = asyncio.run(system.collect_system_usage())
+
+        assert usage["cpu"]["percent"] == 42.5
+        cpu_percent.assert_not_called()
+
+    def test_sampler_updates_value(self, monkeypatch):
+        import asyncio
+
+        monkeypatch.setattr(system, "_last_cpu_percent", None)
+        monkeypatch.setattr(system, "_CPU_SAMPLE_INTERVAL", 0)
+
+        async def run_briefly():
+            task = asyncio.create_task(system.cpu_sampler())
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        with patch.object(system.psutil, "cpu_percent", return_value=7.0):
+            asyncio.run(run_briefly())
+
+        assert system.get_cpu_percent() == 7.0
+
+
+class TestUsageEtag:
+    def test_not_modified_when_etag_matches(self, client, admin_headers):
+        usage = {"cpu": {"percent": 1.0, "count": 1}, "disk": [], "gpu": []}
+        with patch.object(system, "collect_system_usage", return_value=usage):
+            first = client.get("/usage", headers=admin_headers)
+            etag = first.headers["etag"]
+            second = client.get(
+                "/usage", headers={**admin_headers, "If-None-Match": etag}
+            )
+            changed = client.get(
+                "/usage", headers={**admin_headers, "If-None-Match": '"stale"'}
+            )
+
+        assert first.json() == usage
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        assert changed.status_code == 200
+
+
+class TestGpuCache:
+    def test_gpus_sampled_once_per_ttl(self, monkeypatch):
+        import asyncio
+        from unittest.mock import MagicMock
+
+        gpu = MagicMock(
+            id=0,
+            load=0.5,
+            memoryTotal=100,
+            memoryUsed=50,
+            memoryFree=50,
+            temperature=60,
+        )
+        gpu.name = "GPU"
+        fake_gputil = MagicMock()
+        fake_gputil.getGPUs.return_value = [gpu]
+        monkeypatch.setattr(system, "load_gputil", lambda: fake_gputil)
+        monkeypatch.setattr(system, "_gpu_cache", None)
+
+        async def sample_concurrently():
+            return await asyncio.gather(
+                system._get_gpus_cached(), system._get_gpus_cached()
+            )
+
+        first, second = asyncio.run(sample_concurrently())
+
+        assert first == second
+        assert first[0]["load"] == 50
+        fake_gputil.getGPUs.assert_called_once()
+
+    def test_sampler_feeds_cache(self, monkeypatch):
+        import asyncio
+        from unittest.mock import MagicMock
+
+        fake_gputil = MagicMock()
+        fake_gputil.getGPUs.return_value = []
+        monkeypatch.setattr(system, "load_gputil", lambda: fake_gputil)
+        monkeypatch.setattr(system, "_gpu_cache", None)
+
+        async def run_briefly():
+            task = asyncio.create_task(system.gpu_sampler())
+            await asyncio.sleep(0.05)
+            gpus = await system._get_gpus_cached()
+            task.cancel()
+            return gpus
+
+        assert asyncio.run(run_briefly()) == []
+        fake_gputil.getGPUs.assert_called_once()
+
+    def test_sampler_exits_without_gputil(self, monkeypatch):
+        import asyncio
+
+        monkeypatch.setattr(system, "load_gputil", lambda: None)
+        asyncio.run(asyncio.wait_for(system.gpu_sampler(), timeout=1))
+
+
+class TestDiskCache:
+    def test_partitions_and_usage_cached(self, monkeypatch):
+        import asyncio
+        from collections import namedtuple
+        from unittest.mock import AsyncMock, MagicMock
+
+        Partition = namedtuple("Partition", "device mountpoint fstype")
+        fake_psutil = MagicMock(wraps=system.psutil)
+        fake_psutil.disk_partitions.return_value = [
+            Partition("/dev/sda1", "/", "ext4"),
+            Partition("/dev/loop0", "/snap/core", "squashfs"),
+        ]
+        fake_psutil.disk_usage.return_value = MagicMock(
+            total=100, used=40, free=60, percent=40.0
+        )
+        monkeypatch.setattr(system, "psutil", fake_psutil)
+        monkeypatch.setattr(system, "_partitions_cache", None)
+        monkeypatch.setattr(system, "_disk_usage_cache", {})
+        monkeypatch.setattr(system, "_get_gpus_cached", AsyncMock(return_value=[]))
+        monkeypatch.setattr(system, "HOST_MONITOR_ROOT", "/")
+
+        first = asyncio.run(system.collect_system_usage())
+        second = asyncio.run(system.collect_system_usage())
+
+        assert first["disk"] == second["disk"]
+        assert [d["mountpoint"] for d in first["disk"]] == ["/"]
+        fake_psutil.disk_partitions.assert_called_once()
+        fake_psutil.disk_usage.assert_called_once_with("/")
+
+
+class TestListStacks:
+    def test_counts_from_label_filtered_summaries(self, client, admin_headers):
+        from unittest.mock import MagicMock
+
+        project = "com.docker.compose.project"
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [
+            {"Labels": {project: "web"}},
+            {"Labels": {project: "web"}},
+            {"Labels": {project: "db"}},
+        ]
+        with patch("app.routers.system.get_docker_client", return_value=mock_client):
+            response = client.get("/stacks", headers=admin_headers)
+
+        assert response.json() == [
+            {"name": "db", "container_count": 1},
+            {"name": "web", "container_count": 2},
+        ]
+        mock_client.api.containers.assert_called_once_with(
+            all=True, filters={"label": project}
+        )
+
+
+class TestSystemInfo:
+    def test_sections_fail_independently(self, client, admin_headers):
+        from unittest.mock import MagicMock
+
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [
+            {"State": "running"},
+            {"State": "exited"},
+        ]
+        mock_client.api.images.return_value = [{}, {}, {}]
+        with (
+            patch("app.routers.system.get_docker_client", return_value=mock_client),
+            patch.object(system, "get_git_version", side_effect=RuntimeError("boom")),
+            patch.object(system, "collect_system_usage", return_value={"cpu": {}}),
+        ):
+            response = client.get("/info", headers=admin_headers)
+
+        assert response.json() == {
+            "docker": {
+                "containers": {"total": 2, "running": 1, "stopped": 1},
+                "images": 3,
+            },
+            "git": {"error": "boom"},
+            "system": {"cpu": {}},
+        }
+
+
+class TestHostUsedPorts:
+    def test_ports_read_from_snapshot(self, monkeypatch):
+        from unittest.mock import MagicMock
+
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [
+            {
+                "Id": "web",
+                "State": "running",
+                "HostConfig": {"NetworkMode": "bridge"},
+                "Ports": [
+                    {"PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+                    {"PrivatePort": 443, "Type": "tcp"},
+                ],
+            },
+            {"Id": "host", "State": "running", "HostConfig": {"NetworkMode": "host"}},
+        ]
+        proxy = mock_client.containers.prepare_model.return_value
+        proxy.exec_run.return_value = (1, b"")
+        monkeypatch.setattr(system, "get_docker_client", lambda: mock_client)
+        monkeypatch.setattr(system.os.path, "exists", lambda path: False)
+
+        assert 8080 in system._get_host_used_ports()
+        mock_client.containers.list.assert_not_called()
+        mock_client.containers.prepare_model.assert_called_once()
+        assert proxy.exec_run.call_count == 4
+
+
+class TestParseProcNet:
+    _TCP = (
+        b"  sl  local_address rem_address   st tx_queue rx_queue\n"
+        b"   0: 00000000:0016 00000000:0000 0A 00000000:00000000 00:00000000\n"
+        b"   1: 0100007F:1F90 0100007F:C350 01 00000000:00000000 00:00000000\n"
+        b"   2: 00000000000000000000000000000000:01BB "
+        b"00000000000000000000000000000000:0000 0A 00000000:00000000\n"
+    )
+
+    def test_tcp_only_listening(self):
+        assert system._parse_proc_net(self._TCP, is_tcp=True) == {22, 443}
+
+    def test_udp_all_ports(self):
+        assert system._parse_proc_net(self._TCP, is_tcp=False) == {22, 8080, 443}
+
+
+class TestAvailablePorts:
+    def test_used_ports_cached_between_requests(
+        self, client, admin_headers, monkeypatch
+    ):
+        from unittest.mock import MagicMock
+
+        probe = MagicMock(return_value={80, 443})
+        monkeypatch.setattr(system, "_get_host_used_ports", probe)
+        monkeypatch.setattr(system, "_used_ports_cache", None)
+        monkeypatch.setattr(system, "BROWSER_BLOCKED_PORTS", [1])
+
+        first = client.get("/ports/available", headers=admin_headers)
+        second = client.get("/ports/available", headers=admin_headers)
+
+        assert first.json() == second.json()
+        assert first.json()["ranges"] == ["2-79", "81-442", "444-65535"]
+        probe.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "used, expected",
+        [
+            (set(), (65535, ["1-65535"])),
+            ({0, 1, 3, 65535}, (65532, ["2-2", "4-65534"])),
+            ({70000, 22}, (65534, ["1-21", "23-65535"])),
+        ],
+    )
+    def test_ranges_from_bitmap(self, used, expected):
+        assert system._available_port_ranges(used) == expected
+
+
+class TestSelfContainerInfo:
+    def test_inspect_cached(self, client, admin_headers):
+        from unittest.mock import MagicMock
+
+        mock_client = MagicMock()
+        mock_client.api.inspect_container.return_value = {"Id": "self123"}
+        with (
+            patch("app.routers.system.get_docker_client", return_value=mock_client),
+            patch("app.core.utils.get_current_container_id", return_value="self"),
+            patch.object(system, "get_current_container_id", return_value="self"),
+        ):
+            first = client.get("/self", headers=admin_headers)
+            second = client.get("/self", headers=admin_headers)
+
+        assert first.json() == second.json() == {"Id": "self123"}
+        mock_client.api.inspect_container.assert_called_once_with("self")
+
+    def test_not_found(self, client, admin_headers):
+        import docker
+        from unittest.mock import MagicMock
+
+        mock_client = MagicMock()
+        mock_client.api.inspect_container.side_effect = docker.errors.NotFound("x")
+        with (
+            patch("app.routers.system.get_docker_client", return_value=mock_client),
+            patch("app.core.utils.get_current_container_id", return_value="self"),
+            patch.object(system, "get_current_container_id", return_value="self"),
+        ):
+            response = client.get("/self", headers=admin_headers)
+
+        assert response.status_code == 404
@@ -1,5 +1,14 @@
-from unittest.mock import MagicMock
-from app.core.utils import process_container_summary
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core import utils
+from app.core.utils import (
+    dump_json,
+    parse_docker_run_command,
+    process_container_summary,
+    process_raw_container_summary,
+)
 
 
 class TestProcessContainerSummary:
@@ -96,3 +105,206 @@ class TestProcessContainerSummary:
         result = process_container_summary(container, self_id="abc123")
 
         assert result["is_self"] is True
+
+    def test_is_self_different_container(self):
+        container = MagicMock()
+        container.id = "abc123def456789"
+        container.name = "test"
+        container.status = "running"
+        container.labels = {}
+        container.attrs = {"Image": "alpine", "Ports": []}
+        container.image.tags = ["alpine:latest"]
+
+        result = process_container_summary(container, self_id="abc124")
+
+        assert result["is_self"] is False
+
+
+class TestProcessRawContainerSummary:
+    def test_raw_summary(self):
+        raw = {
+            "Id": "abc123def456",
+            "Names": ["/web-server"],
+            "Image": "nginx:latest",
+            "State": "running",
+            "Labels": {"com.docker.compose.project": "myapp"},
+            "Ports": [
+                {"PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+                {"PrivatePort": 443, "Type": "tcp"},
+            ],
+        }
+
+        result = process_raw_container_summary(raw, self_id="abc123")
+
+        assert result == {
+            "id": "abc123def456",
+            "name": "web-server",
+            "status": "running",
+            "stack": "myapp",
+            "image": "nginx:latest",
+            "ports": "8080->80/tcp",
+            "ports_list": [
+                {"public_port": 8080, "private_port": 80, "type": "tcp"},
+                {"public_port": None, "private_port": 443, "type": "tcp"},
+            ],
+            "is_self": True,
+        }
+
+
+class TestDumpJson:
+    def test_matches_stdlib_output(self):
+        """orjson 与标准库回退产生相同的紧凑 UTF-8 JSON。"""
+        data = [{"name": "网站", "labels": {"a": "1"}, "ports": [], "ok": True}]
+        expected = dump_json(data)
+        with patch.object(utils, "orjson", None):
+            assert dump_json(data) == expected
+
+
+class TestEtagMatches:
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, False),
+            ('"abc"', True),
+            ('W/"abc"', True),
+            ('"x", "abc"', True),
+            ("*", True),
+            ('"abcd"', False),
+        ],
+    )
+    def test_if_none_match(self, header, expected):
+        assert utils.etag_matches(header, '"abc"') is expected
+
+
+class TestContainersSnapshot:
+    def test_snapshot_cached_until_invalidated(self):
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [{"Id": "abc"}]
+
+        first = utils.get_containers_snapshot(mock_client)
+        assert utils.get_containers_snapshot(mock_client) is first
+        mock_client.api.containers.assert_called_once_with(all=True)
+
+        utils.invalidate_containers_snapshot()
+        utils.get_containers_snapshot(mock_client)
+        assert mock_client.api.containers.call_count == 2
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_result(self):
+        import asyncio
+
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        async def run():
+            flight = utils.SingleFlight()
+            results = await asyncio.gather(*(flight.do("k", work) for _ in range(3)))
+            # 上一次调用完成后不再合并
+            return results, await flight.do("k", work)
+
+        results, later = asyncio.run(run())
+        assert results == [1, 1, 1]
+        assert later == 2
+
+    def test_exception_propagates_to_all_callers(self):
+        import asyncio
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        async def run():
+            flight = utils.SingleFlight()
+            return await asyncio.gather(
+                flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+            )
+
+        assert [str(e) for e in asyncio.run(run())] == ["boom", "boom"]
+
+
+class TestGetDockerClient:
+    def test_client_is_shared_and_closed(self, monkeypatch):
+        """多次获取返回同一个客户端，关闭后重新创建。"""
+        from app.core import utils
+
+        created = []
+
+        def fake_from_env(**kwargs):
+            created.append(MagicMock())
+            return created[-1]
+
+        monkeypatch.setattr(utils, "_docker_client", None)
+        monkeypatch.setattr(utils.docker, "from_env", fake_from_env)
+
+        first = utils.get_docker_client()
+        assert utils.get_docker_client() is first
+        assert len(created) == 1
+
+        utils.close_docker_client()
+        first.close.assert_called_once()
+        assert utils.get_docker_client() is not first
+        assert len(created) == 2
+
+
+class TestParseDockerRunCommand:
+    def test_common_options(self):
+        params = parse_docker_run_command(
+            "docker run -dit --rm -p 8080:80 -p127.0.0.1:443:443 -e A=1 "
+            "-v /a:/b --name=web --restart always nginx sh -c 'echo hi'"
+        )
+
+        assert params["image"] == "nginx"
+        assert params["command"] == ["sh", "-c", "echo hi"]
+        assert params["detach"] and params["stdin_open"] and params["tty"]
+        assert params["auto_remove"] is True
+        assert params["name"] == "web"
+        assert params["ports"] == {"80/tcp": 8080, "443/tcp": ("127.0.0.1", 443)}
+        assert params["environment"] == {"A": "1"}
+        assert params["volumes"] == ["/a:/b"]
+        assert params["restart_policy"] == {"Name": "always"}
+
+    def test_options_after_image_belong_to_command(self):
+        params = parse_docker_run_command("run alpine ls -la")
+        assert params["image"] == "alpine"
+        assert params["command"] == ["ls", "-la"]
+        assert params["detach"] is False
+
+    @pytest.mark.parametrize(
+        "cmd", ["docker run --unknown nginx", "docker run --name", "docker run -d"]
+    )
+    def test_invalid_commands_raise_value_error(self, cmd):
+        with pytest.raises(ValueError):
+            parse_docker_run_command(cmd)
+
+    def test_cached_result_not_shared_with_caller(self):
+        cmd = "docker run -d -p 80 -e A=1 --restart always nginx"
+        first = parse_docker_run_command(cmd)
+        first["ports"]["81/tcp"] = None
+        first["environment"].clear()
+        first["restart_policy"]["Name"] = "no"
+        first.pop("image")
+
+        second = parse_docker_run_command(cmd)
+        assert second["image"] == "nginx"
+        assert second["ports"] == {"80/tcp": None}
+        assert second["environment"] == {"A": "1"}
+        assert second["restart_policy"] == {"Name": "always"}
+
+
+class TestLoadGputil:
+    def test_missing_dependency_returns_none(self, monkeypatch):
+        import sys
+
+        from app.core import utils
+
+        monkeypatch.setitem(sys.modules, "GPUtil", None)
+        utils.load_gputil.cache_clear()
+        try:
+            assert utils.load_gputil() is None
+        finally:
+            utils.load_gputil.cache_clear()
@@ -0,0 +1,100 @@
+"""卷路由器测试。"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+from app.routers import volumes
+
+
+class TestVolumeFiles:
+    @staticmethod
+    def _mock_client(mountpoint):
+        mock_client = MagicMock()
+        mock_client.volumes.get.return_value.attrs = {"Mountpoint": mountpoint}
+        return mock_client
+
+    def _get(self, client, admin_headers, tmp_path, query=""):
+        mock_client = self._mock_client("/vol")
+        with (
+            patch.object(volumes, "HOST_FILESYSTEM_ROOT", str(tmp_path)),
+            patch.object(volumes, "get_docker_client", return_value=mock_client),
+        ):
+            return client.get(f"/volumes/data/files{query}", headers=admin_headers)
+
+    def test_symlinks_not_followed_for_stat(self, client, admin_headers, tmp_path):
+        root = tmp_path / "vol"
+        (root / "sub").mkdir(parents=True)
+        (root / "a.txt").write_text("hello")
+        os.symlink(root / "sub", root / "link")
+        os.symlink(root / "missing", root / "broken")
+
+        response = self._get(client, admin_headers, tmp_path)
+
+        assert response.status_code == 200
+        assert response.headers["x-truncated"] == "false"
+        items = {i["name"]: i for i in response.json()}
+        assert items["a.txt"]["type"] == "file"
+        assert items["a.txt"]["size"] == 5
+        assert items["sub"]["type"] == "directory"
+        assert items["link"]["type"] == "directory"
+        assert items["link"]["is_symlink"] is True
+        assert items["broken"]["type"] == "file"
+
+    def test_limit_and_offset(self, client, admin_headers, tmp_path):
+        root = tmp_path / "vol"
+        root.mkdir()
+        for i in range(5):
+            (root / f"f{i}").write_text("")
+
+        first = self._get(client, admin_headers, tmp_path, "?limit=3")
+        rest = self._get(client, admin_headers, tmp_path, "?limit=3&offset=3")
+
+        assert first.headers["x-truncated"] == "true"
+        assert rest.headers["x-truncated"] == "false"
+        assert [i["name"] for i in first.json()] == ["f0", "f1", "f2"]
+        assert [i["name"] for i in rest.json()] == ["f3", "f4"]
+
+    def test_no_limit_returns_everything(self, client, admin_headers, tmp_path):
+        root = tmp_path / "vol"
+        root.mkdir()
+        for name in ["c", "a", "b"]:
+            (root / name).write_text("")
+
+        response = self._get(client, admin_headers, tmp_path)
+
+        assert response.headers["x-truncated"] == "false"
+        assert [i["name"] for i in response.json()] == ["a", "b", "c"]
+
+
+class TestVolumeUsage:
+    def test_list_and_details_share_index(self, client, admin_headers):
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [
+            {
+                "Names": ["/web"],
+                "Mounts": [
+                    {"Type": "volume", "Name": "data"},
+                    {"Type": "volume", "Name": "data"},
+                    {"Type": "bind", "Source": "/etc"},
+                ],
+            },
+            {"Names": ["/db"], "Mounts": [{"Type": "volume", "Name": "data"}]},
+        ]
+        volume = MagicMock(id="data", attrs={"Name": "data", "Driver": "local"})
+        volume.name = "data"
+        unused = MagicMock(id="cache", attrs={"Name": "cache"})
+        unused.name = "cache"
+        mock_client.api.volumes.return_value = {
+            "Volumes": [volume.attrs, unused.attrs]
+        }
+        mock_client.volumes.get.return_value = volume
+        with patch.object(volumes, "get_docker_client", return_value=mock_client):
+            listing = client.get("/volumes", headers=admin_headers)
+            details = client.get("/volumes/data", headers=admin_headers)
+
+        assert [(v["id"], v["in_use"]) for v in listing.json()] == [
+            ("data", True),
+            ("cache", False),
+        ]
+        assert details.json()["used_by_containers"] == ["web", "db"]
+        mock_client.api.containers.assert_called_once_with(all=True)
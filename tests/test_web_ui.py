@@ -0,0 +1,49 @@
+"""内置管理页面测试（路由当前未挂载到主应用，单独构建应用测试）。"""
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import web_ui
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(web_ui.router)
+    return TestClient(app)
+
+
+class TestAdminPage:
+    def test_gzip_encoded_when_accepted(self):
+        response = _client().get("/", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == web_ui._ADMIN_HTML_BYTES
+
+    def test_identity_without_accept_encoding(self):
+        response = _client().get("/", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content == web_ui._ADMIN_HTML_BYTES
+        assert gzip.decompress(web_ui._ADMIN_HTML_ENCODED["gzip"]) == response.content
+
+    def test_minified_page_keeps_script(self):
+        html = web_ui._ADMIN_HTML_BYTES.decode("utf-8")
+
+        assert html.startswith("<!DOCTYPE html>")
+        assert "<!--" not in html
+        assert "\n    " not in html
+        assert "function showQR(apiKey) {" in html
+        assert len(html) < len(web_ui._ADMIN_HTML)
+
+    def test_not_modified(self):
+        client = _client()
+        etag = client.get("/").headers["etag"]
+
+        response = client.get("/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
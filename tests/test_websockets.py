@@ -0,0 +1,178 @@
+"""WebSocket 路由测试。"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.db.models import APIKeyModel
+from tests.conftest import TestSessionLocal
+
+
+@pytest.fixture
+def api_key(db_session):
+    db_session.add(APIKeyModel(key="ws-test-key"))
+    db_session.commit()
+    with patch("app.core.security.SessionLocal", TestSessionLocal):
+        yield "ws-test-key"
+
+
+class TestPullImage:
+    def test_streams_progress_lines(self, client, api_key):
+        mock_client = MagicMock()
+        mock_client.api.pull.return_value = iter(
+            [
+                b'{"status": "Pulling fs layer"}\r\n{"status": ',
+                b'"Download complete"}\r\n',
+            ]
+        )
+        with patch(
+            "app.routers.websockets.get_docker_client", return_value=mock_client
+        ):
+            with client.websocket_connect(
+                f"/ws/images/pull?api_key={api_key}"
+            ) as ws:
+                ws.send_text('{"image": "alpine"}')
+                messages = [ws.receive_json() for _ in range(3)]
+
+        assert messages == [
+            {"status": "Pulling fs layer"},
+            {"status": "Download complete"},
+            {"status": "success", "message": "Image pulled successfully"},
+        ]
+        mock_client.api.pull.assert_called_once_with(
+            "alpine", tag="latest", stream=True, decode=False
+        )
+
+
+class TestRelayLines:
+    def test_str_chunk_split_as_bytes(self):
+        from app.routers import websockets
+
+        chunks = ['{"status": "a"}\n{"error": "未找到"}', b'\n{"status": "b"}']
+
+        assert list(websockets._split_lines(chunks)) == [
+            b'{"status": "a"}',
+            '{"error": "未找到"}'.encode("utf-8"),
+            b'{"status": "b"}',
+        ]
+
+    def test_producer_stops_when_send_fails(self):
+        import asyncio
+        import threading
+        from unittest.mock import AsyncMock
+
+        from app.routers import websockets
+
+        closed = threading.Event()
+
+        def endless_chunks():
+            try:
+                while True:
+                    time.sleep(0.001)
+                    yield b'{"status": "Downloading"}\r\n'
+            finally:
+                closed.set()
+
+        websocket = AsyncMock()
+        websocket.send_text.side_effect = RuntimeError("client disconnected")
+
+        async def run():
+            with pytest.raises(RuntimeError):
+                await websockets._relay_lines(websocket, endless_chunks())
+
+        asyncio.run(run())
+        assert closed.wait(timeout=2)
+        websocket.send_text.assert_awaited_once()
+
+
+class TestAuthorize:
+    def test_invalid_key_closes_with_policy_violation(self, client, api_key):
+        from starlette.websockets import WebSocketDisconnect
+
+        with client.websocket_connect("/ws/events?api_key=wrong") as ws:
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                ws.receive_text()
+
+        assert exc_info.value.code == 1008
+
+    def test_valid_key_cached_after_first_connection(self, client, api_key):
+        from app.core import security
+
+        mock_client = MagicMock()
+        mock_client.api.pull.return_value = iter([])
+        with (
+            patch(
+                "app.routers.websockets.get_docker_client", return_value=mock_client
+            ),
+            patch.object(
+                security, "api_key_exists", wraps=security.api_key_exists
+            ) as exists,
+        ):
+            security.invalidate_api_key(api_key)
+            for _ in range(2):
+                with client.websocket_connect(
+                    f"/ws/images/pull?api_key={api_key}"
+                ) as ws:
+                    ws.send_text('{"image": "alpine"}')
+                    ws.receive_json()
+
+        assert exists.call_count == 1
+
+    def test_cached_key_skips_session(self, client, api_key):
+        from app.core import security
+
+        mock_client = MagicMock()
+        mock_client.api.pull.return_value = iter([])
+        with patch(
+            "app.routers.websockets.get_docker_client", return_value=mock_client
+        ):
+            security.invalidate_api_key(api_key)
+            for i in range(2):
+                with patch.object(
+                    security, "SessionLocal", wraps=TestSessionLocal
+                ) as session_factory:
+                    with client.websocket_connect(
+                        f"/ws/images/pull?api_key={api_key}"
+                    ) as ws:
+                        ws.send_text('{"image": "alpine"}')
+                        ws.receive_json()
+                assert session_factory.call_count == (1 if i == 0 else 0)
+
+
+class TestEvents:
+    def test_disconnect_unsubscribes(self, client, api_key):
+        from app.services.docker_monitor import manager
+
+        with client.websocket_connect(f"/ws/events?api_key={api_key}") as ws:
+            ws.send_text("ping")
+            ws.send_bytes(b"ping")
+        for _ in range(100):
+            if not manager.active_connections:
+                break
+            time.sleep(0.01)
+
+        assert manager.active_connections == {}
+
+
+class TestContainersSummary:
+    def test_one_text_frame_per_container_without_inspect(self, client, api_key):
+        mock_client = MagicMock()
+        mock_client.api.containers.return_value = [
+            {"Id": "a" * 64, "Names": ["/网站"], "State": "running", "Image": "nginx"},
+            {"Id": "b" * 64, "Names": ["/db"], "State": "exited", "Image": "redis"},
+        ]
+        with patch(
+            "app.routers.websockets.get_docker_client", return_value=mock_client
+        ):
+            with client.websocket_connect(
+                f"/ws/containers/summary?api_key={api_key}"
+            ) as ws:
+                messages = [ws.receive_json(), ws.receive_json()]
+
+        assert [(m["name"], m["status"], m["image"]) for m in messages] == [
+            ("网站", "running", "nginx"),
+            ("db", "exited", "redis"),
+        ]
+        mock_client.containers.list.assert_not_called()
+        mock_client.api.inspect_container.assert_not_called()